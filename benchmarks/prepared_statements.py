@@ -0,0 +1,75 @@
+"""
+Per-call latency of the hot lookups, text protocol against prepared statements.
+
+Run from the project root against a migrated database:
+
+    python -m benchmarks.prepared_statements [calls]
+
+Each query runs `calls` times through Database.fetch_one(), once as a plain
+query (parsed by the server on every call) and once with prepared=True (parsed
+once per connection, then only the parameters are sent).
+"""
+import statistics
+import sys
+import time
+
+import mysql.connector
+
+from models.db import Database
+
+QUERIES = {
+    "login": (
+        "SELECT u.id, u.username, u.role, u.status, u.department_id, u.personal_info_id "
+        "FROM users u WHERE u.username = %s AND u.password = %s",
+        ("admin", Database.hash_password("admin123")),
+    ),
+    "student by id": (
+        "SELECT s.id, pi.first_name, pi.last_name, st.strand_name, gl.level, s.status "
+        "FROM students s "
+        "JOIN personal_information pi ON pi.id = s.personal_info_id "
+        "LEFT JOIN strands st ON st.id = s.strand_id "
+        "LEFT JOIN grade_levels gl ON gl.id = s.grade_level_id "
+        "WHERE s.id = %s",
+        (1,),
+    ),
+    "username exists": ("SELECT COUNT(*) FROM users WHERE username = %s", ("staff",)),
+    "enrolled count": ("SELECT COUNT(*) FROM students WHERE status = 'enrolled'", None),
+}
+
+
+def measure(db, query, params, calls, prepared):
+    # Warm-up call prepares the statement and fills the buffer pool
+    db.fetch_one(query, params, prepared=prepared)
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        db.fetch_one(query, params, prepared=prepared)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    db = Database()
+    db.initialize()
+    db.instrumentation.enabled = False  # time the protocol, not our bookkeeping
+
+    print(f"{'query':<16} {'text us':>9} {'prep us':>9} {'text p95':>9} {'prep p95':>9} {'speedup':>8}")
+    try:
+        for name, (query, params) in QUERIES.items():
+            text_median, text_p95 = measure(db, query, params, calls, prepared=False)
+            prep_median, prep_p95 = measure(db, query, params, calls, prepared=True)
+            print(f"{name:<16} {text_median:>9.1f} {prep_median:>9.1f} {text_p95:>9.1f} {prep_p95:>9.1f} "
+                  f"{text_median / prep_median:>7.2f}x")
+    except mysql.connector.Error as e:
+        print(f"Benchmark failed: {e}")
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
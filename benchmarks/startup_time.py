@@ -0,0 +1,77 @@
+"""
+Startup-time measurement: the old launch sequence against Database.initialize().
+
+Run from the project root against a database that is already migrated:
+
+    python -m benchmarks.startup_time [runs]
+
+The legacy path replays what main.py used to do on every launch: a throwaway
+server connection for CREATE DATABASE, then every CREATE TABLE IF NOT EXISTS,
+the seed COUNT(*) probes and the default admin/staff probes.
+"""
+import statistics
+import sys
+import time
+
+import mysql.connector
+
+from models.db import Database
+from models.migrations import create_initial_schema, seed_default_admin, seed_default_staff
+
+
+def legacy_startup():
+    db = Database()
+    db.create_database_if_not_exists()
+    db.connect()
+    with db.connection.cursor() as cursor:
+        create_initial_schema(db, cursor)
+        db.connection.commit()
+        seed_default_admin(db, cursor)
+        seed_default_staff(db, cursor)
+        db.connection.commit()
+    return db
+
+
+def versioned_startup():
+    db = Database()
+    db.initialize()
+    return db
+
+
+def measure(startup, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        db = startup()
+        timings.append((time.perf_counter() - started) * 1000)
+        db.close()
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    # Make sure the schema is current so the versioned path hits its fast case
+    versioned_startup().close()
+
+    results = {}
+    for name, startup in (("legacy", legacy_startup), ("versioned", versioned_startup)):
+        try:
+            results[name] = measure(startup, runs)
+        except mysql.connector.Error as e:
+            print(f"{name} startup failed: {e}")
+            return 1
+
+    print(f"{'path':<10} {'median ms':>10} {'p95 ms':>10} {'min ms':>10}")
+    for name, timings in results.items():
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<10} {statistics.median(timings):>10.2f} {p95:>10.2f} {timings[0]:>10.2f}")
+
+    speedup = statistics.median(results["legacy"]) / statistics.median(results["versioned"])
+    print(f"versioned startup is {speedup:.1f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
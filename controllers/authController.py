@@ -20,7 +20,7 @@ class AuthController:
                 FROM users u
                 WHERE u.username = %s AND u.password = %s
             """
-            row = self.db.fetch_one(query, (username, hashed))
+            row = self.db.fetch_one(query, (username, hashed), prepared=True)
             if row:
                 user = {
                     "id": row[0],
@@ -47,12 +47,12 @@ class AuthController:
                 INSERT INTO users (username, password, role, personal_info_id, department_id)
                 VALUES (%s, %s, %s, %s, %s)
             """
-            cursor = self.db.connection.cursor()
-            cursor.execute(query, (username, hashed, role, personal_info_id, department_id))
-            self.db.connection.commit()
-            user_id = cursor.lastrowid
-            cursor.close()
-            return user_id
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (username, hashed, role, personal_info_id, department_id))
+                conn.commit()
+                self.db.invalidate("users")
+                self.db.audit.record("create", "user", cursor.lastrowid, f"role={role}")
+                return cursor.lastrowid
         except Error as e:
             print(f"Error creating user: {e}")
             return None
@@ -62,10 +62,11 @@ class AuthController:
         try:
             hashed = self.hash_password(new_password)
             query = "UPDATE users SET password = %s WHERE id = %s"
-            cursor = self.db.connection.cursor()
-            cursor.execute(query, (hashed, user_id))
-            self.db.connection.commit()
-            cursor.close()
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (hashed, user_id))
+                conn.commit()
+                self.db.invalidate("users")
+                self.db.audit.record("update", "user", user_id, "password")
             return True
         except Error as e:
             print(f"Error updating password: {e}")
@@ -80,7 +81,7 @@ class AuthController:
                 FROM users u
                 WHERE u.id = %s
             """
-            row = self.db.fetch_one(query, (user_id,))
+            row = self.db.fetch_one(query, (user_id,), prepared=True, cache_tables=("users",))
             if row:
                 return {
                     "id": row[0],
@@ -99,7 +100,7 @@ class AuthController:
         """Check if username is already taken"""
         try:
             query = "SELECT COUNT(*) FROM users WHERE username = %s"
-            row = self.db.fetch_one(query, (username,))
+            row = self.db.fetch_one(query, (username,), prepared=True)
             return row[0] > 0
         except Error as e:
             print(f"Error checking username: {e}")
@@ -109,10 +110,11 @@ class AuthController:
         """Set user status to inactive"""
         try:
             query = "UPDATE users SET status = 'inactive' WHERE id = %s"
-            cursor = self.db.connection.cursor()
-            cursor.execute(query, (user_id,))
-            self.db.connection.commit()
-            cursor.close()
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (user_id,))
+                conn.commit()
+                self.db.invalidate("users")
+                self.db.audit.record("update", "user", user_id, "status=inactive")
             return True
         except Error as e:
             print(f"Error deactivating user: {e}")
@@ -122,10 +124,11 @@ class AuthController:
         """Set user status to active"""
         try:
             query = "UPDATE users SET status = 'active' WHERE id = %s"
-            cursor = self.db.connection.cursor()
-            cursor.execute(query, (user_id,))
-            self.db.connection.commit()
-            cursor.close()
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (user_id,))
+                conn.commit()
+                self.db.invalidate("users")
+                self.db.audit.record("update", "user", user_id, "status=active")
             return True
         except Error as e:
             print(f"Error activating user: {e}")
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+
+from models.db import Database
+from mysql.connector import Error
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Every stat card count, read in one round trip."""
+    total_students: int = 0
+    enrolled_students: int = 0
+    pending_students: int = 0
+    cancelled_students: int = 0
+    total_staff: int = 0
+    active_staff: int = 0
+    inactive_staff: int = 0
+
+
+class DashboardController:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_change_marker(self, tables=("students", "users")):
+        """
+        Return the version counters of `tables` as a tuple.
+
+        Every write to those tables bumps its counter (see migration 5), so a
+        dashboard only needs to re-query when the marker differs from the last one.
+        """
+        try:
+            placeholders = ", ".join(["%s"] * len(tables))
+            rows = self.db.fetch_all(
+                f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+                tuple(tables), prepared=True
+            )
+            return tuple(sorted(rows))
+        except Error as e:
+            print(f"Error reading change marker: {e}")
+            return None
+
+    def get_snapshot(self) -> DashboardSnapshot:
+        """
+        Read every stat card count from stats_counters (see migration 6).
+
+        The triggers keep one row per (entity, status), so this reads a handful
+        of rows however large students and users grow.
+        """
+        try:
+            rows = self.db.fetch_all(
+                "SELECT entity, status, count FROM stats_counters WHERE entity IN ('student', 'staff')",
+                prepared=True
+            )
+        except Error as e:
+            print(f"Error loading dashboard snapshot: {e}")
+            return DashboardSnapshot()
+
+        students = {status: count for entity, status, count in rows if entity == "student"}
+        staff = {status: count for entity, status, count in rows if entity == "staff"}
+        return DashboardSnapshot(
+            total_students=sum(students.values()),
+            enrolled_students=students.get("enrolled", 0),
+            pending_students=students.get("pending", 0),
+            cancelled_students=students.get("cancelled", 0),
+            total_staff=sum(staff.values()),
+            active_staff=staff.get("active", 0),
+            # a NULL status is counted under '' and, as before, is neither active nor inactive
+            inactive_staff=sum(c for status, c in staff.items() if status not in ("", "active")),
+        )
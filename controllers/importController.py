@@ -0,0 +1,279 @@
+"""
+Bulk student import from CSV or XLSX rosters.
+
+The file is read as a stream (csv from the standard library, openpyxl in
+read-only mode for .xlsx), cut into chunks, and each chunk is validated in a
+process pool while the previous ones are written. Valid rows go to the
+database through StudentController.create_students_bulk(), one transaction
+per chunk; invalid rows are collected with their line numbers in the
+ImportReport, which can be saved as CSV for the registrar to fix and re-import.
+
+Nothing here imports the database layer, so worker processes start cheaply.
+"""
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # .xlsx support is optional
+    load_workbook = None
+
+# Column headers are matched after lower-casing and turning spaces/dashes into underscores
+HEADER_ALIASES = {
+    "firstname": "first_name",
+    "given_name": "first_name",
+    "middlename": "middle_name",
+    "lastname": "last_name",
+    "surname": "last_name",
+    "gender": "sex",
+    "birthplace": "place_of_birth",
+    "email_address": "email",
+    "phone": "phone_number",
+    "contact_number": "phone_number",
+    "mobile": "phone_number",
+    "birthdate": "date_of_birth",
+    "birthday": "date_of_birth",
+    "dob": "date_of_birth",
+    "grade": "grade_level",
+    "year_level": "grade_level",
+    "type": "student_type",
+    "enrollment": "student_type",
+}
+
+FIELDS = (
+    "first_name", "middle_name", "last_name", "suffix", "sex", "nationality",
+    "place_of_birth", "email", "phone_number", "date_of_birth", "address",
+    "strand", "grade_level", "student_type",
+)
+REQUIRED_FIELDS = ("first_name", "last_name", "email", "strand", "grade_level")
+
+# Mirrors the ENUMs on personal_information.sex and students.student_type
+SEX_VALUES = {"m": "M", "male": "M", "f": "F", "female": "F", "other": "Other"}
+STUDENT_TYPES = ("new", "returnee", "als", "pept", "transferee")
+PHONE_MAX_LENGTH = 12  # personal_information.phone_number is VARCHAR(12)
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y")
+
+
+def normalize_header(name):
+    key = str(name or "").strip().lower().replace(" ", "_").replace("-", "_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # spreadsheets store phone numbers as floats
+    return str(value).strip()
+
+
+# ------------------- READING -------------------
+def iter_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [normalize_header(h) for h in next(reader, [])]
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                yield reader.line_num, dict(zip(header, row))
+
+
+def iter_xlsx(path):
+    if load_workbook is None:
+        raise ImportError("Reading .xlsx files requires openpyxl (pip install openpyxl)")
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [normalize_header(h) for h in next(rows, ())]
+        for line, row in enumerate(rows, start=2):
+            if any(cell not in (None, "") for cell in row):
+                yield line, {key: _text(cell) for key, cell in zip(header, row)}
+    finally:
+        workbook.close()
+
+
+def iter_rows(path):
+    """Yield (line number, {field: text}) for every non-empty data row of a roster file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return iter_csv(path)
+    if extension in (".xlsx", ".xlsm"):
+        return iter_xlsx(path)
+    raise ValueError(f"Unsupported file type: {extension or path}")
+
+
+# ------------------- VALIDATION (runs in worker processes) -------------------
+def _parse_date(text):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def validate_row(raw, strands, grade_levels):
+    """Return (student_data, errors) for one raw row; student_data is None when errors is not empty"""
+    row = {name: _text(raw.get(name)) for name in FIELDS}
+    errors = [f"{name} is required" for name in REQUIRED_FIELDS if not row[name]]
+
+    if row["email"] and "@" not in row["email"]:
+        errors.append(f"invalid email '{row['email']}'")
+    if row["phone_number"] and not row["phone_number"].isdigit():
+        errors.append(f"phone number '{row['phone_number']}' must contain digits only")
+    elif len(row["phone_number"]) > PHONE_MAX_LENGTH:
+        errors.append(f"phone number '{row['phone_number']}' is longer than {PHONE_MAX_LENGTH} digits")
+    if row["strand"] and row["strand"] not in strands:
+        errors.append(f"unknown strand '{row['strand']}'")
+    if row["grade_level"] and row["grade_level"] not in grade_levels:
+        errors.append(f"unknown grade level '{row['grade_level']}'")
+
+    sex = None
+    if row["sex"]:
+        sex = SEX_VALUES.get(row["sex"].lower())
+        if sex is None:
+            errors.append(f"invalid sex '{row['sex']}'")
+
+    student_type = (row["student_type"] or "new").lower()
+    if student_type not in STUDENT_TYPES:
+        errors.append(f"invalid student type '{row['student_type']}'")
+
+    date_of_birth = None
+    if row["date_of_birth"]:
+        date_of_birth = _parse_date(row["date_of_birth"])
+        if date_of_birth is None:
+            errors.append(f"invalid date of birth '{row['date_of_birth']}'")
+
+    if errors:
+        return None, errors
+
+    student = {name: row[name] or None for name in FIELDS}
+    student.update(sex=sex, student_type=student_type, date_of_birth=date_of_birth)
+    return student, []
+
+
+def validate_chunk(rows, strands, grade_levels):
+    """Validate [(line, raw)] and return [(line, student_data, errors)]"""
+    return [(line, *validate_row(raw, strands, grade_levels)) for line, raw in rows]
+
+
+# ------------------- PIPELINE -------------------
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    errors: list = field(default_factory=list)   # [(line, message)]
+    student_ids: list = field(default_factory=list)
+    cancelled: bool = False
+
+    @property
+    def failed(self):
+        return len({line for line, _ in self.errors})
+
+    def write_errors(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "error"])
+            writer.writerows(self.errors)
+
+
+class StudentImporter:
+    """
+    Streams a roster file into the students table.
+
+    progress(processed, imported, failed) is called after every chunk; call
+    cancel() from another thread to stop after the chunk in flight. workers=0
+    validates in-process, which is quicker for small files.
+
+    checkpoint(processed, imported, failed) is called with the same totals
+    inside each chunk's transaction, just before it commits, so a resume point
+    it records on that connection commits together with the chunk's students.
+    """
+
+    def __init__(self, student_controller, chunk_size=1000, workers=None):
+        self.student_controller = student_controller
+        self.chunk_size = chunk_size
+        self.workers = min(4, os.cpu_count() or 1) if workers is None else workers
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self, path, created_by, progress=None, start=0, checkpoint=None):
+        """Import `path`, skipping its first `start` data rows (already imported by an earlier run)"""
+        reference = self.student_controller.db.reference
+        strands = frozenset(name for _, name in reference.strands())
+        grade_levels = frozenset(name for _, name in reference.grade_levels())
+
+        report = ImportReport()
+        rows = islice(iter_rows(path), start, None)
+        chunks = iter(lambda: list(islice(rows, self.chunk_size)), [])
+
+        if self.workers <= 0:
+            validated = (validate_chunk(chunk, strands, grade_levels) for chunk in chunks)
+            self._write(validated, created_by, report, progress, checkpoint)
+            return report
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Keep a few chunks in flight so reading, validating and writing overlap
+            # without pulling the whole file into memory
+            pending = []
+            def validated():
+                for chunk in chunks:
+                    pending.append(pool.submit(validate_chunk, chunk, strands, grade_levels))
+                    if len(pending) > self.workers * 2:
+                        yield pending.pop(0).result()
+                while pending:
+                    yield pending.pop(0).result()
+
+            self._write(validated(), created_by, report, progress, checkpoint)
+            for future in pending:
+                future.cancel()
+        return report
+
+    @staticmethod
+    def _chunk_checkpoint(checkpoint, processed, report):
+        """before_commit hook for create_students_bulk() that reports the totals including the chunk"""
+        if checkpoint is None:
+            return None
+        return lambda ids: checkpoint(processed, report.imported + len(ids), report.failed)
+
+    def _write(self, validated_chunks, created_by, report, progress, checkpoint):
+        for results in validated_chunks:
+            if self._cancelled:
+                report.cancelled = True
+                break
+
+            valid_lines, students = [], []
+            for line, student, errors in results:
+                if errors:
+                    report.errors.extend((line, message) for message in errors)
+                else:
+                    valid_lines.append(line)
+                    students.append(student)
+
+            processed = report.total + len(results)
+            before_commit = self._chunk_checkpoint(checkpoint, processed, report)
+
+            ids = []
+            if students:
+                ids = self.student_controller.create_students_bulk(students, created_by, before_commit=before_commit)
+                if ids:
+                    report.imported += len(ids)
+                    report.student_ids.extend(ids)
+                else:
+                    report.errors.extend((line, "database error, row not saved") for line in valid_lines)
+            if checkpoint and not ids:
+                # Nothing committed for this chunk: record it on its own
+                checkpoint(processed, report.imported, report.failed)
+
+            report.total = processed
+            if progress:
+                progress(report.total, report.imported, report.failed)
@@ -1,13 +1,19 @@
 from models.db import Database
+from mysql.connector import Error
 from datetime import datetime
+import csv
+import os
 
 class ReportController:
     def __init__(self, db: Database):
         self.db = db
 
+    # Tables behind the report queries, used to tag their cached results
+    STUDENT_REPORT_TABLES = ("students", "personal_information", "strands", "grade_levels", "users")
+    STAFF_REPORT_TABLES = ("users", "personal_information", "departments")
+
     # 1. All Students Listing
-    def get_all_students(self):
-        query = """
+    ALL_STUDENTS_QUERY = """
         SELECT
             s.id AS student_id,
             CONCAT(pi.first_name, ' ', COALESCE(pi.last_name, '')) AS full_name,
@@ -20,7 +26,13 @@ class ReportController:
         LEFT JOIN strands st ON s.strand_id = st.id
         LEFT JOIN grade_levels gl ON s.grade_level_id = gl.id
         """
-        return self.db.fetch_all(query)
+
+    def get_all_students(self):
+        return self.db.fetch_all(self.ALL_STUDENTS_QUERY, cache_tables=self.STUDENT_REPORT_TABLES)
+
+    def iter_all_students(self, batch_size=500):
+        """Streaming variant of get_all_students()."""
+        return self.db.fetch_iter(self.ALL_STUDENTS_QUERY, batch_size=batch_size)
 
     # 2. Enrollment by Course/Program (Count)
     def get_enrollment_summary(self):
@@ -30,7 +42,7 @@ class ReportController:
         LEFT JOIN strands st ON s.strand_id = st.id
         GROUP BY st.strand_name
         """
-        return self.db.fetch_all(query)
+        return self.db.fetch_all(query, cache_tables=self.STUDENT_REPORT_TABLES)
 
     # 3. Student Profile (Individual)
     def get_student_profile(self, student_id):
@@ -43,13 +55,13 @@ class ReportController:
         LEFT JOIN grade_levels gl ON s.grade_level_id = gl.id
         WHERE s.id = %s
         """
-        profile = self.db.fetch_one(profile_query, (student_id,))
+        profile = self.db.fetch_one(profile_query, (student_id,), cache_tables=self.STUDENT_REPORT_TABLES)
         # courses/enrollments may not be present in this schema; return empty list for courses
         courses = []
         return {"profile": profile, "courses": courses}
 
     # 4. New Registrations Report
-    def get_new_registrations(self, start_date=None, end_date=None):
+    def _new_registrations_query(self, start_date=None, end_date=None):
         query = "SELECT s.id AS student_id, CONCAT(pi.first_name, ' ', COALESCE(pi.last_name, '')) AS full_name, st.strand_name AS program, s.registered_at AS enrollment_date FROM students s LEFT JOIN personal_information pi ON s.personal_info_id = pi.id LEFT JOIN strands st ON s.strand_id = st.id WHERE 1=1"
         params = []
         if start_date:
@@ -58,11 +70,19 @@ class ReportController:
         if end_date:
             query += " AND s.registered_at <= %s"
             params.append(end_date)
-        return self.db.fetch_all(query, tuple(params) if params else None)
+        return query, tuple(params) if params else None
+
+    def get_new_registrations(self, start_date=None, end_date=None):
+        query, params = self._new_registrations_query(start_date, end_date)
+        return self.db.fetch_all(query, params, cache_tables=self.STUDENT_REPORT_TABLES)
+
+    def iter_new_registrations(self, start_date=None, end_date=None, batch_size=500):
+        """Streaming variant of get_new_registrations()."""
+        query, params = self._new_registrations_query(start_date, end_date)
+        return self.db.fetch_iter(query, params, batch_size=batch_size)
 
     # 5. Pending Applications Report
-    def get_pending_applications(self):
-        query = """
+    PENDING_APPLICATIONS_QUERY = """
         SELECT s.id AS student_id, CONCAT(pi.first_name, ' ', COALESCE(pi.last_name, '')) AS full_name,
                st.strand_name AS program, s.registered_at AS application_date, s.status
         FROM students s
@@ -70,11 +90,15 @@ class ReportController:
         LEFT JOIN strands st ON s.strand_id = st.id
         WHERE s.status = 'pending'
         """
-        return self.db.fetch_all(query)
 
-    def get_all_students_detailed(self):
-        """Return detailed student info useful for full reports."""
-        query = """
+    def get_pending_applications(self):
+        return self.db.fetch_all(self.PENDING_APPLICATIONS_QUERY, cache_tables=self.STUDENT_REPORT_TABLES)
+
+    def iter_pending_applications(self, batch_size=500):
+        """Streaming variant of get_pending_applications()."""
+        return self.db.fetch_iter(self.PENDING_APPLICATIONS_QUERY, batch_size=batch_size)
+
+    ALL_STUDENTS_DETAILED_QUERY = """
         SELECT
             s.id AS student_id,
             pi.first_name, pi.middle_name, pi.last_name, pi.date_of_birth,
@@ -87,11 +111,16 @@ class ReportController:
         LEFT JOIN grade_levels gl ON s.grade_level_id = gl.id
         LEFT JOIN users u ON s.created_by = u.id
         """
-        return self.db.fetch_all(query)
 
-    def get_all_staff(self):
-        """Return staff listing with personal info and department."""
-        query = """
+    def get_all_students_detailed(self):
+        """Return detailed student info useful for full reports."""
+        return self.db.fetch_all(self.ALL_STUDENTS_DETAILED_QUERY, cache_tables=self.STUDENT_REPORT_TABLES)
+
+    def iter_all_students_detailed(self, batch_size=500):
+        """Streaming variant of get_all_students_detailed()."""
+        return self.db.fetch_iter(self.ALL_STUDENTS_DETAILED_QUERY, batch_size=batch_size)
+
+    ALL_STAFF_QUERY = """
         SELECT
             u.id AS user_id,
             pi.first_name, pi.middle_name, pi.last_name,
@@ -102,4 +131,94 @@ class ReportController:
         LEFT JOIN departments d ON u.department_id = d.id
         WHERE u.role = 'staff'
         """
-        return self.db.fetch_all(query)
+
+    def get_all_staff(self):
+        """Return staff listing with personal info and department."""
+        return self.db.fetch_all(self.ALL_STAFF_QUERY, cache_tables=self.STAFF_REPORT_TABLES)
+
+    def iter_all_staff(self, batch_size=500):
+        """Streaming variant of get_all_staff()."""
+        return self.db.fetch_iter(self.ALL_STAFF_QUERY, batch_size=batch_size)
+
+    # Reports that can be exported in the background: name -> (query, unique id column)
+    EXPORTS = {
+        "all_students": (ALL_STUDENTS_QUERY, "student_id"),
+        "all_students_detailed": (ALL_STUDENTS_DETAILED_QUERY, "student_id"),
+        "pending_applications": (PENDING_APPLICATIONS_QUERY, "student_id"),
+        "all_staff": (ALL_STAFF_QUERY, "user_id"),
+    }
+
+    def iter_export_pages(self, report, after_id=0, page_size=1000):
+        """Yield pages of an EXPORTS report in id order, starting after `after_id`"""
+        query, key = self.EXPORTS[report]
+        page_query = f"SELECT * FROM ({query}) AS r WHERE r.{key} > %s ORDER BY r.{key} LIMIT %s"
+        while True:
+            rows = self.db.fetch_all(page_query, (after_id, page_size), dictionary=True)
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1][key]
+
+    def count_export_rows(self, report):
+        query, _ = self.EXPORTS[report]
+        return self.db.fetch_one(f"SELECT COUNT(*) FROM ({query}) AS r")[0]
+
+    def queue_export(self, report, path, requested_by):
+        """Write an EXPORTS report to a CSV file in the background (see run_export_job); returns the job id"""
+        if report not in self.EXPORTS:
+            raise ValueError(f"Unknown report: {report}")
+        return self.db.jobs.enqueue(
+            "report_export", {"report": report, "path": os.path.abspath(path)}, requested_by
+        )
+
+    def log_report(self, report_type, generated_by):
+        try:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO reports (report_type, generated_by) VALUES (%s, %s)",
+                    (report_type, generated_by)
+                )
+                conn.commit()
+        except Error as e:
+            print(f"Error logging report: {e}")
+
+
+def run_export_job(job):
+    """
+    Stream a report to CSV page by page. Rows go to `<path>.part`, which is
+    flushed to disk before every checkpoint; the checkpoint holds the last id
+    written and the file size at that point, so a resumed job truncates
+    anything written after it and continues with the next page. The finished
+    file replaces `path` in one step.
+    """
+    reports = ReportController(job.db)
+    report, path = job.params["report"], job.params["path"]
+    _, key = reports.EXPORTS[report]
+    partial = path + ".part"
+
+    checkpoint = job.checkpoint
+    if checkpoint and os.path.exists(partial):
+        f = open(partial, "r+", newline="", encoding="utf-8")
+        f.truncate(checkpoint["bytes"])
+        f.seek(checkpoint["bytes"])
+    else:
+        checkpoint = {"last_id": 0, "rows": 0, "bytes": 0}
+        f = open(partial, "w", newline="", encoding="utf-8")
+        job.total = reports.count_export_rows(report)
+
+    with f:
+        writer = None
+        for rows in reports.iter_export_pages(report, after_id=checkpoint["last_id"]):
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                if checkpoint["rows"] == 0:
+                    writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+            checkpoint = {"last_id": rows[-1][key], "rows": checkpoint["rows"] + len(rows), "bytes": f.tell()}
+            job.progress(checkpoint, processed=checkpoint["rows"])
+
+    os.replace(partial, path)
+    reports.log_report(report, job.created_by)
+    return {"path": path, "rows": checkpoint["rows"]}
@@ -1,7 +1,16 @@
 from models.db import Database
+from models.document_store import CopyCancelled
+from controllers.importController import STUDENT_TYPES, StudentImporter
 from mysql.connector import Error
 import os
-import shutil
+import re
+
+# Rejected rows kept in a finished import job's result
+IMPORT_ERROR_SAMPLE = 200
+
+# innodb_ft_min_token_size: shorter words are not in the FULLTEXT index
+FULLTEXT_MIN_TOKEN = 3
+_SEARCH_TOKEN = re.compile(r"\w+")
 
 
 class StudentController:
@@ -11,50 +20,250 @@ class StudentController:
     def get_all_students(self, order="DESC"):
         """Fetch all students with related info and order by ID"""
         try:
-            with self.db.connection.cursor(dictionary=True) as cursor:
-                # sanitize order direction
-                if not isinstance(order, str) or order.upper() not in ("ASC", "DESC"):
-                    order = "DESC"
-
-                query = (
-                    "SELECT "
-                    "s.id, "
-                    "pi.first_name, pi.middle_name, pi.last_name, pi.suffix, pi.sex, pi.nationality, pi.place_of_birth, pi.email, "
-                    "pi.phone_number AS phone, pi.date_of_birth, pi.address, "
-                    "st.strand_name AS strand, gl.level AS grade, s.student_type AS enrollment, s.status, s.registered_at AS created_at, u.username AS created_by "
-                    "FROM students s "
-                    "LEFT JOIN personal_information pi ON pi.id = s.personal_info_id "
-                    "LEFT JOIN strands st ON st.id = s.strand_id "
-                    "LEFT JOIN grade_levels gl ON gl.id = s.grade_level_id "
-                    "LEFT JOIN users u ON u.id = s.created_by "
-                    f"ORDER BY s.id {order}"
-                )
-                cursor.execute(query)
-                return cursor.fetchall()
+            # sanitize order direction
+            if not isinstance(order, str) or order.upper() not in ("ASC", "DESC"):
+                order = "DESC"
+
+            query = (
+                f"SELECT {self.STUDENT_LIST_COLUMNS} "
+                f"{self.STUDENT_LIST_FROM} "
+                f"ORDER BY s.id {order}"
+            )
+            return self.db.fetch_all(query, dictionary=True, cache_tables=self.STUDENT_LIST_TABLES)
         except Error as e:
             print(f"Error getting students: {e}")
             return []
 
+    STUDENT_LIST_COLUMNS = (
+        "s.id, "
+        "pi.first_name, pi.middle_name, pi.last_name, pi.suffix, pi.sex, pi.nationality, pi.place_of_birth, pi.email, "
+        "pi.phone_number AS phone, pi.date_of_birth, pi.address, "
+        "st.strand_name AS strand, gl.level AS grade, s.student_type AS enrollment, s.status, s.registered_at AS created_at, u.username AS created_by"
+    )
+
+    # students.personal_info_id is NOT NULL, so the inner join loses no rows and lets the
+    # optimizer start from personal_information's indexes for the name and email sorts
+    STUDENT_LIST_FROM = (
+        "FROM students s "
+        "JOIN personal_information pi ON pi.id = s.personal_info_id "
+        "LEFT JOIN strands st ON st.id = s.strand_id "
+        "LEFT JOIN grade_levels gl ON gl.id = s.grade_level_id "
+        "LEFT JOIN users u ON u.id = s.created_by"
+    )
+
+    STUDENT_LIST_TABLES = ("students", "personal_information", "strands", "grade_levels", "users")
+
+    # Mirrors the students.status ENUM, in declaration order
+    STUDENT_STATUSES = ("enrolled", "pending", "cancelled")
+
+    # Sort columns per column of the student table, each ending in a unique id, and the
+    # index that returns rows in exactly that order, so a page is an index range scan that
+    # stops after `limit` rows instead of a filesort of every match. Name and email
+    # seek personal_information's indexes, which carry its primary key, hence pi.id.
+    # Strand and grade order by the reference row's id, as their indexes do.
+    LIST_SORT_KEYS = {
+        "id": ("s.id",),                                        # PRIMARY
+        "name": ("pi.last_name", "pi.first_name", "pi.id"),     # idx_fullname
+        "email": ("pi.email", "pi.id"),                         # idx_pi_email (migration 3)
+        "strand": ("s.strand_id", "s.id"),                      # idx_students_strand_sort (migration 11)
+        "grade": ("s.grade_level_id", "s.id"),                  # idx_students_grade_sort (migration 11)
+        "enrollment": ("s.student_type", "s.id"),               # idx_students_type (migration 3)
+        "status": ("s.status", "s.id"),                         # idx_students_status (migration 3)
+    }
+
+    # Sort columns that may be NULL; MySQL puts NULL first ascending and last descending
+    LIST_SORT_NULLABLE = frozenset({"pi.email", "s.strand_id", "s.grade_level_id", "s.student_type", "s.status"})
+
+    # ENUM columns sort by declaration order, as their indexes do; seeks spell "after" as an
+    # IN list of the following values, since < / > on an ENUM compare its text
+    LIST_SORT_ENUMS = {"s.student_type": STUDENT_TYPES, "s.status": STUDENT_STATUSES}
+
+    LIST_FILTERS = {
+        "status": "s.status IN ({})",
+        "student_type": "s.student_type IN ({})",
+        "strand": "s.strand_id IN ({})",
+        "grade": "s.grade_level_id IN ({})",
+    }
+
+    # Filters given by name that are resolved to ids through db.reference
+    LIST_FILTER_LOOKUPS = {"strand": "strands", "grade": "grade_levels"}
+
+    @classmethod
+    def _after(cls, column, value, descending):
+        """SQL and params for "column sorts after value", or None if nothing can"""
+        if column in cls.LIST_SORT_ENUMS:
+            ordered = (None,) + tuple(cls.LIST_SORT_ENUMS[column])
+            if value not in ordered:
+                raise ValueError(f"Unknown sort value: {value!r}")
+            position = ordered.index(value)
+            following = ordered[:position] if descending else ordered[position + 1:]
+            later = [v for v in following if v is not None]
+            parts, params = [], []
+            if later:
+                parts.append(f"{column} IN ({', '.join(['%s'] * len(later))})")
+                params.extend(later)
+            if None in following:
+                parts.append(f"{column} IS NULL")
+            if not parts:
+                return None
+            return "(" + " OR ".join(parts) + ")", params
+
+        if column not in cls.LIST_SORT_NULLABLE:
+            return f"{column} {'<' if descending else '>'} %s", [value]
+        if value is None:
+            return None if descending else (f"{column} IS NOT NULL", [])
+        if descending:
+            return f"({column} < %s OR {column} IS NULL)", [value]
+        return f"{column} > %s", [value]
+
+    @classmethod
+    def _keyset_condition(cls, expressions, after_key, descending):
+        """
+        Expand (e1, e2, ...) > (v1, v2, ...) into an OR chain the optimizer can range-scan,
+        with NULL and ENUM ordering handled per column.
+        """
+        clauses, params = [], []
+        for i, expr in enumerate(expressions):
+            after = cls._after(expr, after_key[i], descending)
+            if after is None:
+                continue
+            equal, equal_params = [], []
+            for prev, value in zip(expressions[:i], after_key[:i]):
+                if value is None:
+                    equal.append(f"{prev} IS NULL")
+                else:
+                    equal.append(f"{prev} = %s")
+                    equal_params.append(value)
+            condition, after_params = after
+            clauses.append("(" + " AND ".join(equal + [condition]) + ")")
+            params.extend(equal_params + after_params)
+        if not clauses:
+            return "FALSE", []
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def list_students(self, filters=None, sort_key="id", after_key=None, limit=50, descending=False):
+        """
+        Return one page of students as (rows, next_key).
+
+        filters: dict with any of status, strand, grade, student_type (a value or a list of values).
+        sort_key: one of LIST_SORT_KEYS (the columns shown in the student table).
+        after_key: the next_key returned by the previous page, or None for the first page.
+        Pages are fetched by seeking past after_key in the sort key's index rather
+        than with OFFSET, so page N costs the same as page 1. next_key is None on
+        the last page.
+        """
+        if sort_key not in self.LIST_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_key}")
+        limit = max(1, min(int(limit), 500))
+        expressions = self.LIST_SORT_KEYS[sort_key]
+
+        where, params = [], []
+        for name, value in (filters or {}).items():
+            if name not in self.LIST_FILTERS:
+                raise ValueError(f"Unknown filter: {name}")
+            if value in (None, "", [], ()):
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if name in self.LIST_FILTER_LOOKUPS:
+                ids = self.db.reference.lookup(self.LIST_FILTER_LOOKUPS[name]).ids
+                values = [ids[v] for v in values if v in ids]
+                if not values:
+                    return [], None  # no such strand / grade level
+            where.append(self.LIST_FILTERS[name].format(", ".join(["%s"] * len(values))))
+            params.extend(values)
+
+        if after_key is not None:
+            condition, key_params = self._keyset_condition(expressions, tuple(after_key), descending)
+            where.append(condition)
+            params.extend(key_params)
+
+        direction = "DESC" if descending else "ASC"
+        sort_columns = "".join(f", {expr} AS _sort{i}" for i, expr in enumerate(expressions))
+        query = (
+            f"SELECT {self.STUDENT_LIST_COLUMNS}{sort_columns} "
+            f"{self.STUDENT_LIST_FROM} "
+            + (f"WHERE {' AND '.join(where)} " if where else "")
+            + "ORDER BY " + ", ".join(f"{expr} {direction}" for expr in expressions)
+            + " LIMIT %s"
+        )
+        params.append(limit + 1)  # one extra row tells us whether another page exists
+
+        try:
+            with self.db.connection_scope() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+        except Error as e:
+            print(f"Error listing students: {e}")
+            return [], None
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        keys = [tuple(row.pop(f"_sort{i}") for i in range(len(expressions))) for row in rows]
+        next_key = keys[-1] if has_more else None
+        return rows, next_key
+
+    SEARCH_MATCH = "MATCH (pi.first_name, pi.middle_name, pi.last_name, pi.email, pi.phone_number) AGAINST (%s IN BOOLEAN MODE)"
+
+    def search_students(self, query, limit=50):
+        """
+        Find students by name, email or phone, best matches first.
+
+        Every word of `query` must prefix-match a word of one of those columns
+        (ft_pi_search, migration 7), so "dela cruz", "juan@gm" and "0917" all
+        work. A query made only of words shorter than the index keeps (1-2
+        characters) falls back to a last-name prefix seek on idx_fullname.
+        """
+        limit = max(1, min(int(limit), 500))
+        words = _SEARCH_TOKEN.findall(query or "")
+        if not words:
+            return []
+
+        terms = [w for w in words if len(w) >= FULLTEXT_MIN_TOKEN]
+        if terms:
+            against = " ".join(f"+{t}*" for t in terms)
+            sql = (
+                f"SELECT {self.STUDENT_LIST_COLUMNS}, {self.SEARCH_MATCH} AS _score "
+                f"{self.STUDENT_LIST_FROM} "
+                f"WHERE {self.SEARCH_MATCH} "
+                "ORDER BY _score DESC, s.id DESC LIMIT %s"
+            )
+            params = (against, against, limit)
+        else:
+            sql = (
+                f"SELECT {self.STUDENT_LIST_COLUMNS} "
+                f"{self.STUDENT_LIST_FROM} "
+                "WHERE pi.last_name LIKE %s "
+                "ORDER BY pi.last_name, pi.first_name, s.id LIMIT %s"
+            )
+            params = (words[0].replace("_", "\\_") + "%", limit)
+
+        try:
+            rows = self.db.fetch_all(sql, params, dictionary=True)
+        except Error as e:
+            print(f"Error searching students: {e}")
+            return []
+        for row in rows:
+            row.pop("_score", None)
+        return rows
+
     def get_student_by_id(self, student_id):
         try:
-            with self.db.connection.cursor(dictionary=True) as cursor:
-                cursor.execute("""
-                    SELECT 
-                        s.id,
-                        pi.first_name, pi.middle_name, pi.last_name,
-                        pi.email, pi.phone_number, pi.address,
-                        st.strand_name AS strand,
-                        gl.level AS grade,
-                        s.student_type,
-                        s.status,
-                        pi.id AS personal_info_id
-                    FROM students s
-                    JOIN personal_information pi ON pi.id = s.personal_info_id
-                    LEFT JOIN strands st ON st.id = s.strand_id
-                    LEFT JOIN grade_levels gl ON gl.id = s.grade_level_id
-                    WHERE s.id = %s
-                """, (student_id,))
-                return cursor.fetchone()
+            return self.db.fetch_one("""
+                SELECT 
+                    s.id,
+                    pi.first_name, pi.middle_name, pi.last_name,
+                    pi.email, pi.phone_number, pi.address,
+                    st.strand_name AS strand,
+                    gl.level AS grade,
+                    s.student_type,
+                    s.status,
+                    pi.id AS personal_info_id
+                FROM students s
+                JOIN personal_information pi ON pi.id = s.personal_info_id
+                LEFT JOIN strands st ON st.id = s.strand_id
+                LEFT JOIN grade_levels gl ON gl.id = s.grade_level_id
+                WHERE s.id = %s
+            """, (student_id,), dictionary=True, prepared=True)
         except Error as e:
             print("Fetch student error:", e)
             return None
@@ -64,10 +273,13 @@ class StudentController:
         Create student with full personal information matching database schema
 
         student_data: dict with keys matching personal_information table + academic info
-        document_files: dict with document type -> file path
+        document_files: dict with document type -> file path, stored in the background
         """
         try:
-            with self.db.connection.cursor() as cursor:
+            strand_id = self.db.reference.strand_id(student_data.get('strand'))
+            grade_level_id = self.db.reference.grade_level_id(student_data.get('grade_level'))
+
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 # 1️⃣ Insert personal information (all fields from form)
                 cursor.execute("""
                     INSERT INTO personal_information (
@@ -75,38 +287,10 @@ class StudentController:
                         nationality, place_of_birth, email, phone_number, 
                         date_of_birth, address
                     ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    student_data['first_name'],
-                    student_data.get('middle_name', ''),
-                    student_data['last_name'],
-                    student_data.get('suffix', ''),
-                    student_data.get('sex', ''),
-                    student_data.get('nationality', ''),
-                    student_data.get('place_of_birth', ''),
-                    student_data['email'],
-                    student_data.get('phone_number', ''),
-                    student_data.get('date_of_birth'),
-                    student_data.get('address', '')
-                ))
+                """, self._personal_info_row(student_data))
                 personal_info_id = cursor.lastrowid
 
-                # 2️⃣ Get strand_id from strand_name
-                strand_id = None
-                if 'strand' in student_data:
-                    cursor.execute("SELECT id FROM strands WHERE strand_name = %s",
-                                   (student_data['strand'],))
-                    res = cursor.fetchone()
-                    strand_id = res[0] if res else None
-
-                # 3️⃣ Get grade_level_id from level
-                grade_level_id = None
-                if 'grade_level' in student_data:
-                    cursor.execute("SELECT id FROM grade_levels WHERE level = %s",
-                                   (student_data['grade_level'],))
-                    res = cursor.fetchone()
-                    grade_level_id = res[0] if res else None
-
-                # 4️⃣ Insert student record
+                # 2️⃣ Insert student record
                 cursor.execute("""
                     INSERT INTO students (
                         personal_info_id, strand_id, grade_level_id, 
@@ -122,44 +306,239 @@ class StudentController:
                 ))
                 student_id = cursor.lastrowid
 
-                # 5️⃣ Handle document uploads (matching database ENUM values)
-                if document_files:
-                    upload_dir = "uploaded_documents"
-                    os.makedirs(upload_dir, exist_ok=True)
-
-                    # Map form document names to database ENUM values
-                    doc_type_mapping = {
-                        "PSA Birth Certificate": "PSA_BIRTH",
-                        "Certificate of Good Moral Character": "GOOD_MORAL",
-                        "2x2 ID Pictures": "ID_PICTURE",
-                        # Add more mappings as needed
-                    }
-
-                    for doc_name, file_path in document_files.items():
-                        if file_path:  # file selected
-                            # Get database doc_type
-                            db_doc_type = doc_type_mapping.get(doc_name, "OTHERS")
-
-                            filename = f"{student_id}_{db_doc_type}_{os.path.basename(file_path)}"
-                            dest_path = os.path.join(upload_dir, filename)
-                            shutil.copy(file_path, dest_path)
-
-                            # Insert into documents table
-                            cursor.execute("""
-                                INSERT INTO documents (student_id, doc_type, file_path, uploaded_by)
-                                VALUES (%s, %s, %s, %s)
-                            """, (
-                                student_id, db_doc_type, dest_path, created_by
-                            ))
-
-                self.db.connection.commit()
-                return student_id
+                conn.commit()
+                self.db.invalidate("personal_information", "students")
+                self.db.people.upsert(
+                    "student", student_id, student_data['first_name'], student_data.get('middle_name'),
+                    student_data['last_name'], student_data['email'], student_data.get('phone_number'),
+                    personal_info_id=personal_info_id
+                )
+                self.db.audit.record("create", "student", student_id, actor=created_by)
 
         except Error as e:
-            self.db.connection.rollback()
             print(f"Error creating student: {e}")
             return None
 
+        # Copies happen after the student is committed, in the background; callers that
+        # want progress pass no document_files and call attach_documents_async() themselves
+        if document_files:
+            self.attach_documents_async(student_id, document_files, created_by)
+        return student_id
+
+    # Form document names -> documents.doc_type ENUM values
+    DOC_TYPES = {
+        "PSA Birth Certificate": "PSA_BIRTH",
+        "Certificate of Good Moral Character": "GOOD_MORAL",
+        "2x2 ID Pictures": "ID_PICTURE",
+    }
+
+    def attach_documents(self, student_id, document_files, uploaded_by, progress=None, cancel=None):
+        """
+        Store `document_files` ({form document name: file path}) in the document
+        store and record them in `documents`. Every file is written durably first;
+        the rows and their stored_files references are then inserted in one
+        transaction, and if anything fails the files stored for this call are
+        left to the store's garbage collection. progress(copied_bytes,
+        total_bytes) covers all files. Blocks while copying: use
+        attach_documents_async() from the UI. Returns the stored paths, or None on failure.
+        """
+        files = [(self.DOC_TYPES.get(name, "OTHERS"), path) for name, path in document_files.items() if path]
+        stored = []
+        try:
+            total = sum(os.path.getsize(path) for _, path in files)
+            done = 0
+            for doc_type, source in files:
+                file_progress = self._overall_progress(progress, done, total)
+                stored.append((doc_type, self.db.documents.store(source, progress=file_progress, cancel=cancel)))
+                done += stored[-1][1].size
+
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.executemany("""
+                    INSERT INTO documents (student_id, doc_type, file_path, file_sha256, uploaded_by)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, [(student_id, doc_type, f.path, f.sha256, uploaded_by) for doc_type, f in stored])
+                self.db.documents.add_refs(cursor, [f for _, f in stored])
+                conn.commit()
+        except (OSError, CopyCancelled, Error) as e:
+            print(f"Error storing documents: {e}")
+            self.db.documents.discard_unreferenced([f for _, f in stored])
+            return None
+
+        self.db.invalidate("documents", "stored_files")
+        self.db.audit.record_many(
+            (("upload", "document", student_id, f"{doc_type} {f.sha256}") for doc_type, f in stored),
+            actor=uploaded_by
+        )
+        return [f.path for _, f in stored]
+
+    @staticmethod
+    def _overall_progress(progress, base, total):
+        """Adapt a per-file progress callback to progress(copied_bytes, total_bytes) over all files"""
+        if progress is None:
+            return None
+        return lambda copied, _size: progress(base + copied, total)
+
+    def attach_documents_async(self, student_id, document_files, uploaded_by, progress=None, cancel=None):
+        """attach_documents() on the document store's worker threads; returns a Future of its result"""
+        return self.db.documents.submit(
+            self.attach_documents, student_id, document_files, uploaded_by, progress, cancel
+        )
+
+    # ------------------- PREVIEWS -------------------
+    # Thumbnails come from db.thumbnails (models/thumbnails.py). The methods that return
+    # thumbnail paths block while missing ones render, so call them through a TaskRunner.
+    PREVIEW_DOC_TYPES = ("ID_PICTURE", "PSA_BIRTH")
+    ROW_PREVIEW_SIZE = 64
+    DIALOG_PREVIEW_SIZE = 160
+
+    def get_preview_sources(self, student_ids):
+        """{student_id: (file path, sha256 or None)} of each student's latest ID picture, else profile picture"""
+        if not student_ids:
+            return {}
+        try:
+            rows = self.db.fetch_all("""
+                SELECT s.id, d.file_path, d.file_sha256, pi.profile_picture_path
+                FROM students s
+                JOIN personal_information pi ON pi.id = s.personal_info_id
+                LEFT JOIN documents d ON d.id = (
+                    SELECT MAX(latest.id) FROM documents latest
+                    WHERE latest.student_id = s.id AND latest.doc_type = 'ID_PICTURE'
+                )
+                WHERE s.id IN ({})
+            """.format(", ".join(["%s"] * len(student_ids))), tuple(student_ids))
+        except Error as e:
+            print(f"Error fetching preview sources: {e}")
+            return {}
+        sources = {}
+        for student_id, file_path, sha256, profile_picture in rows:
+            if file_path:
+                sources[student_id] = (file_path, sha256)
+            elif profile_picture:
+                sources[student_id] = (profile_picture, None)
+        return sources
+
+    def get_preview_thumbnails(self, student_ids, size=ROW_PREVIEW_SIZE):
+        """{student_id: thumbnail path} for the students that have a picture that could be rendered"""
+        sources = self.get_preview_sources(student_ids)
+        requests = {student_id: self.db.thumbnails.request(path, sha256, size)
+                    for student_id, (path, sha256) in sources.items()}
+        thumbnails = {}
+        for student_id, future in requests.items():
+            path = future.result()
+            if path:
+                thumbnails[student_id] = path
+        return thumbnails
+
+    def get_document_thumbnails(self, student_id, size=DIALOG_PREVIEW_SIZE):
+        """[(document name, thumbnail path)] of the student's latest ID picture and PSA birth certificate"""
+        try:
+            rows = self.db.fetch_all("""
+                SELECT doc_type, file_path, file_sha256 FROM documents
+                WHERE id IN (
+                    SELECT MAX(id) FROM documents
+                    WHERE student_id = %s AND doc_type IN (%s, %s)
+                    GROUP BY doc_type
+                )
+            """, (student_id, *self.PREVIEW_DOC_TYPES))
+        except Error as e:
+            print(f"Error fetching documents: {e}")
+            return []
+        names = {doc_type: name for name, doc_type in self.DOC_TYPES.items()}
+        requests = sorted(
+            ((self.PREVIEW_DOC_TYPES.index(doc_type), names[doc_type],
+              self.db.thumbnails.request(path, sha256, size)) for doc_type, path, sha256 in rows),
+            key=lambda request: request[0]
+        )
+        return [(name, future.result()) for _, name, future in requests if future.result()]
+
+    PERSONAL_INFO_COLUMNS = (
+        "first_name", "middle_name", "last_name", "suffix", "sex",
+        "nationality", "place_of_birth", "email", "phone_number",
+        "date_of_birth", "address"
+    )
+
+    @staticmethod
+    def _personal_info_row(student_data):
+        return (
+            student_data['first_name'],
+            student_data.get('middle_name', ''),
+            student_data['last_name'],
+            student_data.get('suffix', ''),
+            student_data.get('sex', ''),
+            student_data.get('nationality', ''),
+            student_data.get('place_of_birth', ''),
+            student_data['email'],
+            student_data.get('phone_number', ''),
+            student_data.get('date_of_birth'),
+            student_data.get('address', '')
+        )
+
+    def create_students_bulk(self, students, created_by, batch_size=500, before_commit=None):
+        """
+        Create many students in one transaction with multi-row INSERTs.
+
+        `students` is a list of dicts shaped like create_student()'s student_data
+        (strand / grade_level by name, or strand_id / grade_level_id directly).
+        before_commit(student_ids) runs inside the transaction just before it
+        commits; what it writes on the same connection commits with the students.
+        Returns the new student ids in input order, or [] on failure.
+        """
+        if not students:
+            return []
+        try:
+            strand_ids = self.db.reference.lookup("strands").ids
+            grade_ids = self.db.reference.lookup("grade_levels").ids
+
+            with self.db.connection_scope() as conn:
+                personal_info_ids = self.db.bulk_insert(
+                    "personal_information",
+                    self.PERSONAL_INFO_COLUMNS,
+                    (self._personal_info_row(s) for s in students),
+                    batch_size=batch_size,
+                    commit=False
+                )
+
+                student_rows = (
+                    (
+                        personal_info_id,
+                        s.get('strand_id') or strand_ids.get(s.get('strand')),
+                        s.get('grade_level_id') or grade_ids.get(s.get('grade_level')),
+                        s.get('student_type', 'new'),
+                        "pending",
+                        created_by
+                    )
+                    for personal_info_id, s in zip(personal_info_ids, students)
+                )
+                student_ids = self.db.bulk_insert(
+                    "students",
+                    ("personal_info_id", "strand_id", "grade_level_id", "student_type", "status", "created_by"),
+                    student_rows,
+                    batch_size=batch_size,
+                    commit=False
+                )
+                if before_commit:
+                    before_commit(student_ids)
+                conn.commit()
+                self.db.invalidate("personal_information", "students")
+                for student_id, personal_info_id, s in zip(student_ids, personal_info_ids, students):
+                    self.db.people.upsert(
+                        "student", student_id, s['first_name'], s.get('middle_name'), s['last_name'],
+                        s['email'], s.get('phone_number'), personal_info_id=personal_info_id
+                    )
+                self.db.audit.record_many(
+                    (("create", "student", student_id, "bulk") for student_id in student_ids), actor=created_by
+                )
+                return student_ids
+        except Error as e:
+            print(f"Error creating students in bulk: {e}")
+            return []
+
+    def queue_import(self, path, created_by):
+        """Import a roster file in the background (see run_import_job); returns the job id"""
+        return self.db.jobs.enqueue(
+            "student_import", {"path": os.path.abspath(path), "created_by": created_by}, created_by
+        )
+
     def update_student(self, student_id, data):
         """
         Update a student's personal info and status.
@@ -167,7 +546,7 @@ class StudentController:
         first_name, middle_name, last_name, email, phone_number, address, status
         """
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 # Update personal_information table
                 cursor.execute("""
                     UPDATE personal_information pi
@@ -190,49 +569,105 @@ class StudentController:
                     data.get("status", "pending"),
                     student_id
                 ))
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("personal_information", "students")
+                self.db.people.refresh("student", student_id)
+                self.db.audit.record("update", "student", student_id, f"status={data.get('status', 'pending')}")
                 return True
         except Error as e:
-            self.db.connection.rollback()
             print("Error updating student:", e)
             return False
 
+    AUDIT_COLUMNS = ("user_id", "action", "object_type", "object_id", "details")
+
+    def bulk_set_status(self, student_ids, status, actor, batch_size=500):
+        """
+        Set `status` on many students in one transaction, one UPDATE per batch of ids,
+        and record every change in audit_logs with multi-row inserts. Students already
+        in `status` are skipped. Returns how many changed, or None on failure.
+        """
+        if status not in self.STUDENT_STATUSES:
+            raise ValueError(f"Invalid student status: {status}")
+        ids = list(dict.fromkeys(student_ids))
+        if not ids:
+            return 0
+        try:
+            changed = 0
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                for start in range(0, len(ids), batch_size):
+                    batch = ids[start:start + batch_size]
+                    placeholders = ", ".join(["%s"] * len(batch))
+                    # Lock the rows that will change and keep their old status for the audit trail
+                    cursor.execute(f"""
+                        SELECT id, status FROM students
+                        WHERE id IN ({placeholders}) AND NOT (status <=> %s)
+                        FOR UPDATE
+                    """, (*batch, status))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        continue
+
+                    cursor.execute(
+                        "UPDATE students SET status = %s WHERE id IN ({})".format(", ".join(["%s"] * len(rows))),
+                        (status, *(student_id for student_id, _ in rows))
+                    )
+                    changed += cursor.rowcount
+                    self.db.bulk_insert(
+                        "audit_logs", self.AUDIT_COLUMNS,
+                        ((actor, "status_change", "student", student_id, f"{old or ''} -> {status}")
+                         for student_id, old in rows),
+                        commit=False
+                    )
+                conn.commit()
+            if changed:
+                self.db.invalidate("students")
+            return changed
+        except Error as e:
+            print(f"Error updating student statuses: {e}")
+            return None
+
     def delete_student(self, id):
-        """Delete a student by ID"""
+        """Delete a student by ID and release the stored files of their documents"""
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                # Documents and records go by ON DELETE CASCADE, which fires no triggers,
+                # so their file references are released here in the same transaction
+                hashes = self.db.documents.student_file_hashes(cursor, id)
                 cursor.execute("DELETE FROM students WHERE id = %s", (id,))
-                self.db.connection.commit()
-                return True
+                self.db.documents.release_refs(cursor, hashes)
+                conn.commit()
+                # Everything the delete cascades to, too
+                self.db.invalidate(
+                    "students", "student_parents", "documents", "academic_records", "registrations", "stored_files"
+                )
+                self.db.people.remove("student", id)
+                self.db.audit.record("delete", "student", id)
         except Error as e:
             print(f"Error deleting student: {e}")
             return False
 
+        if hashes:
+            self.db.documents.schedule_collection()
+        return True
+
     def get_student_count(self):
         """Get total number of students"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM students")
-                count = cursor.fetchone()[0]
-                return count
+            return self.db.fetch_one("SELECT COUNT(*) FROM students", prepared=True)[0]
         except Error as e:
             print(f"Error getting student count: {e}")
             return 0
 
     def get_enrolled_students(self):
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM students WHERE status = 'enrolled'")
-                return cursor.fetchone()[0]
+            return self.db.fetch_one("SELECT COUNT(*) FROM students WHERE status = 'enrolled'", prepared=True)[0]
         except Error as e:
             print(f"Error getting enrolled students: {e}")
             return 0
 
     def get_pending_student_count(self):
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM students WHERE status = 'pending'")
-                return cursor.fetchone()[0]
+            return self.db.fetch_one("SELECT COUNT(*) FROM students WHERE status = 'pending'", prepared=True)[0]
         except Error as e:
             print(f"Error getting pending students: {e}")
             return 0
@@ -240,13 +675,8 @@ class StudentController:
     def check_student_id_exists(self, id):
         """Check if student ID already exists"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute(
-                    "SELECT COUNT(*) FROM students WHERE id = %s",
-                    (id,)
-                )
-                count = cursor.fetchone()[0]
-                return count > 0
+            row = self.db.fetch_one("SELECT COUNT(*) FROM students WHERE id = %s", (id,), prepared=True)
+            return row[0] > 0
         except Error as e:
             print(f"Error checking student ID: {e}")
             return True
@@ -254,7 +684,7 @@ class StudentController:
     def get_parents_by_student(self, student_id):
         """Return all parents/guardians of a student"""
         try:
-            with self.db.connection.cursor(dictionary=True) as cursor:
+            with self.db.connection_scope() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute("""
                     SELECT sp.id AS student_parent_id, p.id AS parent_id, p.relationship, 
                            p.occupation, pi.first_name, pi.middle_name, pi.last_name, pi.email, pi.phone_number
@@ -271,7 +701,7 @@ class StudentController:
     def get_parent(self, parent_id):
         """Return a single parent by parent ID"""
         try:
-            with self.db.connection.cursor(dictionary=True) as cursor:
+            with self.db.connection_scope() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute("""
                     SELECT p.id AS parent_id, p.relationship, p.occupation,
                            pi.first_name, pi.middle_name, pi.last_name,
@@ -287,7 +717,7 @@ class StudentController:
 
     def add_parent(self, student_id, parent_data):
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 # 1. Insert personal information
                 cursor.execute("""
                     INSERT INTO personal_information
@@ -321,18 +751,24 @@ class StudentController:
                     parent_id,
                     parent_data.get("is_primary", 0)
                 ))
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("personal_information", "parents", "student_parents")
+                self.db.people.upsert(
+                    "parent", parent_id, parent_data["first_name"], parent_data.get("middle_name"),
+                    parent_data["last_name"], parent_data.get("email"), parent_data.get("phone_number"),
+                    personal_info_id=personal_info_id
+                )
+                self.db.audit.record("create", "parent", parent_id, f"student={student_id}")
                 return True
 
         except Exception as e:
-            self.db.connection.rollback()
             print("Add parent error:", e)
             return False
 
     def update_parent(self, parent_id, parent_data):
         """Update a parent's personal info or relationship"""
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 # Update personal info
                 cursor.execute("""
                     UPDATE personal_information pi
@@ -352,17 +788,19 @@ class StudentController:
                     parent_data["occupation"],
                     parent_id
                 ))
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("personal_information", "parents")
+                self.db.people.refresh("parent", parent_id)
+                self.db.audit.record("update", "parent", parent_id)
                 return True
         except Error as e:
-            self.db.connection.rollback()
             print("Error updating parent:", e)
             return False
 
     def delete_parent(self, student_parent_id):
         """Remove parent-student link and parent if no other student references"""
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 # Get parent_id
                 cursor.execute("SELECT parents_id FROM student_parents WHERE id=%s", (student_parent_id,))
                 res = cursor.fetchone()
@@ -379,10 +817,15 @@ class StudentController:
                 if count == 0:
                     cursor.execute("DELETE FROM parents WHERE id=%s", (parent_id,))
 
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("parents", "student_parents")
+                if count == 0:
+                    self.db.people.remove("parent", parent_id)
+                self.db.audit.record(
+                    "delete" if count == 0 else "unlink", "parent", parent_id, f"student_parent={student_parent_id}"
+                )
                 return True
         except Error as e:
-            self.db.connection.rollback()
             print("Error deleting parent:", e)
             return False
 
@@ -475,16 +918,28 @@ class StudentController:
 
         ]
 
-        created_ids = []
-
-        for student in sample_students:
-            student_id = self.create_student(
-                student_data=student,
-                created_by=created_by,
-                document_files=None
-            )
-            if student_id:
-                created_ids.append(student_id)
-
-        return created_ids
-
+        return self.create_students_bulk(sample_students, created_by)
+
+
+def run_import_job(job):
+    """
+    StudentImporter as a resumable job. The checkpoint counts the data rows
+    already committed and is saved in the same transaction as each chunk, so a
+    resumed job skips exactly those rows and never imports one twice.
+    """
+    done = job.checkpoint or {"rows": 0, "imported": 0, "failed": 0}
+
+    def progress(processed, imported, failed):
+        job.progress(
+            {"rows": done["rows"] + processed, "imported": done["imported"] + imported,
+             "failed": done["failed"] + failed},
+            processed=done["rows"] + processed, failed=done["failed"] + failed
+        )
+
+    importer = StudentImporter(StudentController(job.db))
+    report = importer.run(job.params["path"], job.params["created_by"], checkpoint=progress, start=done["rows"])
+    return {
+        "imported": done["imported"] + report.imported,
+        "failed": done["failed"] + report.failed,
+        "errors": report.errors[:IMPORT_ERROR_SAMPLE],
+    }
@@ -10,9 +10,12 @@ class UserController:
     def delete_user(self, user_id):
         """Delete a user by ID"""
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("users", "students")
+                self.db.people.remove("staff", user_id)
+                self.db.audit.record("delete", "user", user_id)
                 return True
         except Error as e:
             print(f"Error deleting user: {e}")
@@ -21,17 +24,13 @@ class UserController:
     def get_all_users(self, order="DESC"):
         """Fetch all users with related info"""
         try:
-            with self.db.connection.cursor(dictionary=True) as cursor:
+            with self.db.connection_scope() as conn, conn.cursor(dictionary=True) as cursor:
                 if not isinstance(order, str) or order.upper() not in ("ASC", "DESC"):
                     order = "DESC"
 
                 query = (
-                    "SELECT "
-                    "u.id, u.username, u.role, u.status, u.created_at AS created, "
-                    "p.first_name, p.middle_name, p.last_name, p.email, d.name AS department "
-                    "FROM users u "
-                    "LEFT JOIN personal_information p ON u.personal_info_id = p.id "
-                    "LEFT JOIN departments d ON d.id = u.department_id "
+                    f"SELECT {self.USER_LIST_COLUMNS} "
+                    f"{self.USER_LIST_FROM} "
                     f"ORDER BY u.created_at {order}"
                 )
                 cursor.execute(query)
@@ -40,13 +39,52 @@ class UserController:
             print(f"Error getting users: {e}")
             return []
 
+    USER_LIST_COLUMNS = (
+        "u.id, u.username, u.role, u.status, u.created_at AS created, "
+        "p.first_name, p.middle_name, p.last_name, p.email, d.name AS department"
+    )
+
+    USER_LIST_FROM = (
+        "FROM users u "
+        "LEFT JOIN personal_information p ON u.personal_info_id = p.id "
+        "LEFT JOIN departments d ON d.id = u.department_id"
+    )
+
+    def list_staff(self, after_key=None, limit=50, descending=True):
+        """
+        Return one page of staff users as (rows, next_key), ordered by creation time.
+
+        Pass the previous page's next_key as after_key; pages seek on (created_at, id)
+        so every page costs the same. next_key is None on the last page.
+        """
+        limit = max(1, min(int(limit), 500))
+        op, direction = ("<", "DESC") if descending else (">", "ASC")
+        query = f"SELECT {self.USER_LIST_COLUMNS} {self.USER_LIST_FROM} WHERE u.role = 'staff'"
+        params = []
+        if after_key is not None:
+            query += f" AND (u.created_at {op} %s OR (u.created_at = %s AND u.id {op} %s))"
+            created, user_id = after_key
+            params.extend([created, created, user_id])
+        query += f" ORDER BY u.created_at {direction}, u.id {direction} LIMIT %s"
+        params.append(limit + 1)
+
+        try:
+            with self.db.connection_scope() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+        except Error as e:
+            print(f"Error listing staff: {e}")
+            return [], None
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_key = (rows[-1]["created"], rows[-1]["id"]) if has_more else None
+        return rows, next_key
+
     def get_user_count(self):
         """Get total number of users"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM users")
-                count = cursor.fetchone()[0]
-                return count
+            return self.db.fetch_one("SELECT COUNT(*) FROM users", prepared=True)[0]
         except Error as e:
             print(f"Error getting user count: {e}")
             return 0
@@ -54,9 +92,7 @@ class UserController:
     def get_staff_count(self):
         """Get total number of staff users"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'staff'")
-                return cursor.fetchone()[0]
+            return self.db.fetch_one("SELECT COUNT(*) FROM users WHERE role = 'staff'", prepared=True)[0]
         except Error as e:
             print(f"Error getting staff count: {e}")
             return 0
@@ -64,11 +100,9 @@ class UserController:
     def get_active_staff_count(self):
         """Get number of active staff users"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute(
-                    "SELECT COUNT(*) FROM users WHERE role='staff' AND status='active'"
-                )
-                return cursor.fetchone()[0]
+            return self.db.fetch_one(
+                "SELECT COUNT(*) FROM users WHERE role='staff' AND status='active'", prepared=True
+            )[0]
         except Error as e:
             print(f"Error getting active staff: {e}")
             return 0
@@ -76,11 +110,9 @@ class UserController:
     def get_inactive_staff_count(self):
         """Get number of inactive staff users"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute(
-                    "SELECT COUNT(*) FROM users WHERE role='staff' AND status!='active'"
-                )
-                return cursor.fetchone()[0]
+            return self.db.fetch_one(
+                "SELECT COUNT(*) FROM users WHERE role='staff' AND status!='active'", prepared=True
+            )[0]
         except Error as e:
             print(f"Error getting inactive staff: {e}")
             return 0
@@ -88,18 +120,17 @@ class UserController:
     def get_user_by_id(self, user_id: int):
         """Fetch user information by ID with personal info and department"""
         try:
-            with self.db.connection.cursor(dictionary=True) as cursor:
-                query = (
-                    "SELECT u.id, u.username, u.role, u.status, u.personal_info_id, u.department_id, "
-                    "p.first_name, p.middle_name, p.last_name, p.suffix, p.email, "
-                    "p.phone_number, p.address, d.name as department "
-                    "FROM users u "
-                    "LEFT JOIN personal_information p ON u.personal_info_id = p.id "
-                    "LEFT JOIN departments d ON u.department_id = d.id "
-                    "WHERE u.id = %s"
-                )
-                cursor.execute(query, (user_id,))
-                return cursor.fetchone()
+            query = (
+                "SELECT u.id, u.username, u.role, u.status, u.personal_info_id, u.department_id, "
+                "p.first_name, p.middle_name, p.last_name, p.suffix, p.email, "
+                "p.phone_number, p.address, d.name as department "
+                "FROM users u "
+                "LEFT JOIN personal_information p ON u.personal_info_id = p.id "
+                "LEFT JOIN departments d ON u.department_id = d.id "
+                "WHERE u.id = %s"
+            )
+            return self.db.fetch_one(query, (user_id,), dictionary=True, prepared=True,
+                                     cache_tables=("users", "personal_information", "departments"))
         except Error as e:
             print(f"Error fetching user: {e}")
             return None
@@ -129,15 +160,22 @@ class UserController:
                 params.append(user_id)
                 query = f"UPDATE users SET {', '.join(updates)} WHERE id = %s"
                 
-                with self.db.connection.cursor() as cursor:
+                with self.db.connection_scope() as conn, conn.cursor() as cursor:
                     cursor.execute(query, params)
-                    self.db.connection.commit()
+                    conn.commit()
+                    self.db.invalidate("users")
+                self.db.people.refresh("staff", user_id)
             
-            # Update password separately if provided
+            # Update password separately if provided; AuthController audits the change
             if password:
                 auth_controller = AuthController(self.db)
                 auth_controller.update_password(user_id, password)
-            
+
+            changed = [name for name, value in (("username", username), ("role", role), ("status", status),
+                                                ("department_id", department_id))
+                       if value]
+            if changed:
+                self.db.audit.record("update", "user", user_id, ", ".join(changed))
             return True
         except Error as e:
             print(f"Error updating user: {e}")
@@ -180,9 +218,12 @@ class UserController:
             params.append(personal_info_id)
             query = f"UPDATE personal_information SET {', '.join(updates)} WHERE id = %s"
             
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 cursor.execute(query, params)
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("personal_information")
+                self.db.people.refresh_personal_info(personal_info_id)
+                self.db.audit.record("update", "personal_information", personal_info_id)
                 return True
         except Error as e:
             print(f"Error updating personal info: {e}")
@@ -191,15 +232,14 @@ class UserController:
     def check_username_exists(self, username: str, exclude_user_id: int = None) -> bool:
         """Check if username is already taken (optionally exclude a specific user)"""
         try:
-            with self.db.connection.cursor() as cursor:
-                if exclude_user_id:
-                    cursor.execute(
-                        "SELECT COUNT(*) FROM users WHERE username = %s AND id != %s",
-                        (username, exclude_user_id)
-                    )
-                else:
-                    cursor.execute("SELECT COUNT(*) FROM users WHERE username = %s", (username,))
-                return cursor.fetchone()[0] > 0
+            if exclude_user_id:
+                row = self.db.fetch_one(
+                    "SELECT COUNT(*) FROM users WHERE username = %s AND id != %s",
+                    (username, exclude_user_id), prepared=True
+                )
+            else:
+                row = self.db.fetch_one("SELECT COUNT(*) FROM users WHERE username = %s", (username,), prepared=True)
+            return row[0] > 0
         except Error as e:
             print(f"Error checking username: {e}")
             return False
@@ -210,14 +250,16 @@ class UserController:
                             address: str = None) -> int:
         """Create a personal information record and return its ID"""
         try:
-            with self.db.connection.cursor() as cursor:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
                 query = """
                     INSERT INTO personal_information 
                     (first_name, middle_name, last_name, suffix, email, phone_number, address)
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """
                 cursor.execute(query, (first_name, middle_name, last_name, suffix, email, phone_number, address))
-                self.db.connection.commit()
+                conn.commit()
+                self.db.invalidate("personal_information")
+                self.db.audit.record("create", "personal_information", cursor.lastrowid)
                 return cursor.lastrowid
         except Error as e:
             print(f"Error creating personal info: {e}")
@@ -226,11 +268,7 @@ class UserController:
     def get_department_id(self, department_name: str) -> int:
         """Get department ID from department name"""
         try:
-            with self.db.connection.cursor() as cursor:
-                cursor.execute("SELECT id FROM departments WHERE name = %s", (department_name,))
-                result = cursor.fetchone()
-                dept_id = result[0] if result else None
-                return dept_id
+            return self.db.reference.department_id(department_name)
         except Error as e:
             print(f"Error getting department: {e}")
             return None
@@ -240,6 +278,9 @@ class UserController:
         try:
             auth_controller = AuthController(self.db)
             user_id = auth_controller.create_user(username, password, role, personal_info_id, department_id)
+            if user_id:
+                # AuthController.create_user() already recorded the create
+                self.db.people.refresh("staff", user_id)
             return user_id
         except Exception as e:
             print(f"Error creating user: {e}")
@@ -1,32 +1,53 @@
 import sys
+import time
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 
 from controllers.userController import UserController
 # Models
 from models.db import Database
+from models.audit_archive import queue_retention, run_retention_job
+from models.jobs import register_handlers
 
 # Controllers
 from controllers.authController import AuthController
-from controllers.studentController import StudentController
+from controllers.studentController import StudentController, run_import_job
+from controllers.reportsController import run_export_job
 
 # Views
 from views.Auth.login import LoginWindow
 
 if __name__ == "__main__":
     # Initialize database
-    db = Database()
-    db.create_database_if_not_exists()
-    db.connect()
-    db.migrations()
-    db.create_default_admin()
-    db.create_default_staff()
+    # Pooled so background workers can query alongside the UI thread; one connection per
+    # thread that may hold one at the same time:
+    #   UI thread 1, job worker + heartbeat 2, audit writer 1, people index loader 1,
+    #   document store workers 2, dashboard TaskRunner 4 (stats refresh, pages, previews),
+    #   edit student / student report dialogs 1 each
+    # A checkout still waits at most pool_timeout seconds, then fails with PoolError.
+    db = Database(pool_size=13, pool_timeout=10.0)
+    started = time.perf_counter()
+    db.initialize()
+    db.reference.load()
+    db.people.load_async()
+    print(f"Database ready in {(time.perf_counter() - started) * 1000:.1f} ms")
 
     # Initialize controllers
     auth_ctrl = AuthController(db)
     user_ctrl = UserController(db)
     student_ctrl = StudentController(db)
 
+    # Run queued jobs, including ones an earlier session left unfinished
+    register_handlers({
+        "student_import": run_import_job,
+        "report_export": run_export_job,
+        "audit_retention": run_retention_job,
+    })
+    db.jobs.start()
+    db.audit.start()
+    queue_retention(db)
+    db.documents.submit(db.documents.collect_garbage)
+
     # Initialize PyQt application
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(r"C:\Users\Machcreator\PycharmProjects\StudentRegisSys\images\LOGO (1).png"))
@@ -40,6 +61,7 @@ if __name__ == "__main__":
         role = user.get("role")
         user_id = user.get("id")
         username = user.get("username")
+        db.audit.set_actor(user_id)
 
         if role.lower() == "admin":
             from views.Dashboard.admin_dashboard import AdminDashboard
@@ -52,5 +74,11 @@ if __name__ == "__main__":
         window.hide()
 
     window.login_successful.connect(open_dashboard)
+    app.aboutToQuit.connect(lambda: print(db.instrumentation.report()))
+    app.aboutToQuit.connect(lambda: print(db.cache.report()))
+    app.aboutToQuit.connect(db.jobs.stop)
+    app.aboutToQuit.connect(db.audit.stop)
+    app.aboutToQuit.connect(db.documents.shutdown)
+    app.aboutToQuit.connect(db.thumbnails.shutdown)
 
     sys.exit(app.exec())
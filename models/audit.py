@@ -0,0 +1,181 @@
+"""
+Audit trail writer.
+
+Controllers call db.audit.record(...) after a write commits. Events are queued
+in memory and a background thread stores them in audit_logs with multi-row
+INSERTs, every flush_interval seconds or as soon as batch_size events are
+waiting, so recording costs the caller an append instead of a round trip.
+stop() (wired to application shutdown) flushes what is left.
+
+Events carry their own created_at, taken when they were recorded, so the log
+keeps the order things happened in however late the batch is written. When
+the database is unreachable the batch is kept and retried; past max_pending
+queued events the oldest are dropped and counted in `dropped`. The actor
+defaults to the signed-in user set with set_actor().
+"""
+import threading
+from collections import deque
+from datetime import datetime
+
+from mysql.connector import Error, IntegrityError
+
+
+class AuditLog:
+    COLUMNS = ("user_id", "action", "object_type", "object_id", "details", "created_at")
+
+    def __init__(self, db, flush_interval=2.0, batch_size=200, max_pending=50000):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.actor = None
+        self.written = 0
+        self.dropped = 0
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # one writer at a time keeps batches in order
+        self._stopping = False
+        self._thread = None
+
+    def set_actor(self, user_id):
+        """Default user for events recorded without an explicit actor (the signed-in user)"""
+        self.actor = user_id
+
+    def record(self, action, object_type, object_id=None, details=None, actor=None):
+        event = (actor if actor is not None else self.actor, action, object_type, object_id, details,
+                 datetime.now())
+        with self._cond:
+            self._pending.append(event)
+            if len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def record_many(self, events, actor=None):
+        """Queue (action, object_type, object_id, details) tuples in one go"""
+        now = datetime.now()
+        actor = actor if actor is not None else self.actor
+        with self._cond:
+            self._pending.extend((actor, *event, now) for event in events)
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    # ------------------- WRITER -------------------
+    def start(self):
+        """Start the background writer (needs a pooled Database)"""
+        if not self.db.is_pooled:
+            raise RuntimeError("AuditLog needs a pooled Database (pool_size=...)")
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=10):
+        """Stop the writer and flush everything still queued"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Write queued events now; returns how many were stored"""
+        with self._flush_lock:
+            stored = 0
+            while True:
+                with self._cond:
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    return stored
+                try:
+                    self.db.bulk_insert("audit_logs", self.COLUMNS, batch, batch_size=self.batch_size)
+                    written, unsaved = len(batch), []
+                except IntegrityError:
+                    # e.g. an actor deleted meanwhile: store the batch row by row, skipping bad rows
+                    written, unsaved = self._insert_rows(batch)
+                except Error as e:
+                    print(f"Error writing audit log: {e}")
+                    written, unsaved = 0, batch
+                stored += written
+                self.written += written
+                if unsaved:
+                    # Keep them at the front for the next attempt
+                    with self._cond:
+                        self._pending.extendleft(reversed(unsaved))
+                    return stored
+
+    def _insert_rows(self, batch):
+        """Insert one event at a time; returns (stored, events left unsaved by a database error)"""
+        stored = 0
+        for i, event in enumerate(batch):
+            try:
+                self.db.bulk_insert("audit_logs", self.COLUMNS, [event])
+                stored += 1
+            except IntegrityError as e:
+                print(f"Dropping audit event {event[1]} {event[2]} {event[3]}: {e}")
+                self.dropped += 1
+            except Error as e:
+                print(f"Error writing audit log: {e}")
+                return stored, batch[i:]
+        return stored, []
+
+    # ------------------- QUERIES -------------------
+    # Both flush the queue first so recent events are included. They use the indexes
+    # added with the monthly partitions, and `since` lets MySQL skip older months.
+    HISTORY_COLUMNS = "id, user_id, action, object_type, object_id, details, created_at"
+
+    def history(self, object_type, object_id, since=None, limit=50):
+        """Latest events for one object, newest first (idx_audit_object)"""
+        self.flush()
+        query = f"SELECT {self.HISTORY_COLUMNS} FROM audit_logs WHERE object_type = %s AND object_id = %s"
+        params = [object_type, object_id]
+        if since is not None:
+            query += " AND created_at >= %s"
+            params.append(since)
+        query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+        params.append(limit)
+        try:
+            return self.db.fetch_all(query, tuple(params), dictionary=True)
+        except Error as e:
+            print(f"Error reading audit history: {e}")
+            return []
+
+    def activity(self, since, until=None, user_id=None, limit=200):
+        """Events in [since, until), newest first, optionally for one user (idx_audit_created / idx_audit_user)"""
+        self.flush()
+        query = f"SELECT {self.HISTORY_COLUMNS} FROM audit_logs WHERE created_at >= %s"
+        params = [since]
+        if until is not None:
+            query += " AND created_at < %s"
+            params.append(until)
+        if user_id is not None:
+            query += " AND user_id = %s"
+            params.append(user_id)
+        query += " ORDER BY created_at DESC, id DESC LIMIT %s"
+        params.append(limit)
+        try:
+            return self.db.fetch_all(query, tuple(params), dictionary=True)
+        except Error as e:
+            print(f"Error reading audit activity: {e}")
+            return []
+
+    def __len__(self):
+        return len(self._pending)
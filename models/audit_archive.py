@@ -0,0 +1,143 @@
+"""
+Retention for the monthly audit_logs partitions (migration 9).
+
+AuditRetention keeps AUDIT_MONTHS_AHEAD empty partitions ready past the
+current month and, for every month older than keep_months, streams that
+partition's rows to a gzip CSV under archive_dir, fsyncs it, and only then
+drops the partition. Dropping a partition is a metadata change however many
+rows it held, so the live table stays the size of the retention window.
+
+It runs as the "audit_retention" job; main.py calls queue_retention() at
+startup, which queues a run at most once a day. A resumed run skips the
+months already dropped; a month archived but not yet dropped is archived again.
+"""
+import csv
+import gzip
+import io
+import os
+import re
+from datetime import date
+
+from mysql.connector import Error
+
+from models.migrations import AUDIT_MONTHS_AHEAD, add_months, audit_partition
+
+_MONTH_PARTITION = re.compile(r"^p(\d{4})(\d{2})$")
+
+
+class AuditRetention:
+    COLUMNS = ("id", "user_id", "action", "object_type", "object_id", "details", "created_at")
+
+    def __init__(self, db, keep_months=24, archive_dir="archives/audit_logs"):
+        if keep_months < 1:
+            raise ValueError("keep_months must be at least 1")
+        self.db = db
+        self.keep_months = keep_months
+        self.archive_dir = archive_dir
+
+    def month_partitions(self):
+        """{month: partition name} of the monthly partitions, oldest first (empty if not partitioned)"""
+        rows = self.db.fetch_all("""
+            SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs' AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """)
+        months = {}
+        for (name,) in rows:
+            match = _MONTH_PARTITION.match(name)
+            if match:
+                months[date(int(match.group(1)), int(match.group(2)), 1)] = name
+        return months
+
+    def current_month(self):
+        return add_months(self.db.fetch_one("SELECT CURDATE()")[0], 0)
+
+    def add_future_partitions(self):
+        """Split p_future so the next AUDIT_MONTHS_AHEAD months have partitions; returns how many were added"""
+        months = self.month_partitions()
+        if not months:
+            return 0
+        month, last = add_months(max(months), 1), add_months(self.current_month(), AUDIT_MONTHS_AHEAD)
+        new = []
+        while month <= last:
+            new.append(audit_partition(month))
+            month = add_months(month, 1)
+        if new:
+            # p_future is empty in normal operation, so reorganizing it moves no rows
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "ALTER TABLE audit_logs REORGANIZE PARTITION p_future INTO ({}, "
+                    "PARTITION p_future VALUES LESS THAN MAXVALUE)".format(", ".join(new))
+                )
+        return len(new)
+
+    def expired_partitions(self):
+        """Partition names of the months older than the retention window, oldest first"""
+        cutoff = add_months(self.current_month(), 1 - self.keep_months)
+        return [name for month, name in sorted(self.month_partitions().items()) if month < cutoff]
+
+    def archive_path(self, name):
+        match = _MONTH_PARTITION.match(name)
+        return os.path.join(self.archive_dir, f"audit_logs_{match.group(1)}_{match.group(2)}.csv.gz")
+
+    def archive_partition(self, name):
+        """Write one month to its archive file, then drop the partition; returns the row count"""
+        if not _MONTH_PARTITION.match(name):
+            raise ValueError(f"Not a monthly audit partition: {name!r}")
+        path = self.archive_path(name)
+        partial = path + ".part"
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        rows = 0
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM audit_logs PARTITION ({name}) ORDER BY id"
+        try:
+            with open(partial, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as compressed, \
+                        io.TextIOWrapper(compressed, encoding="utf-8", newline="") as text:
+                    writer = csv.writer(text)
+                    writer.writerow(self.COLUMNS)
+                    for row in self.db.fetch_iter(query, batch_size=2000):
+                        writer.writerow(row)
+                        rows += 1
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+        with self.db.connection_scope() as conn, conn.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE audit_logs DROP PARTITION {name}")
+        return rows
+
+
+def queue_retention(db, keep_months=24, archive_dir="archives/audit_logs", every_hours=24):
+    """Queue an audit_retention job unless one is pending or finished within `every_hours`"""
+    try:
+        recent = db.fetch_one("""
+            SELECT COUNT(*) FROM jobs
+            WHERE kind = 'audit_retention'
+              AND (state IN ('queued', 'running') OR finished_at > NOW() - INTERVAL %s HOUR)
+        """, (every_hours,))[0]
+    except Error as e:
+        print(f"Error checking audit retention: {e}")
+        return None
+    if recent:
+        return None
+    return db.jobs.enqueue("audit_retention", {"keep_months": keep_months, "archive_dir": archive_dir})
+
+
+def run_retention_job(job):
+    retention = AuditRetention(job.db, job.params.get("keep_months", 24),
+                               job.params.get("archive_dir", "archives/audit_logs"))
+    added = retention.add_future_partitions()
+
+    done = job.checkpoint or {"archived": [], "rows": 0}
+    expired = retention.expired_partitions()
+    job.total = len(done["archived"]) + len(expired)
+    for name in expired:
+        rows = retention.archive_partition(name)
+        done = {"archived": done["archived"] + [name], "rows": done["rows"] + rows}
+        job.progress(done, processed=len(done["archived"]))
+    return {"partitions_added": added, **done}
@@ -1,15 +1,174 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode, pooling
+from mysql.connector.errors import PoolError
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
 import hashlib
+import re
+import sys
+import threading
+import time
+import weakref
+
+from models.audit import AuditLog
+from models.document_store import DocumentStore
+from models.instrumentation import QueryInstrumentation
+from models.jobs import JobQueue
+from models.people_index import PeopleIndex
+from models.reference_data import ReferenceData
+from models.thumbnails import ThumbnailService
+from models.migrations import MIGRATIONS, rebuild_stats_counters, seed_default_admin, seed_default_staff
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _freeze(params):
+    """Make query params usable in a cache key"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
+
+
+def _copy_rows(value):
+    # Callers are free to mutate what they get back, so never hand out the cached objects
+    if isinstance(value, list):
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class QueryCache:
+    """
+    Read-query result cache: LRU over max_entries, each entry expiring after ttl seconds.
+
+    Entries are tagged with the tables the query reads; Database.invalidate(*tables)
+    drops every entry tagged with one of them. Controllers call it after their
+    writes commit, so this process never serves its own stale data; writes made
+    by other clients are picked up when the entry expires.
+
+    A result loaded while an invalidation happened is returned but not stored,
+    since it may predate the write.
+    """
+
+    def __init__(self, max_entries=256, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, tables, value)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, tables, loader, ttl=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy_rows(entry[2])
+                del self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+                self._entries[key] = (expires_at, frozenset(tables), _copy_rows(value))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, tables):
+        tables = set(tables)
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, (_, tags, _) in self._entries.items() if tags & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def report(self):
+        s = self.stats()
+        return (f"query cache: {s['entries']}/{self.max_entries} entries, {s['hits']} hits, "
+                f"{s['misses']} misses ({s['hit_ratio']:.0%}), {s['evictions']} evictions, "
+                f"{s['invalidations']} invalidated")
+
 
 class Database:
-    def __init__(self, host="localhost", user="root", password="", database="student_regis_sys"):
+    def __init__(self, host="localhost", user="root", password="", database="student_regis_sys", pool_size=None,
+                 pool_timeout=10.0, slow_query_ms=200, slow_query_log="logs/slow_queries.log", cache_size=256, cache_ttl=30.0):
         self.host = host
         self.user = user
         self.password = password
         self.database = database
         self.connection = None
 
+        # Every connection handed out is wrapped so all cursors are timed
+        self.instrumentation = QueryInstrumentation(slow_query_ms, slow_query_log)
+
+        # Results of reads issued with cache_tables=...; see invalidate()
+        self.cache = QueryCache(cache_size, cache_ttl)
+
+        # Strand / grade level / department name <-> id maps, shared by every controller
+        self.reference = ReferenceData(self)
+
+        # Type-ahead over students, parents and staff; see models/people_index.py
+        self.people = PeopleIndex(self)
+
+        # Background jobs (imports, exports, ...); see models/jobs.py
+        self.jobs = JobQueue(self)
+
+        # Queued audit_logs writer; see models/audit.py
+        self.audit = AuditLog(self)
+
+        # Content-addressed uploaded files; see models/document_store.py
+        self.documents = DocumentStore(self)
+
+        # Preview thumbnails of uploaded pictures and PDFs; see models/thumbnails.py
+        self.thumbnails = ThumbnailService()
+
+        # Pooled mode: every thread checks out its own connection through connection_scope(),
+        # waiting at most pool_timeout seconds for a free one
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self._pool = None
+        self._pool_slots = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+
+        # Prepared cursors per physical connection: {connection: {(query, dictionary): cursor}}
+        self._prepared = weakref.WeakKeyDictionary()
+        self._prepared_lock = threading.Lock()
+
     def create_database_if_not_exists(self):
         try:
             conn = mysql.connector.connect(
@@ -27,270 +186,143 @@ class Database:
             print(f"Error creating database: {err}")
             raise
 
+    def _connection_args(self):
+        return {
+            "host": self.host,
+            "user": self.user,
+            "password": self.password,
+            "database": self.database,
+        }
+
     def connect(self):
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-            )
-            if self.connection.is_connected():
-                print(f"Connected to {self.database} database")
+            self.connection = self.instrumentation.wrap(mysql.connector.connect(**self._connection_args()))
+            print(f"Connected to {self.database} database")
         except mysql.connector.Error as e:
             print(f"Connection error: {e}")
             raise
 
-    def migrations(self):
-        if not self.connection or not self.connection.is_connected():
-            raise RuntimeError("Call create_database_if_not_exists() and connect() first.")
-
-        cursor = self.connection.cursor()
+    @property
+    def is_pooled(self):
+        return bool(self.pool_size)
+
+    def _ensure_pool(self):
+        # Built on first checkout so startup does not pay for pool_size handshakes
+        with self._pool_lock:
+            if self._pool is None:
+                # No session reset on return: it would deallocate the prepared
+                # statements, and _release() already rolls back open transactions.
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name=f"{self.database}_pool",
+                    pool_size=self.pool_size,
+                    pool_reset_session=False,
+                    **self._connection_args()
+                )
+                # The connector raises instead of waiting when the pool is empty,
+                # so callers queue on this semaphore for a free slot.
+                self._pool_slots = threading.BoundedSemaphore(self.pool_size)
+        return self._pool
+
+    @contextmanager
+    def connection_scope(self):
+        """
+        Check out a connection for the current thread.
+
+        In pooled mode each thread gets its own connection from the pool; otherwise
+        the shared connection is used. Scopes nest: an inner scope reuses the
+        connection of the outer one, so a controller method can call other
+        helpers inside one transaction. Uncommitted work is rolled back when the
+        outermost scope exits.
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._checkout()
+        self._local.connection = conn
         try:
-
-            # PERSONAL INFORMATION TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS personal_information (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                first_name VARCHAR(100) NOT NULL,
-                middle_name VARCHAR(100),
-                last_name VARCHAR(100) NOT NULL,
-                suffix VARCHAR(20),
-                sex ENUM('M','F','Other'),
-                nationality VARCHAR(100),
-                place_of_birth VARCHAR(255),
-                email VARCHAR(150),
-                phone_number VARCHAR(12),
-                date_of_birth DATE,
-                address TEXT,
-                profile_picture_path VARCHAR(255), -- recommended: store path/URL, not blob
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-
-                INDEX idx_fullname (last_name, first_name)
-            )
-            """)
-
-            # DEPARTMENTS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS departments (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name ENUM('Administration', 'Registrar'),
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """)
-
-            # USERS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                personal_info_id INT NULL,
-                department_id INT NULL,
-                username VARCHAR(50) UNIQUE NOT NULL,
-                password VARCHAR(255) NOT NULL, -- store hash
-                role ENUM('admin','staff') NOT NULL DEFAULT 'staff',
-                status ENUM('active', 'inactive') DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                
-                INDEX idx_username (username),
-                
-                FOREIGN KEY (department_id) REFERENCES departments(id) ON DELETE SET NULL,
-                FOREIGN KEY (personal_info_id) REFERENCES personal_information(id) ON DELETE SET NULL
-            ) AUTO_INCREMENT = 101
-            """)
-
-            # STRANDS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS strands (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                strand_name VARCHAR(50) UNIQUE NOT NULL, -- e.g. STEM, ABM, HUMSS
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-
-            # GRADE LEVELS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS grade_levels (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                level VARCHAR(10) UNIQUE NOT NULL, -- '11', '12'
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-
-            # STUDENTS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS students (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                personal_info_id INT NOT NULL,
-                strand_id INT,
-                grade_level_id INT,
-                student_type ENUM('new','returnee','als','pept','transferee') DEFAULT 'new',
-                status ENUM('enrolled', 'pending', 'cancelled') DEFAULT 'pending',
-                created_by INT,
-                registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                
-                INDEX idx_student_personal (personal_info_id),
-                
-                FOREIGN KEY (personal_info_id) REFERENCES personal_information(id) ON DELETE CASCADE,
-                FOREIGN KEY (strand_id) REFERENCES strands(id) ON DELETE SET NULL,
-                FOREIGN KEY (grade_level_id) REFERENCES grade_levels(id) ON DELETE SET NULL,
-                FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
-            )AUTO_INCREMENT=101001;
-            """)
-
-            # PARENTS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS parents (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                personal_info_id INT NOT NULL,
-                relationship ENUM('father', 'mother', 'guardian') NOT NULL,
-                occupation VARCHAR(150),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                
-                INDEX idx_guardian_personal (personal_info_id),
-                
-                FOREIGN KEY (personal_info_id) REFERENCES personal_information(id) ON DELETE CASCADE
-            ) AUTO_INCREMENT=1001;
-            """)
-
-            # STUDENT-PARENTS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS student_parents (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT NOT NULL,
-                parents_id INT NOT NULL,
-                is_primary BOOLEAN DEFAULT FALSE,
-                
-                INDEX idx_sg_student (student_id),
-                INDEX idx_sg_guardian (parents_id),
-                
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (parents_id) REFERENCES parents(id) ON DELETE CASCADE
+            yield conn
+        finally:
+            self._local.connection = None
+            self._release(conn)
+
+    def _checkout(self):
+        if not self.is_pooled:
+            if not self.connection:
+                raise RuntimeError("Database not connected")
+            return self.connection
+
+        pool = self._ensure_pool()
+        # Bounded so no thread, the UI thread above all, can hang on an exhausted pool.
+        # PoolError is an Error, so controllers report it like any failed query.
+        if not self._pool_slots.acquire(timeout=self.pool_timeout):
+            raise PoolError(
+                f"No database connection free after {self.pool_timeout:g}s "
+                f"(pool_size={self.pool_size}); raise pool_size or look for a thread holding one"
             )
-            """)
+        try:
+            return self.instrumentation.wrap(pool.get_connection())
+        except Error:
+            self._pool_slots.release()
+            raise
 
-            # ACADEMIC RECORDS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS academic_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT NOT NULL,
-                record_type ENUM('Form137','Form138','NCAE','A&E','PEPT','Other') NOT NULL,
-                school_name VARCHAR(255) NOT NULL,
-                school_year BIGINT NOT NULL,
-                file_path VARCHAR(255) NOT NULL,
-                uploaded_by INT,
-                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                notes TEXT,
-                
-                INDEX idx_ac_student (student_id),
-                INDEX idx_ac_type (record_type),
-                
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (uploaded_by) REFERENCES users(id) ON DELETE SET NULL
-            )
-            """)
+    def _release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Error as e:
+            print(f"Rollback error: {e}")
+        finally:
+            if self._pool is not None:
+                try:
+                    conn.close()  # returns the connection to the pool
+                finally:
+                    self._pool_slots.release()
+
+    def schema_version(self):
+        """Return the highest applied migration version, or 0 for an unversioned database"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT MAX(version) FROM schema_version")
+            row = cursor.fetchone()
+            return row[0] or 0
+        except Error as err:
+            if err.errno == errorcode.ER_NO_SUCH_TABLE:
+                return 0
+            raise
+        finally:
+            cursor.close()
 
-            # DOCUMENTS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS documents (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT,
-                doc_type ENUM('PSA_BIRTH','GOOD_MORAL','ID_PICTURE','OTHERS') NOT NULL,
-                file_path VARCHAR(255) NOT NULL,
-                uploaded_by INT,
-                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                notes TEXT,
-                
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (uploaded_by) REFERENCES users(id) ON DELETE SET NULL,
-                
-                INDEX idx_docs_student (student_id),
-                INDEX idx_docs_type (doc_type)
-            )
-            """)
+    def migrations(self):
+        """Apply pending steps from models.migrations; an up-to-date schema costs one query"""
+        if not self.connection:
+            raise RuntimeError("Call create_database_if_not_exists() and connect() first.")
 
-            # REGISTRATIONS TABLE
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS registrations (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                student_id INT NOT NULL,
-                school_year VARCHAR(20),
-                required_documents TEXT, 
-                is_complete BOOLEAN DEFAULT FALSE,
-                registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                registered_by INT,
-                
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (registered_by) REFERENCES users(id) ON DELETE SET NULL,
-                
-                INDEX idx_reg_student (student_id)
-            )
-            """)
+        current = self.schema_version()
+        pending = [m for m in MIGRATIONS if m[0] > current]
+        if not pending:
+            return
 
-            # AUDIT LOGS TABLE
+        cursor = self.connection.cursor()
+        try:
             cursor.execute("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT,
-                action VARCHAR(255),
-                object_type VARCHAR(100),
-                object_id INT,
-                details TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
-                INDEX idx_audit_user (user_id)
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INT PRIMARY KEY,
+                description VARCHAR(255),
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             """)
 
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reports (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                report_type VARCHAR(50),
-                generated_by INT,
-                generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                
-                FOREIGN KEY(generated_by) REFERENCES users(id) ON DELETE SET NULL
-                )
-                """)
-
-            # Seed basic strands, grade levels, and departments if empty
-            # Check departments
-            cursor.execute("SELECT COUNT(*) FROM departments")
-            count = cursor.fetchone()[0]
-
-            if count == 0:
-                departments = ['Administration', 'Registrar']
-                dept_tuples = [(d,) for d in departments]
-                cursor.executemany(
-                    "INSERT INTO departments (name) VALUES (%s)",
-                    dept_tuples
-                )
-
-            # Check strands
-            cursor.execute("SELECT COUNT(*) FROM strands")
-            count = cursor.fetchone()[0]  # fetchone() returns a tuple like (count,)
-
-            if count == 0:
-                strand = ['STEM', 'HUMSS', 'ABM', 'TVL', 'GAS']
-                strands= [(s,) for s in strand]  # convert to list of tuples
-                cursor.executemany(
-                    "INSERT INTO strands (strand_name) VALUES (%s)",
-                    strands
-                )
-
-            # Check grade levels
-            cursor.execute("SELECT COUNT(*) FROM grade_levels")
-            count = cursor.fetchone()[0]
-
-            if count == 0:
-                levels = ['11', '12']
-                grade_levels = [(g,) for g in levels]
-                cursor.executemany(
-                    "INSERT INTO grade_levels (level) VALUES (%s)",
-                    grade_levels
+            for version, description, step in pending:
+                step(self, cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (version, description)
                 )
+                self.connection.commit()
+                print(f"Applied migration {version}: {description}")
 
-            self.connection.commit()
             print("Migrations completed successfully.")
         except mysql.connector.Error as err:
             self.connection.rollback()
@@ -299,77 +331,52 @@ class Database:
         finally:
             cursor.close()
 
+    def initialize(self):
+        """
+        Connect and bring the schema up to date.
+
+        Replaces the old create_database_if_not_exists() / connect() / migrations() /
+        create_default_*() sequence: the database is only created when the first
+        connect fails with "unknown database".
+        """
+        try:
+            self.connect()
+        except Error as err:
+            if err.errno != errorcode.ER_BAD_DB_ERROR:
+                raise
+            self.create_database_if_not_exists()
+            self.connect()
+        self.migrations()
+
     def create_default_admin(self):
         """Create default admin user if not exists"""
         try:
-            cursor = self.connection.cursor()
-            # Check if admin exists
-            cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'")
-            result = cursor.fetchone()
-
-            if result[0] == 0:
-                # Default password: admin123
-                username = 'admin'
-                hashed_password = self.hash_password("admin123")
-                role = 'admin'
-                cursor.execute(
-                    "INSERT INTO users (username, password, role) VALUES (%s, %s, %s)",
-                    (username, hashed_password, role)
-                )
+            with self.connection.cursor() as cursor:
+                seed_default_admin(self, cursor)
                 self.connection.commit()
-                print("Default admin user created")
-
-            cursor.close()
         except Error as e:
             print(f"Error creating default admin: {e}")
 
     def create_default_staff(self):
         """Create default staff with personal info and department if not exists"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'staff'")
-            result = cursor.fetchone()
-
-            if result[0] == 0:
-                # 1️⃣ Create default personal information
-                first_name = "First"
-                middle_name = "Middle"
-                last_name = "Staff"
-                email = "staff@school.com"
-                phone_number = "09123456789"
-
-                cursor.execute("""
-                    INSERT INTO personal_information (first_name,middle_name, last_name, email, phone_number)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (first_name, middle_name, last_name, email, phone_number))
-
-                personal_info_id = cursor.lastrowid  # get the generated id
-
-                department_name = "Administration"
-                cursor.execute("SELECT id FROM departments WHERE name = %s", (department_name,))
-                dep = cursor.fetchone()
-                if dep:
-                    department_id = dep[0]
-                else:
-                    cursor.execute("INSERT INTO departments (name) VALUES (%s)", (department_name,))
-                    department_id = cursor.lastrowid
-
-                username = 'staff'
-                hashed_password = self.hash_password("staff123")
-                role = 'staff'
-                cursor.execute("""
-                    INSERT INTO users (username, password, role, personal_info_id, department_id)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (username, hashed_password, role, personal_info_id, department_id))
-
+            with self.connection.cursor() as cursor:
+                seed_default_staff(self, cursor)
                 self.connection.commit()
-                print("Default staff user created")
-
-            cursor.close()
-
         except Error as e:
             print(f"Error creating default staff: {e}")
 
+    def reconcile_stats_counters(self):
+        """Rebuild stats_counters from students and users, e.g. after a bulk load with triggers off"""
+        try:
+            with self.connection_scope() as conn, conn.cursor() as cursor:
+                rebuild_stats_counters(cursor)
+                conn.commit()
+                return True
+        except Error as e:
+            print(f"Error reconciling stats counters: {e}")
+            return False
+
     @staticmethod
     def hash_password(password):
         """Hash password using SHA-256"""
@@ -377,42 +384,167 @@ class Database:
 
     def close(self):
         """Close database connection"""
+        self.audit.stop()
         if self.connection and self.connection.is_connected():
             self.connection.close()
             print("Database connection closed")
 
-    def fetch_all(self, query, params=None):
-        """Helper to execute a query and return all rows."""
-        if not self.connection or not self.connection.is_connected():
-            raise RuntimeError("Database not connected")
-        cursor = self.connection.cursor()
-        try:
+    def fetch_all(self, query, params=None, dictionary=False, cache_tables=None, prepared=False):
+        """
+        Helper to execute a query and return all rows.
+
+        With cache_tables (the tables the query reads) the result goes through
+        self.cache, unless the call is nested in an open connection_scope(), whose
+        transaction may hold uncommitted writes. prepared=True runs the query as a
+        server-side prepared statement (see _prepared_cursor()).
+        """
+        if cache_tables and not self.in_scope:
+            return self.cache.get_or_load(
+                ("all", query, _freeze(params), dictionary), cache_tables,
+                lambda: self.fetch_all(query, params, dictionary, prepared=prepared)
+            )
+        if prepared:
+            with self.connection_scope() as conn:
+                return self._execute_prepared(conn, query, params, dictionary)
+        with self.connection_scope() as conn, conn.cursor(dictionary=dictionary) as cursor:
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             return cursor.fetchall()
-        finally:
-            cursor.close()
 
-    def fetch_one(self, query, params=None):
-        """Helper to execute a query and return a single row."""
-        if not self.connection or not self.connection.is_connected():
-            raise RuntimeError("Database not connected")
-        cursor = self.connection.cursor()
-        try:
+    def fetch_one(self, query, params=None, dictionary=False, cache_tables=None, prepared=False):
+        """Helper to execute a query and return a single row; caching and prepared as in fetch_all()"""
+        if cache_tables and not self.in_scope:
+            return self.cache.get_or_load(
+                ("one", query, _freeze(params), dictionary), cache_tables,
+                lambda: self.fetch_one(query, params, dictionary, prepared=prepared)
+            )
+        if prepared:
+            with self.connection_scope() as conn:
+                rows = self._execute_prepared(conn, query, params, dictionary)
+                return rows[0] if rows else None
+        with self.connection_scope() as conn, conn.cursor(dictionary=dictionary) as cursor:
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             return cursor.fetchone()
-        finally:
-            cursor.close()
+
+    def _prepared_cursor(self, conn, query, dictionary):
+        """
+        Return the prepared cursor for `query` on this physical connection.
+
+        MySQL parses a prepared statement once and afterwards only receives the
+        parameters, so each (query, dictionary) pair gets one long-lived cursor
+        per connection. The statements live as long as the connection: pooled
+        connections keep them because the pool does not reset sessions.
+        """
+        physical = getattr(conn, "raw_connection", conn)
+        physical = getattr(physical, "_cnx", physical)  # PooledMySQLConnection wraps the real one
+        with self._prepared_lock:
+            statements = self._prepared.get(physical)
+            if statements is None:
+                statements = self._prepared[physical] = {}
+        cursor = statements.get((query, dictionary))
+        if cursor is None:
+            cursor = statements[(query, dictionary)] = conn.cursor(prepared=True, dictionary=dictionary)
+        return cursor, statements
+
+    def _execute_prepared(self, conn, query, params, dictionary=False):
+        cursor, statements = self._prepared_cursor(conn, query, dictionary)
+        try:
+            cursor.execute(query, tuple(params or ()))
+            return cursor.fetchall()
+        except Error:
+            # The statement may be gone (e.g. reconnect); prepare it afresh next time
+            statements.pop((query, dictionary), None)
+            try:
+                cursor.close()
+            except Error:
+                pass
+            raise
+
+    @property
+    def in_scope(self):
+        """True when the current thread already holds a connection_scope()"""
+        return getattr(self._local, "connection", None) is not None
+
+    def invalidate(self, *tables):
+        """Drop cached results that read any of `tables`; call once the write has committed"""
+        self.cache.invalidate(tables)
+        reference_tables = [t for t in tables if t in ReferenceData.QUERIES]
+        if reference_tables:
+            self.reference.invalidate(*reference_tables)
+
+    def bulk_insert(self, table, columns, rows, batch_size=500, commit=True):
+        """
+        Insert `rows` (an iterable of sequences matching `columns`) with one multi-row
+        INSERT per batch and return the generated ids in input order.
+
+        A multi-row VALUES list is a "simple insert", for which InnoDB reserves one
+        consecutive auto-increment block, so the ids are derived from LAST_INSERT_ID()
+        and @@auto_increment_increment. Pass commit=False to keep the rows inside the
+        caller's transaction (an enclosing connection_scope()).
+        """
+        for name in (table, *columns):
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid identifier: {name!r}")
+
+        column_sql = ", ".join(f"`{c}`" for c in columns)
+        row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        rows = iter(rows)
+        ids = []
+
+        with self.connection_scope() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT @@auto_increment_increment")
+            step = cursor.fetchone()[0]
+
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                cursor.execute(
+                    f"INSERT INTO `{table}` ({column_sql}) VALUES " + ", ".join([row_sql] * len(batch)),
+                    [value for row in batch for value in row]
+                )
+                first_id = cursor.lastrowid
+                ids.extend(first_id + i * step for i in range(len(batch)))
+
+            if commit:
+                conn.commit()
+        return ids
+
+    def fetch_iter(self, query, params=None, batch_size=500, dictionary=False):
+        """
+        Generator that streams rows through an unbuffered cursor, `batch_size` at a time.
+
+        The connection stays checked out until the generator is exhausted or closed,
+        so consume it promptly (in non-pooled mode nothing else can query meanwhile).
+        """
+        with self.connection_scope() as conn:
+            cursor = conn.cursor(buffered=False, dictionary=dictionary)
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                # Drain whatever the caller did not read so the connection is reusable
+                if conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
 
 
 if __name__ == '__main__':
+    # python -m models.db [reconcile]
     db = Database()
-    db.connect()
-    db.migrations()
-    db.create_default_admin()
-    db.create_default_staff()
\ No newline at end of file
+    db.initialize()
+    if "reconcile" in sys.argv[1:]:
+        if db.reconcile_stats_counters():
+            print("Stats counters rebuilt.")
\ No newline at end of file
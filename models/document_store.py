@@ -0,0 +1,266 @@
+"""
+Content-addressed store for uploaded files.
+
+A file is stored once under the SHA-256 of its contents, in a two-level
+fan-out (objects/ab/cd/abcd...), so no directory holds more than a few files
+however many are uploaded, and the same scan uploaded twice takes the space of
+one. The stored_files table (migration 10) counts the rows pointing at each
+file: documents / academic_records rows carry the hash in file_sha256.
+
+store() copies the source in CHUNK_SIZE pieces, hashing as it goes, into a
+temporary file under tmp/ that is fsynced and renamed into place with
+os.replace(), so a file under its final name is always complete; on any
+failure the temporary file is removed. The caller then records the file and
+calls add_refs() in the same transaction. If that transaction fails,
+discard_unreferenced() records what it stored as unreferenced, for the
+collector to remove.
+
+Deleting rows goes through release_refs() in the deleting transaction.
+collect_garbage() later removes files whose count has been zero for at least
+GRACE_SECONDS; schedule_collection() runs it once that much time has passed.
+
+An upload never trusts a file that is already in place: store() always renames
+its freshly written copy over the final name, so the file's mtime says when it
+was last uploaded, however long ago its references went away. The collector
+locks the stored_files row, moves the file aside and only deletes it if that
+copy is older than GRACE_SECONDS; otherwise it puts it back. An upload that
+lands before the move is seen by its mtime, one that lands after it recreates
+the file, and add_refs() waits on the row lock until the collector is done.
+
+Copies run on the calling thread with store(), or on the store's own small
+thread pool with submit(), which returns a concurrent.futures.Future. Database
+owns one DocumentStore (db.documents).
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from mysql.connector import Error
+
+
+class CopyCancelled(Exception):
+    """Raised by store() when its cancel event is set"""
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    sha256: str
+    path: str
+    size: int
+
+
+class DocumentStore:
+    CHUNK_SIZE = 1024 * 1024
+    GRACE_SECONDS = 300     # how long an unreferenced file is kept before collection
+
+    def __init__(self, db, root="uploaded_documents", workers=2):
+        self.db = db
+        self.root = root
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def path_for(self, sha256):
+        return os.path.join(self.root, "objects", sha256[:2], sha256[2:4], sha256)
+
+    # ------------------- FILES -------------------
+    def store(self, source, progress=None, cancel=None):
+        """
+        Durably store the contents of `source` and return a StoredFile.
+        progress(copied_bytes, total_bytes) is called after every chunk; setting the
+        `cancel` event stops the copy with CopyCancelled. Raises OSError on I/O errors.
+        """
+        staging = os.path.join(self.root, "tmp")
+        os.makedirs(staging, exist_ok=True)
+        total = os.path.getsize(source)
+        digest = hashlib.sha256()
+        fd, partial = tempfile.mkstemp(dir=staging, prefix="upload-", suffix=".part")
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                buffer = bytearray(self.CHUNK_SIZE)
+                view = memoryview(buffer)
+                copied = 0
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        raise CopyCancelled(source)
+                    n = src.readinto(buffer)
+                    if not n:
+                        break
+                    digest.update(view[:n])
+                    dst.write(view[:n])
+                    copied += n
+                    if progress:
+                        progress(copied, total)
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            sha256 = digest.hexdigest()
+            destination = self.path_for(sha256)
+            # Replaced even when the content is already stored: the fresh mtime keeps
+            # collect_garbage() from removing it before the caller's add_refs() commits
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(partial, destination)
+            self._sync_directory(os.path.dirname(destination))
+        except BaseException:
+            try:
+                os.remove(partial)
+            except FileNotFoundError:
+                pass
+            raise
+        return StoredFile(sha256, destination, copied)
+
+    @staticmethod
+    def _sync_directory(directory):
+        # Makes the rename itself durable; directories cannot be opened on Windows
+        if os.name != "posix":
+            return
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing stored file {path}: {e}")
+
+    # ------------------- REFERENCE COUNTS -------------------
+    def add_refs(self, cursor, stored_files):
+        """Count one more reference per StoredFile; run in the transaction that records them"""
+        counts = Counter(stored_files)
+        if not counts:
+            return
+        cursor.executemany("""
+            INSERT INTO stored_files (sha256, path, size, ref_count) VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE ref_count = ref_count + VALUES(ref_count), released_at = NULL
+        """, [(f.sha256, f.path, f.size, n) for f, n in counts.items()])
+
+    def release_refs(self, cursor, hashes):
+        """Drop one reference per hash (repeats count); run in the transaction that deletes the rows"""
+        counts = Counter(h for h in hashes if h)
+        if not counts:
+            return
+        # released_at is assigned first so it still sees the old ref_count
+        cursor.executemany("""
+            UPDATE stored_files
+            SET released_at = IF(ref_count <= %s, NOW(), NULL), ref_count = GREATEST(ref_count - %s, 0)
+            WHERE sha256 = %s
+        """, [(n, n, sha256) for sha256, n in counts.items()])
+
+    def student_file_hashes(self, cursor, student_id):
+        """Hashes referenced by a student's documents and academic records"""
+        cursor.execute("""
+            SELECT file_sha256 FROM documents WHERE student_id = %s AND file_sha256 IS NOT NULL
+            UNION ALL
+            SELECT file_sha256 FROM academic_records WHERE student_id = %s AND file_sha256 IS NOT NULL
+        """, (student_id, student_id))
+        return [sha256 for (sha256,) in cursor.fetchall()]
+
+    def discard_unreferenced(self, stored_files):
+        """
+        Hand files stored for a write that failed over to collect_garbage(). They are
+        not removed here: a concurrent upload of the same content may be about to
+        reference them, which the collector's checks account for.
+        """
+        stored_files = set(stored_files)
+        if not stored_files:
+            return
+        try:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.executemany("""
+                    INSERT INTO stored_files (sha256, path, size, ref_count, released_at)
+                    VALUES (%s, %s, %s, 0, NOW())
+                    ON DUPLICATE KEY UPDATE sha256 = sha256
+                """, [(f.sha256, f.path, f.size) for f in stored_files])
+                conn.commit()
+        except Error as e:
+            print(f"Error releasing stored files: {e}")  # kept on disk; nothing is lost
+
+    def collect_garbage(self, grace_seconds=None, batch_size=500):
+        """Delete files nobody has referenced for grace_seconds; returns how many were removed"""
+        grace_seconds = self.GRACE_SECONDS if grace_seconds is None else grace_seconds
+        removed = 0
+        try:
+            while True:
+                rows = self.db.fetch_all("""
+                    SELECT sha256, path FROM stored_files
+                    WHERE ref_count = 0 AND released_at < NOW() - INTERVAL %s SECOND
+                    LIMIT %s
+                """, (grace_seconds, batch_size))
+                if not rows:
+                    return removed
+                for sha256, path in rows:
+                    if self._collect(sha256, path, grace_seconds):
+                        removed += 1
+                if len(rows) < batch_size:
+                    return removed
+        except Error as e:
+            print(f"Error collecting stored files: {e}")
+            return removed
+
+    def _collect(self, sha256, path, grace_seconds):
+        """Delete one unreferenced file unless it was uploaded again within grace_seconds"""
+        with self.db.connection_scope() as conn, conn.cursor() as cursor:
+            # The row lock holds off add_refs() for this file until we commit or roll back
+            cursor.execute("SELECT ref_count FROM stored_files WHERE sha256 = %s FOR UPDATE", (sha256,))
+            row = cursor.fetchone()
+            if row is None or row[0] != 0:
+                conn.rollback()
+                return False
+            # Once moved aside no new upload can touch this copy, so its mtime is final
+            doomed = f"{path}.{os.getpid()}.{threading.get_ident()}.gc"
+            try:
+                os.replace(path, doomed)
+            except FileNotFoundError:
+                doomed = None
+            if doomed is not None and time.time() - os.stat(doomed).st_mtime < grace_seconds:
+                self._restore(doomed, path)
+                conn.rollback()
+                return False
+            try:
+                cursor.execute("DELETE FROM stored_files WHERE sha256 = %s", (sha256,))
+                conn.commit()
+            except BaseException:
+                if doomed is not None:
+                    self._restore(doomed, path)
+                raise
+        if doomed is not None:
+            self._remove(doomed)
+        return True
+
+    def _restore(self, doomed, path):
+        # A newer upload already back in place has the same content
+        if os.path.exists(path):
+            self._remove(doomed)
+        else:
+            os.replace(doomed, path)
+
+    # ------------------- BACKGROUND -------------------
+    def schedule_collection(self):
+        """Collect garbage on the worker threads once references released now are past the grace period"""
+        timer = threading.Timer(self.GRACE_SECONDS + 1, lambda: self.submit(self.collect_garbage))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the store's worker threads; returns a Future"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="documents")
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
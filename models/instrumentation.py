@@ -0,0 +1,210 @@
+"""
+Query instrumentation.
+
+Database wraps every connection it hands out in an InstrumentedConnection, so any
+cursor -- the fetch_* helpers as well as the ``with conn.cursor()`` blocks in the
+controllers -- reports per-statement latency, row counts, call counts and errors
+to a shared QueryInstrumentation. Statements slower than the threshold (and
+statements that fail) are written to the slow-query log.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(%s, \.\.\.\)(?:\s*,\s*\(%s, \.\.\.\))+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement):
+    """Collapse whitespace and variable-length placeholder lists so IN (...) and
+    multi-row VALUES statements group under one key."""
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode("utf-8", "replace")
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER_LIST.sub("(%s, ...)", statement)
+    return _REPEATED_GROUPS.sub("(%s, ...), ...", statement)
+
+
+class QueryStats:
+    __slots__ = ("calls", "errors", "rows", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class QueryInstrumentation:
+    def __init__(self, slow_query_ms=200, slow_log_path="logs/slow_queries.log"):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.enabled = True
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._slow_log = None
+
+    def wrap(self, connection):
+        return InstrumentedConnection(connection, self)
+
+    # ------------------- RECORDING -------------------
+    def record(self, statement, elapsed_ms, rows=0, error=None):
+        key = normalize_statement(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats()
+            stats.calls += 1
+            stats.rows += rows
+            stats.total_ms += elapsed_ms
+            if elapsed_ms > stats.max_ms:
+                stats.max_ms = elapsed_ms
+            if error is not None:
+                stats.errors += 1
+
+        if error is not None:
+            self._log_slow(logging.WARNING, f"FAILED {elapsed_ms:.1f} ms [{error}] {key}")
+        elif elapsed_ms >= self.slow_query_ms:
+            self._log_slow(logging.INFO, f"{elapsed_ms:.1f} ms rows={rows} {key}")
+        return key
+
+    def add_rows(self, key, rows):
+        """Rows of a result set are counted as they are fetched."""
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is not None:
+                stats.rows += rows
+
+    def _log_slow(self, level, message):
+        if self._slow_log is None:
+            with self._lock:
+                if self._slow_log is None:
+                    self._slow_log = self._open_slow_log()
+        self._slow_log.log(level, message)
+
+    def _open_slow_log(self):
+        logger = logging.getLogger(f"{__name__}.slow_queries")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            directory = os.path.dirname(self.slow_log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = logging.FileHandler(self.slow_log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+            logger.addHandler(handler)
+        return logger
+
+    # ------------------- REPORTING -------------------
+    def snapshot(self):
+        """Return [(statement, QueryStats copy)] sorted by total time spent."""
+        with self._lock:
+            items = []
+            for key, stats in self._stats.items():
+                copy = QueryStats()
+                copy.calls, copy.errors, copy.rows = stats.calls, stats.errors, stats.rows
+                copy.total_ms, copy.max_ms = stats.total_ms, stats.max_ms
+                items.append((key, copy))
+        items.sort(key=lambda item: item[1].total_ms, reverse=True)
+        return items
+
+    def report(self, limit=15):
+        lines = [f"{'calls':>7} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>8} {'err':>4}  statement"]
+        for key, stats in self.snapshot()[:limit]:
+            lines.append(
+                f"{stats.calls:>7} {stats.total_ms:>10.1f} {stats.avg_ms:>8.2f} {stats.max_ms:>8.1f} "
+                f"{stats.rows:>8} {stats.errors:>4}  {key[:120]}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are instrumented; everything else is delegated."""
+
+    def __init__(self, connection, instrumentation):
+        self._connection = connection
+        self._instrumentation = instrumentation
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._connection.cursor(*args, **kwargs)
+        if not self._instrumentation.enabled:
+            return cursor
+        return InstrumentedCursor(cursor, self._instrumentation)
+
+    @property
+    def raw_connection(self):
+        return self._connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, instrumentation):
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+        self._key = None
+
+    def _timed(self, method, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = method(operation, *args, **kwargs)
+        except Exception as e:
+            self._instrumentation.record(operation, (time.perf_counter() - started) * 1000, error=e)
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # Result sets are counted while fetching; DML reports rowcount straight away
+        rows = 0 if getattr(self._cursor, "with_rows", False) else max(self._cursor.rowcount, 0)
+        self._key = self._instrumentation.record(operation, elapsed_ms, rows)
+        return result
+
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, *args, **kwargs)
+
+    def _count(self, rows):
+        if self._key is not None and rows:
+            self._instrumentation.add_rows(self._key, rows)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._count(1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
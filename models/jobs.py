@@ -0,0 +1,285 @@
+"""
+Background jobs with checkpoints.
+
+A job is a row in `jobs`: its kind, JSON params, a JSON checkpoint the handler
+moves forward as it works, and processed/failed/total counters for progress
+displays. Database owns one JobQueue (db.jobs); start() runs queued jobs one at
+a time on a worker thread, which checks out its own pooled connection for
+everything it does, so the UI thread never waits on a long operation.
+
+Handlers live next to the controller code they drive and are registered per
+kind with register_handlers(), which main.py calls before start(). A handler receives a Job, picks up from
+job.checkpoint (None on the first run) and calls job.progress(...) after each
+unit of work has committed. progress() is also where the handler learns that
+the job was cancelled (JobCancelled) or that the worker is stopping
+(JobInterrupted, after which the job goes back to 'queued').
+
+While a job runs, a heartbeat thread touches heartbeat_at. A 'running' job whose
+heartbeat is older than STALE_AFTER seconds belonged to a client that crashed or
+was killed; any worker puts it back in the queue and its handler resumes from
+the last checkpoint. A crash between a unit's commit and its checkpoint replays
+that unit, so handlers keep units small, or call progress() inside the unit's
+transaction so both commit together (as the student import does).
+"""
+import json
+import os
+import socket
+import threading
+
+from mysql.connector import Error
+
+# kind -> handler(job); filled by register_handlers()
+HANDLERS = {}
+
+
+def register_handlers(handlers):
+    """Add {kind: handler(job)} to the job kinds this process can run"""
+    HANDLERS.update(handlers)
+
+
+class JobCancelled(Exception):
+    """Raised from Job.progress() when the job was cancelled or taken over by another worker"""
+
+
+class JobInterrupted(Exception):
+    """Raised from Job.progress() when the worker is stopping; the job is resumed later"""
+
+
+class Job:
+    def __init__(self, queue, row):
+        self.queue = queue
+        self.db = queue.db
+        self.id = row["id"]
+        self.kind = row["kind"]
+        self.params = json.loads(row["params"] or "{}")
+        self.checkpoint = json.loads(row["checkpoint"]) if row["checkpoint"] else None
+        self.processed = row["processed"]
+        self.failed = row["failed"]
+        self.total = row["total"]
+        self.created_by = row["created_by"]
+
+    def progress(self, checkpoint, processed=None, failed=None, total=None):
+        """
+        Record that the work up to `checkpoint` is done; counters are absolute.
+        Outside a transaction the checkpoint is committed at once. Inside one (an
+        enclosing connection_scope() with uncommitted writes) it joins it, so it is
+        saved exactly when that work commits and an exception here rolls both back.
+        """
+        self.checkpoint = checkpoint
+        if processed is not None:
+            self.processed = processed
+        if failed is not None:
+            self.failed = failed
+        if total is not None:
+            self.total = total
+        self.queue._save_progress(self)
+
+
+class JobQueue:
+    POLL_INTERVAL = 5.0     # seconds between looks at the queue when idle
+    STALE_AFTER = 120       # seconds without a heartbeat before a running job counts as orphaned
+
+    JOB_COLUMNS = ("id, kind, state, params, checkpoint, result, processed, failed, total, error, "
+                   "worker, created_by, created_at, started_at, heartbeat_at, finished_at")
+
+    def __init__(self, db):
+        self.db = db
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.current_job_id = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+
+    # ------------------- CLIENT SIDE -------------------
+    def enqueue(self, kind, params=None, created_by=None):
+        """Queue a job and return its id, or None on failure"""
+        if kind not in HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        try:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO jobs (kind, params, created_by) VALUES (%s, %s, %s)",
+                    (kind, json.dumps(params or {}), created_by)
+                )
+                conn.commit()
+                job_id = cursor.lastrowid
+        except Error as e:
+            print(f"Error queueing {kind} job: {e}")
+            return None
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        try:
+            return self.db.fetch_one(f"SELECT {self.JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,),
+                                     dictionary=True)
+        except Error as e:
+            print(f"Error fetching job: {e}")
+            return None
+
+    def list_jobs(self, states=None, limit=50):
+        """Most recent jobs first, optionally only those in `states`"""
+        query = f"SELECT {self.JOB_COLUMNS} FROM jobs"
+        params = []
+        if states:
+            query += " WHERE state IN ({})".format(", ".join(["%s"] * len(states)))
+            params.extend(states)
+        query += " ORDER BY id DESC LIMIT %s"
+        params.append(limit)
+        try:
+            return self.db.fetch_all(query, tuple(params), dictionary=True)
+        except Error as e:
+            print(f"Error listing jobs: {e}")
+            return []
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; a running handler stops at its next progress()"""
+        try:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE jobs SET state = 'cancelled', finished_at = NOW()
+                    WHERE id = %s AND state IN ('queued', 'running')
+                """, (job_id,))
+                conn.commit()
+                return cursor.rowcount == 1
+        except Error as e:
+            print(f"Error cancelling job: {e}")
+            return False
+
+    # ------------------- WORKER -------------------
+    def start(self):
+        """Start the worker thread (needs a pooled Database)"""
+        if not self.db.is_pooled:
+            raise RuntimeError("JobQueue needs a pooled Database (pool_size=...)")
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="jobs", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=10):
+        """Ask the worker to stop; a running job is checkpointed and re-queued at its next progress()"""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.requeue_stale()
+                job = self._claim_next()
+            except Error as e:
+                print(f"Job queue error: {e}")
+                job = None
+            if job is None:
+                self._wake.wait(self.POLL_INTERVAL)
+                self._wake.clear()
+                continue
+            self._execute(job)
+
+    def requeue_stale(self):
+        """Put jobs whose worker stopped heartbeating back in the queue"""
+        with self.db.connection_scope() as conn, conn.cursor() as cursor:
+            cursor.execute("""
+                UPDATE jobs SET state = 'queued', worker = NULL
+                WHERE state = 'running' AND heartbeat_at < NOW() - INTERVAL %s SECOND
+            """, (self.STALE_AFTER,))
+            conn.commit()
+            return cursor.rowcount
+
+    def _claim_next(self):
+        # Only kinds this process can run; another client may know more
+        if not HANDLERS:
+            return None
+        kinds = tuple(HANDLERS)
+        candidates = self.db.fetch_all(
+            "SELECT id FROM jobs WHERE state = 'queued' AND kind IN ({}) ORDER BY id LIMIT 5".format(
+                ", ".join(["%s"] * len(kinds))),
+            kinds
+        )
+        for (job_id,) in candidates:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                # Conditional update: whichever worker flips the state first owns the job
+                cursor.execute("""
+                    UPDATE jobs
+                    SET state = 'running', worker = %s, started_at = COALESCE(started_at, NOW()),
+                        heartbeat_at = NOW()
+                    WHERE id = %s AND state = 'queued'
+                """, (self.worker_id, job_id))
+                conn.commit()
+                if cursor.rowcount != 1:
+                    continue
+            row = self.db.fetch_one(f"SELECT {self.JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,),
+                                    dictionary=True)
+            return Job(self, row)
+        return None
+
+    def _execute(self, job):
+        self.current_job_id = job.id
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job.id, finished),
+                                     name=f"job-{job.id}-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            result = HANDLERS[job.kind](job)
+        except JobInterrupted:
+            self._finish(job, "queued")
+        except JobCancelled:
+            pass  # cancel() already recorded the state
+        except Exception as e:  # a failing handler must not take the worker down
+            print(f"Job {job.id} ({job.kind}) failed: {e}")
+            self._finish(job, "failed", error=str(e))
+        else:
+            self._finish(job, "done", result=result)
+        finally:
+            finished.set()
+            heartbeat.join()
+            self.current_job_id = None
+
+    def _heartbeat(self, job_id, finished):
+        while not finished.wait(self.STALE_AFTER / 4):
+            try:
+                with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                    cursor.execute(
+                        "UPDATE jobs SET heartbeat_at = NOW() WHERE id = %s AND worker = %s",
+                        (job_id, self.worker_id)
+                    )
+                    conn.commit()
+            except Error as e:
+                print(f"Job heartbeat error: {e}")
+
+    def _save_progress(self, job):
+        with self.db.connection_scope() as conn, conn.cursor() as cursor:
+            joined = conn.in_transaction
+            cursor.execute("""
+                UPDATE jobs
+                SET checkpoint = %s, processed = %s, failed = %s, total = %s, heartbeat_at = NOW()
+                WHERE id = %s AND state = 'running' AND worker = %s
+            """, (json.dumps(job.checkpoint), job.processed, job.failed, job.total, job.id, self.worker_id))
+            if not joined:
+                conn.commit()
+            if cursor.rowcount == 0:
+                # Nothing changed is also 0 rows: confirm we still own the job before giving up
+                cursor.execute("SELECT state, worker FROM jobs WHERE id = %s", (job.id,))
+                row = cursor.fetchone()
+                if row is None or row != ("running", self.worker_id):
+                    raise JobCancelled(f"Job {job.id} is no longer running here")
+        if self._stopping.is_set():
+            raise JobInterrupted(f"Job {job.id} interrupted by shutdown")
+
+    def _finish(self, job, state, result=None, error=None):
+        terminal = state != "queued"
+        try:
+            with self.db.connection_scope() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE jobs
+                    SET state = %s, result = %s, error = %s, processed = %s, failed = %s, total = %s,
+                        worker = IF(%s, worker, NULL), finished_at = IF(%s, NOW(), NULL)
+                    WHERE id = %s AND state = 'running' AND worker = %s
+                """, (state, json.dumps(result) if result is not None else None, error,
+                      job.processed, job.failed, job.total, terminal, terminal, job.id, self.worker_id))
+                conn.commit()
+        except Error as e:
+            print(f"Error finishing job {job.id}: {e}")
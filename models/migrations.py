@@ -0,0 +1,566 @@
+"""
+Ordered schema migrations.
+
+Every step is a ``(version, description, function)`` tuple; the function receives
+the Database and an open cursor. Database.migrations() runs the steps newer than
+the version recorded in ``schema_version`` and records each one as it completes.
+Steps that already shipped must never be edited -- append a new step instead.
+"""
+from datetime import date
+
+
+def create_initial_schema(db, cursor):
+    """The original CREATE TABLE IF NOT EXISTS set plus reference data seeds"""
+    # PERSONAL INFORMATION TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS personal_information (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        first_name VARCHAR(100) NOT NULL,
+        middle_name VARCHAR(100),
+        last_name VARCHAR(100) NOT NULL,
+        suffix VARCHAR(20),
+        sex ENUM('M','F','Other'),
+        nationality VARCHAR(100),
+        place_of_birth VARCHAR(255),
+        email VARCHAR(150),
+        phone_number VARCHAR(12),
+        date_of_birth DATE,
+        address TEXT,
+        profile_picture_path VARCHAR(255), -- recommended: store path/URL, not blob
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        INDEX idx_fullname (last_name, first_name)
+    )
+    """)
+
+    # DEPARTMENTS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS departments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name ENUM('Administration', 'Registrar'),
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    # USERS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        personal_info_id INT NULL,
+        department_id INT NULL,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL, -- store hash
+        role ENUM('admin','staff') NOT NULL DEFAULT 'staff',
+        status ENUM('active', 'inactive') DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        INDEX idx_username (username),
+
+        FOREIGN KEY (department_id) REFERENCES departments(id) ON DELETE SET NULL,
+        FOREIGN KEY (personal_info_id) REFERENCES personal_information(id) ON DELETE SET NULL
+    ) AUTO_INCREMENT = 101
+    """)
+
+    # STRANDS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS strands (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        strand_name VARCHAR(50) UNIQUE NOT NULL, -- e.g. STEM, ABM, HUMSS
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # GRADE LEVELS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS grade_levels (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        level VARCHAR(10) UNIQUE NOT NULL, -- '11', '12'
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # STUDENTS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS students (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        personal_info_id INT NOT NULL,
+        strand_id INT,
+        grade_level_id INT,
+        student_type ENUM('new','returnee','als','pept','transferee') DEFAULT 'new',
+        status ENUM('enrolled', 'pending', 'cancelled') DEFAULT 'pending',
+        created_by INT,
+        registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        INDEX idx_student_personal (personal_info_id),
+
+        FOREIGN KEY (personal_info_id) REFERENCES personal_information(id) ON DELETE CASCADE,
+        FOREIGN KEY (strand_id) REFERENCES strands(id) ON DELETE SET NULL,
+        FOREIGN KEY (grade_level_id) REFERENCES grade_levels(id) ON DELETE SET NULL,
+        FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
+    )AUTO_INCREMENT=101001;
+    """)
+
+    # PARENTS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS parents (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        personal_info_id INT NOT NULL,
+        relationship ENUM('father', 'mother', 'guardian') NOT NULL,
+        occupation VARCHAR(150),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+        INDEX idx_guardian_personal (personal_info_id),
+
+        FOREIGN KEY (personal_info_id) REFERENCES personal_information(id) ON DELETE CASCADE
+    ) AUTO_INCREMENT=1001;
+    """)
+
+    # STUDENT-PARENTS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS student_parents (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        parents_id INT NOT NULL,
+        is_primary BOOLEAN DEFAULT FALSE,
+
+        INDEX idx_sg_student (student_id),
+        INDEX idx_sg_guardian (parents_id),
+
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (parents_id) REFERENCES parents(id) ON DELETE CASCADE
+    )
+    """)
+
+    # ACADEMIC RECORDS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS academic_records (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        record_type ENUM('Form137','Form138','NCAE','A&E','PEPT','Other') NOT NULL,
+        school_name VARCHAR(255) NOT NULL,
+        school_year BIGINT NOT NULL,
+        file_path VARCHAR(255) NOT NULL,
+        uploaded_by INT,
+        uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+
+        INDEX idx_ac_student (student_id),
+        INDEX idx_ac_type (record_type),
+
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (uploaded_by) REFERENCES users(id) ON DELETE SET NULL
+    )
+    """)
+
+    # DOCUMENTS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS documents (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT,
+        doc_type ENUM('PSA_BIRTH','GOOD_MORAL','ID_PICTURE','OTHERS') NOT NULL,
+        file_path VARCHAR(255) NOT NULL,
+        uploaded_by INT,
+        uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT,
+
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (uploaded_by) REFERENCES users(id) ON DELETE SET NULL,
+
+        INDEX idx_docs_student (student_id),
+        INDEX idx_docs_type (doc_type)
+    )
+    """)
+
+    # REGISTRATIONS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS registrations (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        school_year VARCHAR(20),
+        required_documents TEXT, 
+        is_complete BOOLEAN DEFAULT FALSE,
+        registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        registered_by INT,
+
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (registered_by) REFERENCES users(id) ON DELETE SET NULL,
+
+        INDEX idx_reg_student (student_id)
+    )
+    """)
+
+    # AUDIT LOGS TABLE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS audit_logs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT,
+        action VARCHAR(255),
+        object_type VARCHAR(100),
+        object_id INT,
+        details TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL,
+        INDEX idx_audit_user (user_id)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS reports (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        report_type VARCHAR(50),
+        generated_by INT,
+        generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+        FOREIGN KEY(generated_by) REFERENCES users(id) ON DELETE SET NULL
+        )
+        """)
+
+    # Seed basic strands, grade levels, and departments if empty
+    # Check departments
+    cursor.execute("SELECT COUNT(*) FROM departments")
+    count = cursor.fetchone()[0]
+
+    if count == 0:
+        departments = ['Administration', 'Registrar']
+        dept_tuples = [(d,) for d in departments]
+        cursor.executemany(
+            "INSERT INTO departments (name) VALUES (%s)",
+            dept_tuples
+        )
+
+    # Check strands
+    cursor.execute("SELECT COUNT(*) FROM strands")
+    count = cursor.fetchone()[0]  # fetchone() returns a tuple like (count,)
+
+    if count == 0:
+        strand = ['STEM', 'HUMSS', 'ABM', 'TVL', 'GAS']
+        strands= [(s,) for s in strand]  # convert to list of tuples
+        cursor.executemany(
+            "INSERT INTO strands (strand_name) VALUES (%s)",
+            strands
+        )
+
+    # Check grade levels
+    cursor.execute("SELECT COUNT(*) FROM grade_levels")
+    count = cursor.fetchone()[0]
+
+    if count == 0:
+        levels = ['11', '12']
+        grade_levels = [(g,) for g in levels]
+        cursor.executemany(
+            "INSERT INTO grade_levels (level) VALUES (%s)",
+            grade_levels
+        )
+
+
+def seed_default_admin(db, cursor):
+    """Create default admin user if not exists"""
+    cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'")
+    if cursor.fetchone()[0] == 0:
+        # Default password: admin123
+        username = 'admin'
+        hashed_password = db.hash_password("admin123")
+        role = 'admin'
+        cursor.execute(
+            "INSERT INTO users (username, password, role) VALUES (%s, %s, %s)",
+            (username, hashed_password, role)
+        )
+
+
+def seed_default_staff(db, cursor):
+    """Create default staff with personal info and department if not exists"""
+    cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'staff'")
+    if cursor.fetchone()[0] == 0:
+        # 1️⃣ Create default personal information
+        first_name = "First"
+        middle_name = "Middle"
+        last_name = "Staff"
+        email = "staff@school.com"
+        phone_number = "09123456789"
+
+        cursor.execute("""
+            INSERT INTO personal_information (first_name,middle_name, last_name, email, phone_number)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (first_name, middle_name, last_name, email, phone_number))
+
+        personal_info_id = cursor.lastrowid  # get the generated id
+
+        department_name = "Administration"
+        cursor.execute("SELECT id FROM departments WHERE name = %s", (department_name,))
+        dep = cursor.fetchone()
+        if dep:
+            department_id = dep[0]
+        else:
+            cursor.execute("INSERT INTO departments (name) VALUES (%s)", (department_name,))
+            department_id = cursor.lastrowid
+
+        username = 'staff'
+        hashed_password = db.hash_password("staff123")
+        role = 'staff'
+        cursor.execute("""
+            INSERT INTO users (username, password, role, personal_info_id, department_id)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (username, hashed_password, role, personal_info_id, department_id))
+
+
+def seed_default_accounts(db, cursor):
+    seed_default_admin(db, cursor)
+    seed_default_staff(db, cursor)
+
+
+def add_index_if_missing(cursor, table, name, columns, kind="INDEX"):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, name))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table} ADD {kind} {name} ({columns})")
+
+
+def add_student_listing_indexes(db, cursor):
+    """Composite indexes behind StudentController.list_students() filters and keyset seeks"""
+    add_index_if_missing(cursor, "students", "idx_students_status", "status, id")
+    add_index_if_missing(cursor, "students", "idx_students_type", "student_type, id")
+    add_index_if_missing(cursor, "students", "idx_students_strand_status", "strand_id, status, id")
+    add_index_if_missing(cursor, "students", "idx_students_grade_status", "grade_level_id, status, id")
+    add_index_if_missing(cursor, "personal_information", "idx_pi_email", "email")
+
+
+def add_student_sort_indexes(db, cursor):
+    """(strand_id, id) and (grade_level_id, id) for list_students() sorted by strand or grade"""
+    add_index_if_missing(cursor, "students", "idx_students_strand_sort", "strand_id, id")
+    add_index_if_missing(cursor, "students", "idx_students_grade_sort", "grade_level_id, id")
+
+
+def add_staff_listing_index(db, cursor):
+    """Backs UserController.list_staff(): role filter plus (created_at, id) seek"""
+    add_index_if_missing(cursor, "users", "idx_users_role_created", "role, created_at, id")
+
+
+VERSIONED_TABLES = ("students", "users", "personal_information")
+
+
+def create_table_versions(db, cursor):
+    """
+    Per-table change counters. Triggers bump a table's row on every insert, update
+    and delete, so clients can poll one tiny row instead of re-counting tables.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name VARCHAR(64) PRIMARY KEY,
+        version BIGINT UNSIGNED NOT NULL DEFAULT 0
+    )
+    """)
+    cursor.executemany(
+        "INSERT IGNORE INTO table_versions (table_name) VALUES (%s)",
+        [(t,) for t in VERSIONED_TABLES]
+    )
+
+    for table in VERSIONED_TABLES:
+        for event, suffix in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+            trigger = f"trg_{table}_{suffix}_version"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"""
+                CREATE TRIGGER {trigger} AFTER {event} ON {table}
+                FOR EACH ROW
+                    UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'
+            """)
+
+
+# entity -> the table it counts and the SQL expression naming the entity per row
+COUNTED_TABLES = {
+    "students": "'student'",
+    "users": "{row}.role",
+}
+
+
+def rebuild_stats_counters(cursor):
+    """Recount stats_counters from the base tables; the caller commits."""
+    cursor.execute("DELETE FROM stats_counters")
+    cursor.execute("""
+        INSERT INTO stats_counters (entity, status, count)
+        SELECT 'student', COALESCE(status, ''), COUNT(*) FROM students GROUP BY COALESCE(status, '')
+    """)
+    cursor.execute("""
+        INSERT INTO stats_counters (entity, status, count)
+        SELECT role, COALESCE(status, ''), COUNT(*) FROM users GROUP BY role, COALESCE(status, '')
+    """)
+
+
+def create_stats_counters(db, cursor):
+    """
+    Row counts per (entity, status) kept current by triggers, so the dashboard
+    reads a handful of rows instead of scanning students and users. Entities are
+    'student' and the user roles; a NULL status is counted under ''.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS stats_counters (
+        entity VARCHAR(32) NOT NULL,
+        status VARCHAR(32) NOT NULL,
+        count BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (entity, status)
+    )
+    """)
+
+    def bump(entity, status, delta):
+        return f"""
+            INSERT INTO stats_counters (entity, status, count)
+            VALUES ({entity}, COALESCE({status}, ''), {delta})
+            ON DUPLICATE KEY UPDATE count = count + ({delta});"""
+
+    for table, entity in COUNTED_TABLES.items():
+        new_entity, old_entity = entity.format(row="NEW"), entity.format(row="OLD")
+        bodies = {
+            ("INSERT", "ai"): bump(new_entity, "NEW.status", 1),
+            ("DELETE", "ad"): bump(old_entity, "OLD.status", -1),
+            ("UPDATE", "au"): f"""
+                IF NOT ({old_entity} <=> {new_entity}) OR NOT (OLD.status <=> NEW.status) THEN
+                    {bump(old_entity, "OLD.status", -1)}
+                    {bump(new_entity, "NEW.status", 1)}
+                END IF;""",
+        }
+        for (event, suffix), body in bodies.items():
+            trigger = f"trg_{table}_{suffix}_stats"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"""
+                CREATE TRIGGER {trigger} AFTER {event} ON {table}
+                FOR EACH ROW
+                BEGIN
+                    {body}
+                END
+            """)
+
+    rebuild_stats_counters(cursor)
+
+
+def add_person_search_index(db, cursor):
+    """FULLTEXT index behind StudentController.search_students()"""
+    add_index_if_missing(
+        cursor, "personal_information", "ft_pi_search",
+        "first_name, middle_name, last_name, email, phone_number", kind="FULLTEXT INDEX"
+    )
+
+
+def create_jobs_table(db, cursor):
+    """Background job queue behind models/jobs.py"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        kind VARCHAR(64) NOT NULL,
+        state ENUM('queued','running','done','failed','cancelled') NOT NULL DEFAULT 'queued',
+        params TEXT,
+        checkpoint TEXT,
+        result TEXT,
+        processed INT NOT NULL DEFAULT 0,
+        failed INT NOT NULL DEFAULT 0,
+        total INT,
+        error TEXT,
+        worker VARCHAR(128),
+        created_by INT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at DATETIME,
+        heartbeat_at DATETIME,
+        finished_at DATETIME,
+
+        FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL,
+        INDEX idx_jobs_state (state, id)
+    )
+    """)
+
+
+def add_months(month, n):
+    """First day of the month `n` months after the month of `month`"""
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def audit_partition(month):
+    """Partition definition holding the audit_logs rows of `month`"""
+    return (f"PARTITION p{month:%Y%m} "
+            f"VALUES LESS THAN (UNIX_TIMESTAMP('{add_months(month, 1):%Y-%m-%d}'))")
+
+
+# Empty monthly partitions kept ready past the current month
+AUDIT_MONTHS_AHEAD = 3
+
+
+def partition_audit_logs(db, cursor):
+    """
+    Monthly RANGE partitions on audit_logs.created_at, so retention drops whole
+    months (models/audit_archive.py) and time-bounded queries only read the
+    months they cover. MySQL allows no foreign keys on partitioned tables and
+    needs the partitioning column in every unique key, so the user_id foreign
+    key goes (audit rows keep the id of a deleted user) and the primary key
+    becomes (id, created_at). p_future catches anything past the last month.
+    """
+    cursor.execute("""
+        SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs'
+    """)
+    for (name,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE audit_logs DROP FOREIGN KEY `{name}`")
+
+    cursor.execute("""
+        ALTER TABLE audit_logs
+            MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (id, created_at)
+    """)
+    add_index_if_missing(cursor, "audit_logs", "idx_audit_created", "created_at")
+    add_index_if_missing(cursor, "audit_logs", "idx_audit_object", "object_type, object_id, created_at")
+
+    cursor.execute("SELECT CURDATE(), DATE(MIN(created_at)) FROM audit_logs")
+    today, oldest = cursor.fetchone()
+    month = add_months(min(today, oldest or today), 0)
+    last = add_months(today, AUDIT_MONTHS_AHEAD)
+    partitions = []
+    while month <= last:
+        partitions.append(audit_partition(month))
+        month = add_months(month, 1)
+    partitions.append("PARTITION p_future VALUES LESS THAN MAXVALUE")
+    cursor.execute(
+        "ALTER TABLE audit_logs PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) ({})".format(", ".join(partitions))
+    )
+
+
+def create_stored_files(db, cursor):
+    """Reference-counted content-addressed files (models/document_store.py)"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS stored_files (
+        sha256 CHAR(64) PRIMARY KEY,
+        path VARCHAR(255) NOT NULL,
+        size BIGINT NOT NULL,
+        ref_count INT NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        released_at DATETIME,
+
+        INDEX idx_stored_files_released (ref_count, released_at)
+    )
+    """)
+    # NULL for files uploaded before the store existed; those keep their flat paths
+    for table in ("documents", "academic_records"):
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = 'file_sha256'
+        """, (table,))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN file_sha256 CHAR(64) NULL AFTER file_path")
+        add_index_if_missing(cursor, table, f"idx_{table}_sha256", "file_sha256")
+
+
+MIGRATIONS = [
+    (1, "Initial schema and reference data", create_initial_schema),
+    (2, "Default admin and staff accounts", seed_default_accounts),
+    (3, "Student listing indexes", add_student_listing_indexes),
+    (4, "Staff listing index", add_staff_listing_index),
+    (5, "Table version counters", create_table_versions),
+    (6, "Dashboard stats counters", create_stats_counters),
+    (7, "Full-text person search index", add_person_search_index),
+    (8, "Background jobs", create_jobs_table),
+    (9, "Monthly audit_logs partitions", partition_audit_logs),
+    (10, "Content-addressed stored files", create_stored_files),
+    (11, "Student sort indexes", add_student_sort_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
@@ -0,0 +1,330 @@
+"""
+In-process type-ahead index over students, parents and staff.
+
+Every person is split into lower-case words (name parts, the local part of
+the email split on punctuation, phone number, staff username). The index keeps
+
+    word -> person numbers        exact words
+    trigram -> words              substring lookup for query words of 3+ characters
+    sorted distinct words         prefix lookup (bisect) for 1-2 character words
+
+Trigrams are taken over distinct words rather than people, so a common name
+like "maria" is indexed once however many people share it.
+
+Database owns one PeopleIndex (db.people). main.py loads it on a background
+thread at startup; quick_find() answers from whatever is loaded so far. The
+controllers keep it current after their writes with upsert()/remove() or, when
+they only know ids, refresh()/refresh_personal_info(). Until load() has been
+called these updates are no-ops, so scripts that never search pay nothing.
+"""
+import re
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+
+from mysql.connector import Error
+
+# Letters and digits are separate words, so "santos123" in an email indexes as "santos" and "123"
+_WORD = re.compile(r"[^\W\d_]+|\d+")
+
+
+def _words(*values):
+    words = set()
+    for value in values:
+        if value:
+            words.update(_WORD.findall(str(value).lower()))
+    return words
+
+
+def _trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def _score(term, word):
+    if word == term:
+        return 3
+    if word.startswith(term):
+        return 2
+    if len(term) >= 3 and term in word:
+        return 1
+    return 0
+
+
+@dataclass(frozen=True)
+class PersonHit:
+    kind: str       # "student", "parent" or "staff"
+    id: int         # students.id, parents.id or users.id
+    name: str
+    detail: str     # email, or the username for staff without one
+    score: int
+
+
+class _Person:
+    __slots__ = ("kind", "id", "name", "detail", "personal_info_id", "words", "text")
+
+    def __init__(self, kind, id, name, detail, personal_info_id, words):
+        self.kind = kind
+        self.id = id
+        self.name = name
+        self.detail = detail
+        self.personal_info_id = personal_info_id
+        self.words = words
+        # " word word ...": lets a query word be tested with one substring search
+        self.text = " " + " ".join(words)
+
+
+class PeopleIndex:
+    PERSON_COLUMNS = "pi.id, pi.first_name, pi.middle_name, pi.last_name, pi.email, pi.phone_number"
+
+    # kind -> query returning (id, <PERSON_COLUMNS>, extra) rows; "{where}" narrows it for refresh()
+    QUERIES = {
+        "student": (
+            f"SELECT s.id, {PERSON_COLUMNS}, NULL FROM students s "
+            "JOIN personal_information pi ON pi.id = s.personal_info_id {where}"
+        ),
+        "parent": (
+            f"SELECT p.id, {PERSON_COLUMNS}, NULL FROM parents p "
+            "JOIN personal_information pi ON pi.id = p.personal_info_id {where}"
+        ),
+        "staff": (
+            f"SELECT u.id, {PERSON_COLUMNS}, u.username FROM users u "
+            "LEFT JOIN personal_information pi ON pi.id = u.personal_info_id {where}"
+        ),
+    }
+    ID_COLUMNS = {"student": "s.id", "parent": "p.id", "staff": "u.id"}
+
+    # Counting a query word's matches past this many people is pointless: it won't drive
+    ESTIMATE_CAP = 5000
+
+    def __init__(self, db):
+        self.db = db
+        self.active = False     # load() was called; keep up with writes from now on
+        self.loaded = False
+        self._lock = threading.RLock()
+        self._loading = None
+        self._clear()
+
+    def _clear(self):
+        self._people = {}           # number -> _Person
+        self._numbers = {}          # (kind, id) -> number
+        self._postings = {}         # word -> {numbers}
+        self._trigram_words = {}    # trigram -> {words}
+        self._sorted_words = []     # distinct words, for prefix bisect
+        self._words_sorted = True
+        self._next_number = 0
+
+    def _sorted(self):
+        # Bulk loads append and sort once, on first use
+        if not self._words_sorted:
+            self._sorted_words.sort()
+            self._words_sorted = True
+        return self._sorted_words
+
+    # ------------------- LOADING -------------------
+    def load(self, batch_size=500):
+        """(Re)build the index from the database; people become searchable batch by batch"""
+        with self._lock:
+            self._clear()
+            self.active = True
+            self.loaded = False
+        try:
+            for kind, query in self.QUERIES.items():
+                batch = []
+                for row in self.db.fetch_iter(query.format(where=""), batch_size=batch_size):
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        self._add_rows(kind, batch)
+                        batch = []
+                self._add_rows(kind, batch)
+            with self._lock:
+                self._sorted()
+        except Error as e:
+            print(f"Error loading people index: {e}")
+            return False
+        self.loaded = True
+        return True
+
+    def load_async(self):
+        """Start load() on a daemon thread (needs a pooled Database)"""
+        self._loading = threading.Thread(target=self.load, name="people-index", daemon=True)
+        self._loading.start()
+        return self._loading
+
+    def _add_rows(self, kind, rows):
+        with self._lock:
+            for row in rows:
+                self._upsert(kind, *row, keep_sorted=False)
+
+    # ------------------- INCREMENTAL UPDATES -------------------
+    def upsert(self, kind, id, first_name=None, middle_name=None, last_name=None,
+               email=None, phone_number=None, username=None, personal_info_id=None):
+        if not self.active:
+            return
+        with self._lock:
+            self._upsert(kind, id, personal_info_id, first_name, middle_name, last_name,
+                         email, phone_number, username)
+
+    def remove(self, kind, id):
+        if not self.active:
+            return
+        with self._lock:
+            self._remove(kind, id)
+
+    def refresh(self, kind, id):
+        """Re-read one person after a write the caller has no field values for"""
+        if not self.active:
+            return
+        where = f"WHERE {self.ID_COLUMNS[kind]} = %s"
+        try:
+            row = self.db.fetch_one(self.QUERIES[kind].format(where=where), (id,))
+        except Error as e:
+            print(f"Error refreshing people index: {e}")
+            return
+        with self._lock:
+            if row is None:
+                self._remove(kind, id)
+            else:
+                self._upsert(kind, *row)
+
+    def refresh_personal_info(self, personal_info_id):
+        """Refresh everyone whose personal_information row changed"""
+        if not self.active:
+            return
+        with self._lock:
+            keys = [(p.kind, p.id) for p in self._people.values() if p.personal_info_id == personal_info_id]
+        for kind, id in keys:
+            self.refresh(kind, id)
+
+    def _upsert(self, kind, id, personal_info_id, first_name, middle_name, last_name,
+                email, phone_number, username, keep_sorted=True):
+        self._remove(kind, id)
+        name = " ".join(filter(None, (first_name, middle_name, last_name))) or (username or "")
+        # Only the local part of the email: domain words like "gmail" would match everyone
+        local_part = email.split("@", 1)[0] if email else None
+        words = frozenset(_words(first_name, middle_name, last_name, local_part, phone_number, username))
+        number = self._next_number
+        self._next_number += 1
+        self._people[number] = _Person(kind, id, name, email or username or "", personal_info_id, words)
+        self._numbers[(kind, id)] = number
+
+        for word in words:
+            numbers = self._postings.get(word)
+            if numbers is None:
+                numbers = self._postings[word] = set()
+                if keep_sorted:
+                    insort(self._sorted(), word)
+                else:
+                    self._sorted_words.append(word)
+                    self._words_sorted = False
+                for trigram in _trigrams(word):
+                    self._trigram_words.setdefault(trigram, set()).add(word)
+            numbers.add(number)
+
+    def _remove(self, kind, id):
+        number = self._numbers.pop((kind, id), None)
+        if number is None:
+            return
+        person = self._people.pop(number)
+        for word in person.words:
+            numbers = self._postings[word]
+            numbers.discard(number)
+            if numbers:
+                continue
+            # Last person with this word: drop it from the word-level indexes too
+            del self._postings[word]
+            words = self._sorted()
+            del words[bisect_left(words, word)]
+            for trigram in _trigrams(word):
+                words = self._trigram_words[trigram]
+                words.discard(word)
+                if not words:
+                    del self._trigram_words[trigram]
+
+    # ------------------- SEARCH -------------------
+    def _matching_words(self, term):
+        """Yield (word, score) for every indexed word matching `term`"""
+        if len(term) < 3:
+            words = self._sorted()
+            for i in range(bisect_left(words, term), len(words)):
+                word = words[i]
+                if not word.startswith(term):
+                    break
+                yield word, _score(term, word)
+            return
+
+        candidates = None
+        for trigram in sorted(_trigrams(term), key=lambda t: len(self._trigram_words.get(t, ()))):
+            words = self._trigram_words.get(trigram)
+            if not words:
+                return
+            candidates = set(words) if candidates is None else candidates & words
+            if not candidates:
+                return
+        for word in candidates:
+            score = _score(term, word)
+            if score:
+                yield word, score
+
+    def quick_find(self, text, limit=20, kinds=None):
+        """
+        Up to `limit` people matching every word of `text`, as PersonHits.
+
+        A query word matches a word of the person exactly (3 points), as a prefix
+        (2) or, from three characters on, as a substring (1). The most selective
+        query word drives the lookup: its matching index words are walked best
+        first, the other query words only filter those people, and the walk stops
+        once `limit` hits are collected, so broad queries such as "m" cost no more
+        than narrow ones. Hits are ordered by points, then name.
+        kinds restricts the result, e.g. ("student",).
+        """
+        terms = _words(text)
+        if not terms:
+            return []
+
+        with self._lock:
+            people = self._people
+            postings = self._postings
+
+            # Drive with the word matching the fewest people; counting stops at the best so far
+            first, fewest = None, self.ESTIMATE_CAP
+            for term in sorted(terms, key=len, reverse=True):
+                count = 0
+                for word, _ in self._matching_words(term):
+                    count += len(postings[word])
+                    if count >= fewest:
+                        break
+                if first is None or count < fewest:
+                    first, fewest = term, count
+            # Substring needles: a leading space restricts short words to prefixes
+            rest = [(t, t if len(t) >= 3 else " " + t) for t in terms if t != first]
+
+            matches = self._matching_words(first)
+            if len(first) >= 3:
+                # Trigram candidates come unordered; short terms already yield exact, then prefixes A-Z
+                matches = sorted(matches, key=lambda item: (-item[1], item[0]))
+
+            hits = {}
+            for word, score in matches:
+                for number in postings[word]:
+                    if number in hits:
+                        continue
+                    person = people[number]
+                    if kinds and person.kind not in kinds:
+                        continue
+                    if all(needle in person.text for _, needle in rest):
+                        hits[number] = score + sum(
+                            max(_score(term, w) for w in person.words) for term, _ in rest
+                        )
+                        if len(hits) >= limit:
+                            break
+                if len(hits) >= limit:
+                    break
+
+            best = sorted(hits.items(), key=lambda item: (-item[1], people[item[0]].name))
+            return [
+                PersonHit(people[n].kind, people[n].id, people[n].name, people[n].detail, score)
+                for n, score in best
+            ]
+
+    def __len__(self):
+        return len(self._people)
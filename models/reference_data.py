@@ -0,0 +1,86 @@
+"""
+Reference data: strands, grade levels and departments.
+
+These tables are seeded by the migrations and practically never change, so the
+process keeps one copy of each as name <-> id maps instead of querying them for
+every student or staff save. Database owns a single ReferenceData (db.reference);
+it is loaded on first use (main.py loads it at startup) and reloaded after
+invalidate(), which Database.invalidate() calls when one of its tables is written.
+"""
+import threading
+
+
+class Lookup:
+    """Ordered (id, name) rows of one reference table with maps in both directions."""
+    __slots__ = ("rows", "ids", "names")
+
+    def __init__(self, rows):
+        self.rows = [(row_id, name) for row_id, name in rows]
+        self.ids = {name: row_id for row_id, name in self.rows}
+        self.names = {row_id: name for row_id, name in self.rows}
+
+
+class ReferenceData:
+    QUERIES = {
+        "strands": "SELECT id, strand_name FROM strands ORDER BY id",
+        "grade_levels": "SELECT id, level FROM grade_levels ORDER BY id",
+        "departments": "SELECT id, name FROM departments ORDER BY id",
+    }
+
+    def __init__(self, db):
+        self.db = db
+        self._lookups = {}
+        self._lock = threading.Lock()
+
+    def load(self, *tables):
+        """(Re)load `tables`, or all of them; safe to call from any thread"""
+        tables = tables or tuple(self.QUERIES)
+        loaded = {table: Lookup(self.db.fetch_all(self.QUERIES[table])) for table in tables}
+        with self._lock:
+            self._lookups.update(loaded)
+
+    def invalidate(self, *tables):
+        """Forget `tables` (all by default); they are reloaded on next use"""
+        with self._lock:
+            if tables:
+                for table in tables:
+                    self._lookups.pop(table, None)
+            else:
+                self._lookups.clear()
+
+    def lookup(self, table):
+        result = self._lookups.get(table)
+        if result is None:
+            self.load(table)
+            result = self._lookups[table]
+        return result
+
+    # ------------------- STRANDS -------------------
+    def strands(self):
+        return list(self.lookup("strands").rows)
+
+    def strand_id(self, name):
+        return self.lookup("strands").ids.get(name)
+
+    def strand_name(self, strand_id):
+        return self.lookup("strands").names.get(strand_id)
+
+    # ------------------- GRADE LEVELS -------------------
+    def grade_levels(self):
+        return list(self.lookup("grade_levels").rows)
+
+    def grade_level_id(self, level):
+        return self.lookup("grade_levels").ids.get(level)
+
+    def grade_level_name(self, grade_level_id):
+        return self.lookup("grade_levels").names.get(grade_level_id)
+
+    # ------------------- DEPARTMENTS -------------------
+    def departments(self):
+        return list(self.lookup("departments").rows)
+
+    def department_id(self, name):
+        return self.lookup("departments").ids.get(name)
+
+    def department_name(self, department_id):
+        return self.lookup("departments").names.get(department_id)
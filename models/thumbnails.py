@@ -0,0 +1,213 @@
+"""
+Thumbnails of ID pictures and scanned documents.
+
+ThumbnailService renders a small PNG of an image, or of the first page of a
+PDF, in a process pool, so decoding a large scan never holds the GIL of the
+UI process. Results are cached on disk under the SHA-256 of the source
+contents (the document store already names files by it) and the requested
+size, so a preview is decoded once however many rows or dialogs show it, and
+a changed file gets a new entry. The cache is bounded by max_bytes: entries
+are touched when used and the least recently used go first.
+
+Rendering needs Pillow for images and PyMuPDF for PDFs; both are optional,
+and without them the service simply has no previews to offer. This module
+imports neither the database nor Qt, so pool processes start cheaply.
+Database owns one ThumbnailService (db.thumbnails).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # image previews are optional
+    Image = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # PDF previews are optional
+    fitz = None
+
+_IMAGE_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"BM", b"II*\x00", b"MM\x00*", b"RIFF")
+
+
+def sniff(path):
+    """'image', 'pdf' or None, from the first bytes (stored documents have no extension)"""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(_IMAGE_SIGNATURES):
+        return "image"
+    return None
+
+
+def render_thumbnail(source, destination, size):
+    """
+    Process pool entry point: write a PNG of `source` fitting in size x size to
+    `destination` and return it, or None when this file cannot be previewed.
+    """
+    partial = f"{destination}.{os.getpid()}.part"
+    try:
+        kind = sniff(source)
+        if kind == "image" and Image is not None:
+            with Image.open(source) as image:
+                # JPEG decodes straight at 1/2 .. 1/8 scale instead of full size
+                image.draft("RGB", (size, size))
+                image.thumbnail((size, size))
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+                image.save(partial, "PNG")
+        elif kind == "pdf" and fitz is not None:
+            with fitz.open(source) as document:
+                page = document[0]
+                zoom = size / max(page.rect.width, page.rect.height)
+                page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False).save(partial, output="png")
+        else:
+            return None
+        os.replace(partial, destination)
+        return destination
+    except Exception as e:  # corrupt or unsupported content: no preview, never a crash
+        print(f"Error rendering thumbnail of {source}: {e}")
+        try:
+            os.remove(partial)
+        except FileNotFoundError:
+            pass
+        return None
+
+
+class ThumbnailService:
+    def __init__(self, cache_dir="cache/thumbnails", max_bytes=128 * 1024 * 1024, workers=2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._entries = None        # cache path -> size, least recently used first; scanned on first use
+        self._bytes = 0
+        self._inflight = {}         # cache path -> Future
+        self._hashes = {}           # (path, mtime_ns, size) -> sha256 of files outside the document store
+
+    @staticmethod
+    def can_render():
+        return Image is not None or fitz is not None
+
+    def cache_path(self, sha256, size):
+        return os.path.join(self.cache_dir, sha256[:2], f"{sha256}_{size}.png")
+
+    def content_hash(self, path):
+        """SHA-256 of a file, remembered while its size and mtime stay the same"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        sha256 = self._hashes.get(key)
+        if sha256 is None:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            sha256 = self._hashes[key] = digest.hexdigest()
+        return sha256
+
+    # ------------------- LOOKUP -------------------
+    def cached(self, source, sha256=None, size=128):
+        """Path of an already rendered thumbnail, or None; never renders"""
+        try:
+            path = self.cache_path(sha256 or self.content_hash(source), size)
+        except OSError:
+            return None
+        with self._lock:
+            self._load_entries()
+            if path not in self._entries:
+                return None
+            self._touch(path)
+        return path
+
+    def request(self, source, sha256=None, size=128):
+        """Future of the thumbnail path (None if it cannot be rendered); renders in the pool when missing"""
+        future = Future()
+        if not self.can_render():
+            future.set_result(None)
+            return future
+        try:
+            path = self.cache_path(sha256 or self.content_hash(source), size)
+        except OSError as e:
+            print(f"Error reading {source}: {e}")
+            future.set_result(None)
+            return future
+
+        with self._lock:
+            self._load_entries()
+            if path in self._entries:
+                self._touch(path)
+                future.set_result(path)
+                return future
+            pending = self._inflight.get(path)
+            if pending is not None:
+                return pending
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            pending = self._inflight[path] = self._pool.submit(render_thumbnail, source, path, size)
+        pending.add_done_callback(lambda done: self._rendered(path, done))
+        return pending
+
+    def thumbnail(self, source, sha256=None, size=128):
+        """Blocking request(): the thumbnail path, or None"""
+        return self.request(source, sha256, size).result()
+
+    def _rendered(self, path, future):
+        with self._lock:
+            self._inflight.pop(path, None)
+            if future.cancelled() or future.exception() is not None or future.result() is None:
+                return
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return
+            self._entries[path] = size
+            self._bytes += size
+            self._evict()
+
+    # ------------------- CACHE BOOKKEEPING (under _lock) -------------------
+    def _load_entries(self):
+        if self._entries is not None:
+            return
+        found = []
+        if os.path.isdir(self.cache_dir):
+            for shard in os.scandir(self.cache_dir):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith(".png"):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, entry.path, stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((path, size) for _, path, size in found)
+        self._bytes = sum(self._entries.values())
+        self._evict()
+
+    def _touch(self, path):
+        # The mtime carries the recency order over to the next run
+        self._entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,103 @@
+"""
+Shared fixtures. `db` is a real Database whose connection is an in-memory fake:
+it records every statement and answers queries from `db.connection.results`, so
+controllers and views run their real code paths without a MySQL server.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("mysql.connector")
+
+
+class FakeCursor:
+    def __init__(self, connection, dictionary=False):
+        self.connection = connection
+        self.dictionary = dictionary
+        self.rows = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, query, params=None):
+        self.connection.statements.append((" ".join(query.split()), params))
+        self.connection.in_transaction = True
+        rows = []
+        for fragment, result in self.connection.results.items():
+            if fragment in query:
+                rows = list(result(query, params) if callable(result) else result)
+                break
+        self.rows = [dict(row) if self.dictionary else row for row in rows]
+        self.rowcount = len(self.rows) or 1
+        self.connection.last_id += 1
+        self.lastrowid = self.connection.last_id
+
+    def executemany(self, query, seq_params):
+        for params in seq_params:
+            self.execute(query, params)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.results = {}       # SQL fragment -> rows, or callable(query, params) -> rows
+        self.last_id = 0
+        self.in_transaction = False
+        self.commits = 0
+
+    def cursor(self, dictionary=False, prepared=False, buffered=None):
+        return FakeCursor(self, dictionary)
+
+    def commit(self):
+        self.commits += 1
+        self.in_transaction = False
+
+    def rollback(self):
+        self.in_transaction = False
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+    def executed(self, fragment):
+        return [params for query, params in self.statements if fragment in query]
+
+
+@pytest.fixture
+def db():
+    from models.db import Database
+    database = Database()
+    database.connection = FakeConnection()
+    yield database
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
@@ -0,0 +1,33 @@
+from controllers.userController import UserController
+from models.audit import AuditLog
+
+
+def audit_rows(db):
+    """Flush the audit queue and return the rows it wrote to audit_logs"""
+    db.connection.results["@@auto_increment_increment"] = [(1,)]
+    db.audit.flush()
+    rows = []
+    for params in db.connection.executed("INSERT INTO `audit_logs`"):
+        width = len(AuditLog.COLUMNS)
+        rows.extend(tuple(params[i:i + width]) for i in range(0, len(params), width))
+    return rows
+
+
+def test_create_user_is_audited_once(db):
+    user_id = UserController(db).create_user("jdoe", "secret", "staff")
+    assert user_id
+    rows = audit_rows(db)
+    assert [(row[1], row[2], row[3]) for row in rows] == [("create", "user", user_id)]
+
+
+def test_password_change_is_audited_once(db):
+    assert UserController(db).update_user(7, password="new-secret")
+    rows = audit_rows(db)
+    assert [(row[1], row[2], row[3], row[4]) for row in rows] == [("update", "user", 7, "password")]
+    assert all("new-secret" not in str(row) for row in rows)
+
+
+def test_update_with_password_audits_fields_and_password_separately(db):
+    assert UserController(db).update_user(7, role="admin", password="new-secret")
+    details = sorted(row[4] for row in audit_rows(db))
+    assert details == ["password", "role"]
@@ -0,0 +1,21 @@
+from controllers.authController import AuthController
+from controllers.studentController import StudentController
+from controllers.userController import UserController
+
+
+def controllers(db):
+    return AuthController(db), UserController(db), StudentController(db)
+
+
+def test_admin_dashboard_builds(qapp, db):
+    from views.Dashboard.admin_dashboard import AdminDashboard
+    dashboard = AdminDashboard(*controllers(db), 1, "admin")
+    assert dashboard.dashboard_controller is not None
+    dashboard.close()
+
+
+def test_staff_dashboard_builds(qapp, db):
+    from views.Staff.staff_dashboard import StaffDashboard
+    dashboard = StaffDashboard(*controllers(db), 2, "staff")
+    assert dashboard.dashboard_controller is not None
+    dashboard.close()
@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+from mysql.connector import Error
+
+from models.db import Database
+from conftest import FakeConnection
+
+
+class FakePool:
+    def get_connection(self):
+        return FakeConnection()
+
+
+@pytest.fixture
+def pooled_db():
+    database = Database(pool_size=1, pool_timeout=0.2)
+    database._pool = FakePool()
+    database._pool_slots = threading.BoundedSemaphore(database.pool_size)
+    return database
+
+
+def test_checkout_fails_instead_of_waiting_on_an_exhausted_pool(pooled_db):
+    holding, done = threading.Event(), threading.Event()
+
+    def hold():
+        with pooled_db.connection_scope():
+            holding.set()
+            done.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    try:
+        assert holding.wait(5)
+        started = time.monotonic()
+        with pytest.raises(Error, match="pool_size=1"):
+            with pooled_db.connection_scope():
+                pass
+        assert time.monotonic() - started < 2
+    finally:
+        done.set()
+        holder.join()
+
+    # The slot comes back once the holder is done
+    with pooled_db.connection_scope() as conn:
+        assert conn is not None
@@ -0,0 +1,90 @@
+import random
+import sqlite3
+
+import pytest
+
+from controllers.studentController import StudentController
+
+ENUM_COLUMNS = StudentController.LIST_SORT_ENUMS
+PAGE = 3
+
+
+@pytest.fixture(scope="module")
+def sqlite_db():
+    """
+    The sort columns of a student listing in SQLite, which orders NULL like MySQL does
+    (first ascending, last descending); enum_pos() stands in for ENUM declaration order.
+    """
+    rng = random.Random(7)
+    conn = sqlite3.connect(":memory:")
+    conn.create_function("enum_pos", 2, lambda column, value: (
+        None if value is None else ENUM_COLUMNS[column].index(value)))
+    conn.execute("CREATE TABLE personal_information (id INTEGER PRIMARY KEY, last_name, first_name, email)")
+    conn.execute("CREATE TABLE students (id INTEGER PRIMARY KEY, personal_info_id, strand_id, grade_level_id, "
+                 "student_type, status)")
+    names = ["cruz", "dela cruz", "reyes", "santos"]
+    for i in range(1, 41):
+        conn.execute("INSERT INTO personal_information VALUES (?, ?, ?, ?)", (
+            100 + i, rng.choice(names), rng.choice(["ana", "ben", "carl"]),
+            rng.choice([None, f"s{rng.randint(1, 9)}@school.ph"])))
+        conn.execute("INSERT INTO students VALUES (?, ?, ?, ?, ?, ?)", (
+            i, 100 + i, rng.choice([None, 1, 2, 3]), rng.choice([None, 11, 12]),
+            rng.choice([None, *ENUM_COLUMNS["s.student_type"]]),
+            rng.choice([None, *ENUM_COLUMNS["s.status"]])))
+    yield conn
+    conn.close()
+
+
+def order_by(expressions, descending):
+    direction = "DESC" if descending else "ASC"
+    return ", ".join(
+        (f"enum_pos('{e}', {e})" if e in ENUM_COLUMNS else e) + f" {direction}" for e in expressions
+    )
+
+
+def page(conn, expressions, after_key, descending):
+    where, params = "", []
+    if after_key is not None:
+        condition, params = StudentController._keyset_condition(expressions, after_key, descending)
+        where = "WHERE " + condition.replace("%s", "?")
+    return conn.execute(
+        f"SELECT s.id, {', '.join(expressions)} FROM students s "
+        f"JOIN personal_information pi ON pi.id = s.personal_info_id {where} "
+        f"ORDER BY {order_by(expressions, descending)} LIMIT {PAGE}", params
+    ).fetchall()
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort_key", list(StudentController.LIST_SORT_KEYS))
+def test_keyset_pages_match_a_full_sort(sqlite_db, sort_key, descending):
+    expressions = StudentController.LIST_SORT_KEYS[sort_key]
+    expected = [row[0] for row in sqlite_db.execute(
+        f"SELECT s.id FROM students s JOIN personal_information pi ON pi.id = s.personal_info_id "
+        f"ORDER BY {order_by(expressions, descending)}")]
+
+    seen, after_key = [], None
+    while True:
+        rows = page(sqlite_db, expressions, after_key, descending)
+        seen.extend(row[0] for row in rows)
+        if len(rows) < PAGE:
+            break
+        after_key = rows[-1][1:]
+    assert seen == expected
+
+
+@pytest.mark.parametrize("sort_key", list(StudentController.LIST_SORT_KEYS))
+def test_every_sort_key_ends_in_a_unique_id(sort_key):
+    assert StudentController.LIST_SORT_KEYS[sort_key][-1] in ("s.id", "pi.id")
+
+
+def test_enum_seeks_compare_by_declaration_order_not_text():
+    condition, params = StudentController._keyset_condition(("s.status", "s.id"), ("pending", 9), False)
+    assert ">" not in condition.replace("s.id >", "")
+    assert params == ["cancelled", "pending", 9]
+
+
+def test_table_columns_all_have_sort_keys():
+    pytest.importorskip("PyQt6")
+    from views.Dashboard.table_models import StudentTableModel
+    assert len(StudentTableModel.SORT_KEYS) == len(StudentTableModel.COLUMNS)
+    assert set(StudentTableModel.SORT_KEYS) <= set(StudentController.LIST_SORT_KEYS)
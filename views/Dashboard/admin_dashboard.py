@@ -4,20 +4,24 @@ from controllers.authController import AuthController
 from models.db import Database
 from controllers.userController import UserController
 from controllers.studentController import StudentController
+from controllers.dashboardController import DashboardController
 
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QFrame, QStatusBar
+    QLabel, QPushButton, QFrame, QStatusBar, QProgressBar
 )
-from PyQt6.QtCore import pyqtSignal, QTimer
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QFont
 
 from views.Dashboard.student_view import AdminStudentDashboard
+from views.Dashboard.task_runner import TaskRunner
+from views.Dashboard.stats_refresher import StatsRefresher
 from views.Dashboard.staff_view import AdminStaffDashboard
 from views.Staff.staff import CreateStaffForm
 from views.Student_Parent.create_student import StudentCreationForm
+from views.Student_Parent.import_students import ImportStudentsDialog
 
 
 class AdminDashboard(QMainWindow):
@@ -32,15 +36,25 @@ class AdminDashboard(QMainWindow):
         self.db = userController.db
         self.current_user_id = user_id
         self.username = username
+
+        # Controller calls for tables and stat cards run here, off the UI thread
+        self.tasks = TaskRunner(self.db, self)
         self.subject_controller = None
 
+        # load_statistics() reads it, so it must exist before the UI is built
+        self.dashboard_controller = DashboardController(self.db)
+
         self.init_ui()
         self.show_student_dashboard()
         self.load_statistics()
 
-        self._stats_timer = QTimer(self)
-        self._stats_timer.timeout.connect(self.load_statistics)
-        self._stats_timer.start(2000)
+        # Stat cards re-query only when a write bumps the students/users change marker
+        self._stats_refresher = StatsRefresher(
+            self, self.tasks,
+            read_marker=lambda: self.dashboard_controller.get_change_marker(("students", "users")),
+            reload=self.load_statistics
+        )
+        self._stats_refresher.start()
 
     def init_ui(self):
         self.setWindowTitle("Admin Dashboard")
@@ -64,6 +78,14 @@ class AdminDashboard(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
 
+        self.loading_indicator = QProgressBar()
+        self.loading_indicator.setRange(0, 0)  # indeterminate
+        self.loading_indicator.setMaximumWidth(140)
+        self.loading_indicator.setTextVisible(False)
+        self.loading_indicator.hide()
+        self.status_bar.addPermanentWidget(self.loading_indicator)
+        self.tasks.busy_changed.connect(self.loading_indicator.setVisible)
+
     def _create_header(self, parent):
         header = QFrame()
         header.setFixedHeight(70)
@@ -114,25 +136,19 @@ class AdminDashboard(QMainWindow):
     # ================= STATISTICS =================
 
     def load_statistics(self):
-        self.total_students_label.setText(
-            str(self.student_controller.get_student_count())
-        )
-        self.active_students_label.setText(
-            str(self.student_controller.get_enrolled_students())
-        )
-        self.pending_reviews_label.setText(
-            str(self.student_controller.get_pending_student_count())
+        self.tasks.submit(
+            "statistics", self.dashboard_controller.get_snapshot,
+            on_result=self._show_statistics, silent=True
         )
 
-        self.total_staff_label.setText(
-            str(self.user_controller.get_staff_count())
-        )
-        self.active_staff_label.setText(
-            str(self.user_controller.get_active_staff_count())
-        )
-        self.staff_pending_label.setText(
-            str(self.user_controller.get_inactive_staff_count())
-        )
+    def _show_statistics(self, snapshot):
+        self.total_students_label.setText(str(snapshot.total_students))
+        self.active_students_label.setText(str(snapshot.enrolled_students))
+        self.pending_reviews_label.setText(str(snapshot.pending_students))
+
+        self.total_staff_label.setText(str(snapshot.total_staff))
+        self.active_staff_label.setText(str(snapshot.active_staff))
+        self.staff_pending_label.setText(str(snapshot.inactive_staff))
 
     # ================= ACTIONS =================
 
@@ -143,6 +159,12 @@ class AdminDashboard(QMainWindow):
             self.student_dashboard.load_data()
             self.load_statistics()
 
+    def import_students(self):
+        dialog = ImportStudentsDialog(self.student_controller, self.current_user_id, self)
+        if dialog.exec():
+            self.student_dashboard.load_data()
+            self.load_statistics()
+
     def create_staff_account(self):
         dialog = CreateStaffForm(self.user_controller)
         if dialog.exec():
@@ -192,11 +214,7 @@ class AdminDashboard(QMainWindow):
 
 if __name__ == "__main__":
     db = Database()
-    db.create_database_if_not_exists()
-    db.connect()
-    db.migrations()
-    db.create_default_admin()
-    db.create_default_staff()
+    db.initialize()
 
     auth_ctrl = AuthController(db)
     user_ctrl = UserController(db)
@@ -1,17 +1,20 @@
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView,
-    QMessageBox, QHBoxLayout,
-    QLabel
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView,
+    QMessageBox, QLabel, QLineEdit, QPushButton
 )
-from PyQt6.QtGui import QColor
-from PyQt6.QtCore import Qt
+
+from views.Dashboard.table_models import StudentTableModel, StaffTableModel, ActionButtonsDelegate
 
 
 class StudentTabs(QWidget):
+    SEARCH_DELAY_MS = 300
+    SEARCH_LIMIT = 200
+
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
+        self.sort_key = "id"
         self.sort_order = "DESC"
         self.init_ui()
 
@@ -40,15 +43,53 @@ class StudentTabs(QWidget):
         )
         layout.addWidget(title)
 
-        self.table = QTableWidget(0, 8)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Name", "Email", "Strand", "Grade",
-            "Enrollment", "Status", "Action"
-        ])
+        # Search box: queries once typing pauses for SEARCH_DELAY_MS
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search by name, email or phone...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setStyleSheet(
+            "padding:6px; border:1px solid #9CA3AF; border-radius:4px; color:black; background:white;"
+        )
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.load_data)
+        self.search_box.textChanged.connect(self.search_timer.start)
+
+        # Applies to every selected row (Ctrl/Shift-click to select several)
+        self.enroll_btn = QPushButton("Enroll Selected")
+        self.enroll_btn.setEnabled(False)
+        self.enroll_btn.setStyleSheet(
+            "QPushButton { background-color:#2ecc71; color:white; padding:6px 14px; border-radius:4px; }"
+            "QPushButton:disabled { background-color:#9CA3AF; }"
+        )
+        self.enroll_btn.clicked.connect(self.enroll_selected)
+
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(self.search_box)
+        toolbar.addWidget(self.enroll_btn)
+        layout.addLayout(toolbar)
+
+        self.model = StudentTableModel(
+            self, runner=getattr(self.parent, "tasks", None),
+            preview_loader=self.parent.student_controller.get_preview_thumbnails
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setIconSize(QSize(28, 28))
+
+        self.actions_delegate = ActionButtonsDelegate(self.table)
+        self.actions_delegate.edit_clicked.connect(
+            lambda row: self.edit_student(self.model.record_id(row))
+        )
+        self.actions_delegate.delete_clicked.connect(
+            lambda row: self.delete_student(self.model.record_id(row))
+        )
+        self.table.setItemDelegateForColumn(self.model.action_column, self.actions_delegate)
 
         # Table style
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid black;
                 color: black;
                 background-color: white;
@@ -64,76 +105,51 @@ class StudentTabs(QWidget):
                 font-weight: bold;
             }
 
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #BEE7FA;
             }
-
-            QPushButton {
-                background-color: #0EA5E9;
-                color: white;
-                padding: 6px;
-                border-radius: 4px;
-            }
-
-            QPushButton#deleteBtn {
-                background-color: #e74c3c;
-            }
         """)
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # Sorting is done by the query (keyset pages), not by the view
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(0, Qt.SortOrder.DescendingOrder)
+        header.sectionClicked.connect(self.sort_by_column)
+
+        # Fixed row height: the view never has to measure rows it is not showing
+        rows = self.table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(36)
 
         self.table.setAlternatingRowColors(True)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
+        self.table.selectionModel().selectionChanged.connect(
+            lambda *_: self.enroll_btn.setEnabled(self.table.selectionModel().hasSelection())
+        )
 
         layout.addWidget(self.table)
 
     def load_data(self):
-        students = self.parent.student_controller.get_all_students(self.sort_order)
-        self.table.setRowCount(len(students))
-
-        for row, s in enumerate(students):
-            student_id = s["id"]
-
-            def create_centered_item(text):
-                item = QTableWidgetItem(str(text))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                return item
-
-            self.table.setItem(row, 0, create_centered_item(student_id))
-
-            full_name = " ".join(filter(None, [
-                s.get("first_name"), s.get("middle_name"), s.get("last_name")
-            ]))
-            self.table.setItem(row, 1, create_centered_item(full_name))
-            self.table.setItem(row, 2, create_centered_item(s.get("email", "N/A")))
-            self.table.setItem(row, 3, create_centered_item(s.get("strand", "")))
-            self.table.setItem(row, 4, create_centered_item(s.get("grade", "")))
-            self.table.setItem(row, 5, create_centered_item(s.get("enrollment", "")))
-
-            status = s.get("status", "")
-            status_item = create_centered_item(status)
-            status_item.setForeground(
-                QColor("green") if status.lower() == "enrolled" else QColor("red")
+        controller = self.parent.student_controller
+        search = self.search_box.text().strip()
+        if search:
+            # Ranked results come back as a single page
+            self.model.set_loader(
+                lambda after_key, limit: (controller.search_students(search, self.SEARCH_LIMIT), None)
             )
-            self.table.setItem(row, 6, status_item)
-
-            # Action buttons
-            actions = QWidget()
-            action_layout = QHBoxLayout(actions)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-
-            edit_btn = QPushButton("Edit")
-            edit_btn.clicked.connect(lambda _, sid=student_id: self.edit_student(sid))
+            return
 
-            delete_btn = QPushButton("Delete")
-            delete_btn.setObjectName("deleteBtn")
-            delete_btn.clicked.connect(lambda _, sid=student_id: self.delete_student(sid))
-
-            action_layout.addWidget(edit_btn)
-            action_layout.addWidget(delete_btn)
-            self.table.setCellWidget(row, 7, actions)
+        descending = self.sort_order == "DESC"
+        sort_key = self.sort_key
+        self.model.set_loader(
+            lambda after_key, limit: controller.list_students(
+                sort_key=sort_key, after_key=after_key, limit=limit, descending=descending
+            )
+        )
 
     def edit_student(self, student_id):
         from views.Student_Parent.edit_student import EditStudentForm
@@ -156,6 +172,46 @@ class StudentTabs(QWidget):
             else:
                 QMessageBox.critical(self, "Error", "Failed to delete student.")
 
+    def selected_student_ids(self):
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.model.record_id(row) for row in rows]
+
+    def enroll_selected(self):
+        student_ids = self.selected_student_ids()
+        if not student_ids:
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm Enrollment",
+            f"Enroll {len(student_ids)} selected student(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        changed = self.parent.student_controller.bulk_set_status(
+            student_ids, "enrolled", self.parent.current_user_id
+        )
+        if changed is None:
+            QMessageBox.critical(self, "Error", "Failed to enroll the selected students.")
+            return
+        QMessageBox.information(self, "Enrollment", f"{changed} student(s) enrolled.")
+        self.load_data()
+        self.parent.load_statistics()
+
+    def sort_by_column(self, column):
+        if column >= len(self.model.SORT_KEYS):
+            # The Action column: put the indicator back on the current sort
+            column = self.model.SORT_KEYS.index(self.sort_key)
+        elif self.model.SORT_KEYS[column] == self.sort_key:
+            self.sort_order = "ASC" if self.sort_order == "DESC" else "DESC"
+        else:
+            self.sort_key = self.model.SORT_KEYS[column]
+            self.sort_order = "ASC"
+        order = Qt.SortOrder.DescendingOrder if self.sort_order == "DESC" else Qt.SortOrder.AscendingOrder
+        self.table.horizontalHeader().setSortIndicator(column, order)
+        self.load_data()
+
     def refresh_table(self):
         self.sort_order = "ASC" if self.sort_order == "DESC" else "DESC"
         self.load_data()
@@ -190,14 +246,21 @@ class StaffTabs(QWidget):
         title.setStyleSheet("font-size:16pt; font-weight:bold; color:black;")
         layout.addWidget(title)
 
-        self.table = QTableWidget(0, 7)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Name", "Email", "Department",
-            "Created", "Status", "Action"
-        ])
+        self.model = StaffTableModel(self, runner=getattr(self.parent, "tasks", None))
+        self.table = QTableView()
+        self.table.setModel(self.model)
+
+        self.actions_delegate = ActionButtonsDelegate(self.table)
+        self.actions_delegate.edit_clicked.connect(
+            lambda row: self.edit_staff(self.model.record_id(row))
+        )
+        self.actions_delegate.delete_clicked.connect(
+            lambda row: self.delete_staff(self.model.record_id(row))
+        )
+        self.table.setItemDelegateForColumn(self.model.action_column, self.actions_delegate)
 
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid black;
                 color: black;
                 background-color: white;
@@ -211,67 +274,32 @@ class StaffTabs(QWidget):
                 border: 1px solid black;
                 font-weight: bold;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #BEE7FA;
             }
-            QPushButton {
-                background-color: #0EA5E9;
-                color: white;
-                padding: 6px;
-                border-radius: 4px;
-            }
-            QPushButton#deleteBtn {
-                background-color: #e74c3c;
-            }
         """)
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
+        rows = self.table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(36)
+
         self.table.setAlternatingRowColors(True)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
 
         layout.addWidget(self.table)
 
     def load_data(self):
-        users = self.parent.user_controller.get_all_users(self.sort_order)
-        staff = [u for u in users if u.get("role") == "staff"]
-
-        self.table.setRowCount(len(staff))
-
-        for row, s in enumerate(staff):
-            user_id = s["id"]
-
-            def create_centered_item(text):
-                item = QTableWidgetItem(str(text))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                return item
-
-            self.table.setItem(row, 0, create_centered_item(user_id))
-            full_name = " ".join(filter(None, [s.get("first_name"), s.get("last_name")])) or s.get("username", "")
-            self.table.setItem(row, 1, create_centered_item(full_name))
-            self.table.setItem(row, 2, create_centered_item(s.get("email", "N/A")))
-            self.table.setItem(row, 3, create_centered_item(s.get("department", "")))
-            self.table.setItem(row, 4, create_centered_item(s.get("created", "")))
-            self.table.setItem(row, 5, create_centered_item(s.get("status", "")))
-
-            # Action buttons
-            actions = QWidget()
-            action_layout = QHBoxLayout(actions)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-
-            edit_btn = QPushButton("Edit")
-            delete_btn = QPushButton("Delete")
-            delete_btn.setObjectName("deleteBtn")
-
-            # Correct lambda capture using default argument
-            edit_btn.clicked.connect(lambda checked, uid=user_id: self.edit_staff(uid))
-            delete_btn.clicked.connect(lambda checked, uid=user_id: self.delete_staff(uid))
-
-            action_layout.addWidget(edit_btn)
-            action_layout.addWidget(delete_btn)
-            self.table.setCellWidget(row, 6, actions)
+        controller = self.parent.user_controller
+        descending = self.sort_order == "DESC"
+        self.model.set_loader(
+            lambda after_key, limit: controller.list_staff(
+                after_key=after_key, limit=limit, descending=descending
+            )
+        )
 
     def refresh_table(self):
         self.sort_order = "ASC" if self.sort_order == "DESC" else "DESC"
@@ -156,6 +156,10 @@ class DashboardStats(QWidget):
             "View Reports", "#0EA5E9", lambda: self._open_report_view_students(mode="students")
         ), 0, 3)
 
+        layout.addWidget(self._action_btn(
+            "Import Students", "#0EA5E9", self.parent.import_students
+        ), 1, 0)
+
         return group
 
     def _quick_actions_staff(self):
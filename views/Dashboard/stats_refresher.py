@@ -0,0 +1,62 @@
+from PyQt6.QtCore import QObject, QTimer, QEvent
+
+
+class StatsRefresher(QObject):
+    """
+    Keeps stat cards current without re-counting on a fixed timer.
+
+    Every interval it reads the cheap change marker (DashboardController.get_change_marker)
+    on the task runner and calls `reload` only when the marker moved. While the
+    window is hidden or minimized the interval doubles up to max_interval_ms;
+    showing or restoring the window polls immediately and resets it.
+    """
+
+    def __init__(self, window, tasks, read_marker, reload, interval_ms=2000, max_interval_ms=60000):
+        super().__init__(window)
+        self.window = window
+        self.tasks = tasks
+        self.read_marker = read_marker
+        self.reload = reload
+        self.interval_ms = interval_ms
+        self.max_interval_ms = max_interval_ms
+
+        self._current_interval = interval_ms
+        self._last_marker = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.poll)
+        window.installEventFilter(self)
+
+    def start(self):
+        self._timer.start(self._current_interval)
+
+    def stop(self):
+        self._timer.stop()
+
+    def poll(self):
+        self.tasks.submit(
+            "change-marker", self.read_marker,
+            on_result=self._on_marker, on_error=lambda _: self._schedule(), silent=True
+        )
+
+    def _on_marker(self, marker):
+        # None means the marker could not be read: fall back to reloading
+        if marker is None or marker != self._last_marker:
+            self._last_marker = marker
+            self.reload()
+        self._schedule()
+
+    def _schedule(self):
+        if self.window.isHidden() or self.window.isMinimized():
+            self._current_interval = min(self._current_interval * 2, self.max_interval_ms)
+        else:
+            self._current_interval = self.interval_ms
+        self._timer.start(self._current_interval)
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() in (QEvent.Type.Show, QEvent.Type.WindowStateChange):
+            if not self.window.isMinimized() and self._current_interval != self.interval_ms:
+                self._current_interval = self.interval_ms
+                self._timer.stop()
+                self.poll()
+        return False
@@ -0,0 +1,249 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QPainter
+from PyQt6.QtWidgets import QStyledItemDelegate
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Table model over a list of row dicts.
+
+    Subclasses define COLUMNS as (header, function(row) -> value) pairs. The last
+    header is the Action column, which holds no data and is drawn by
+    ActionButtonsDelegate, so a row costs nothing until the view paints it.
+
+    Rows are either set in one go (set_rows) or paged in through a loader
+    (set_loader): the view calls canFetchMore()/fetchMore() as the user scrolls
+    towards the bottom, and each call asks the loader for the next PAGE_SIZE rows.
+    With a TaskRunner the loader runs off the UI thread and the page is appended
+    when it arrives; a new set_loader() supersedes any page still in flight.
+    """
+    COLUMNS = []
+    ACTION_HEADER = "Action"
+    PAGE_SIZE = 100
+
+    def __init__(self, parent=None, runner=None):
+        super().__init__(parent)
+        self._rows = []
+        self._loader = None
+        self._next_key = None
+        self._has_more = False
+        self._loading = False
+        self._runner = runner
+        self._channel = f"{type(self).__name__}:{id(self)}"
+
+    @property
+    def action_column(self):
+        return len(self.COLUMNS)
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._loader = None
+        self._has_more = False
+        self.endResetModel()
+
+    def set_loader(self, loader):
+        """
+        loader(after_key, limit) -> (rows, next_key), next_key None on the last page.
+        Resets the model and loads only the first page.
+        """
+        self.beginResetModel()
+        self._rows = []
+        self._loader = loader
+        self._next_key = None
+        self._has_more = True
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+
+    @property
+    def loading(self):
+        return self._loading
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self._loader is not None
+                and self._has_more and not self._loading)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self._runner is None:
+            rows, next_key = self._loader(self._next_key, self.PAGE_SIZE)
+            self.append_rows(rows, next_key)
+            return
+
+        self._loading = True
+        self._runner.submit(
+            self._channel, self._loader, self._next_key, self.PAGE_SIZE,
+            on_result=self._on_page, on_error=self._on_page_error
+        )
+
+    def _on_page(self, page):
+        self._loading = False
+        rows, next_key = page
+        self.append_rows(rows, next_key)
+
+    def _on_page_error(self, message):
+        self._loading = False
+        self._has_more = False
+        print(f"Error loading rows: {message}")
+
+    def append_rows(self, rows, next_key):
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        self._next_key = next_key
+        self._has_more = next_key is not None
+
+    def row_data(self, row):
+        return self._rows[row]
+
+    def record_id(self, row):
+        return self._rows[row]["id"]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS) + 1
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        if section == self.action_column:
+            return self.ACTION_HEADER
+        return self.COLUMNS[section][0]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.column() == self.action_column:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return _text(self.COLUMNS[index.column()][1](self._rows[index.row()]))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.foreground(index.column(), self._rows[index.row()])
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.decoration(index.column(), self._rows[index.row()])
+        return None
+
+    def foreground(self, column, row):
+        return None
+
+    def decoration(self, column, row):
+        return None
+
+
+class StudentTableModel(RecordTableModel):
+    COLUMNS = [
+        ("ID", lambda s: s["id"]),
+        ("Name", lambda s: " ".join(filter(None, [s.get("first_name"), s.get("middle_name"), s.get("last_name")]))),
+        ("Email", lambda s: s.get("email", "N/A")),
+        ("Strand", lambda s: s.get("strand", "")),
+        ("Grade", lambda s: s.get("grade", "")),
+        ("Enrollment", lambda s: s.get("enrollment", "")),
+        ("Status", lambda s: s.get("status", "")),
+    ]
+    STATUS_COLUMN = 6
+    NAME_COLUMN = 1
+    # StudentController.list_students() sort key per column
+    SORT_KEYS = ["id", "name", "email", "strand", "grade", "enrollment", "status"]
+
+    def __init__(self, parent=None, runner=None, preview_loader=None):
+        super().__init__(parent, runner)
+        # preview_loader(student_ids) -> {student_id: thumbnail path}; it blocks on rendering,
+        # so previews are only fetched with a runner, after each page has been shown
+        self.preview_loader = preview_loader
+        self._previews = {}
+
+    def set_loader(self, loader):
+        self._previews = {}
+        super().set_loader(loader)
+
+    def append_rows(self, rows, next_key):
+        super().append_rows(rows, next_key)
+        if rows and self.preview_loader is not None and self._runner is not None:
+            ids = [row["id"] for row in rows]
+            self._runner.submit(
+                f"{self._channel}:previews:{ids[0]}", self.preview_loader, ids,
+                on_result=self._on_previews, silent=True
+            )
+
+    def _on_previews(self, paths):
+        if not paths:
+            return
+        for student_id, path in paths.items():
+            self._previews[student_id] = QIcon(path)
+        for i, row in enumerate(self._rows):
+            if row["id"] in paths:
+                index = self.index(i, self.NAME_COLUMN)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def decoration(self, column, row):
+        if column == self.NAME_COLUMN:
+            return self._previews.get(row["id"])
+        return None
+
+    def foreground(self, column, row):
+        if column == self.STATUS_COLUMN:
+            status = (row.get("status") or "").lower()
+            return QColor("green") if status == "enrolled" else QColor("red")
+        return None
+
+
+class StaffTableModel(RecordTableModel):
+    COLUMNS = [
+        ("ID", lambda s: s["id"]),
+        ("Name", lambda s: " ".join(filter(None, [s.get("first_name"), s.get("last_name")])) or s.get("username", "")),
+        ("Email", lambda s: s.get("email", "N/A")),
+        ("Department", lambda s: s.get("department", "")),
+        ("Created", lambda s: s.get("created", "")),
+        ("Status", lambda s: s.get("status", "")),
+    ]
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """Paints Edit / Delete buttons in a cell and reports clicks by row."""
+    edit_clicked = pyqtSignal(int)
+    delete_clicked = pyqtSignal(int)
+
+    BUTTONS = (("Edit", "#0EA5E9"), ("Delete", "#e74c3c"))
+    SPACING = 6
+
+    def _button_rects(self, rect):
+        width = (rect.width() - self.SPACING * (len(self.BUTTONS) + 1)) // len(self.BUTTONS)
+        height = rect.height() - 8
+        rects = []
+        for i in range(len(self.BUTTONS)):
+            x = rect.x() + self.SPACING + i * (width + self.SPACING)
+            rects.append(QRect(x, rect.y() + 4, width, height))
+        return rects
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for (label, color), rect in zip(self.BUTTONS, self._button_rects(option.rect)):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            edit_rect, delete_rect = self._button_rects(option.rect)
+            pos = event.position().toPoint()
+            if edit_rect.contains(pos):
+                self.edit_clicked.emit(index.row())
+                return True
+            if delete_rect.contains(pos):
+                self.delete_clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,115 @@
+import itertools
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _Task(QRunnable):
+    def __init__(self, task_id, fn, args, kwargs):
+        super().__init__()
+        self.task_id = task_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.task_id, str(e))
+            return
+        self.signals.finished.emit(self.task_id, result)
+
+
+class TaskRunner(QObject):
+    """
+    Runs controller calls on a QThreadPool and delivers results on the UI thread.
+
+    Every submit() names a channel. Submitting again on a channel supersedes the
+    earlier call: its result is dropped when it arrives, so a slow refresh can
+    never overwrite a newer one. Worker threads query through the pooled
+    connections of Database.connection_scope(); without a pool the call runs
+    inline, since the single shared connection cannot be used from two threads.
+
+    busy_changed drives loading indicators; pass silent=True for periodic
+    refreshes that should not flash one.
+    """
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, db, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.db = db
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._latest = {}    # channel -> id of the newest task
+        self._tasks = {}     # id -> (task, channel, on_result, on_error, silent)
+        self._visible = 0    # tasks in flight that count towards `busy`
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, silent=False, **kwargs):
+        task_id = next(self._ids)
+        self._latest[channel] = task_id
+
+        if not self.db.is_pooled:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if on_error:
+                    on_error(str(e))
+                else:
+                    print(f"Background task '{channel}' failed: {e}")
+                return
+            if on_result:
+                on_result(result)
+            return
+
+        task = _Task(task_id, fn, args, kwargs)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._tasks[task_id] = (task, channel, on_result, on_error, silent)
+        if not silent:
+            self._visible += 1
+            if self._visible == 1:
+                self.busy_changed.emit(True)
+        self.pool.start(task)
+
+    def cancel(self, channel):
+        """Drop whatever result is still in flight on `channel`."""
+        self._latest.pop(channel, None)
+
+    @property
+    def busy(self):
+        return self._visible > 0
+
+    def _take(self, task_id):
+        """Forget a finished task; returns its callbacks, or None if it was superseded."""
+        _, channel, on_result, on_error, silent = self._tasks.pop(task_id)
+        if not silent:
+            self._visible -= 1
+            if self._visible == 0:
+                self.busy_changed.emit(False)
+        if self._latest.get(channel) != task_id:
+            return None
+        del self._latest[channel]
+        return on_result, on_error
+
+    @pyqtSlot(int, object)
+    def _on_finished(self, task_id, result):
+        callbacks = self._take(task_id)
+        if callbacks and callbacks[0]:
+            callbacks[0](result)
+
+    @pyqtSlot(int, str)
+    def _on_failed(self, task_id, message):
+        callbacks = self._take(task_id)
+        if callbacks is None:
+            return
+        if callbacks[1]:
+            callbacks[1](message)
+        else:
+            print(f"Background task failed: {message}")
@@ -186,18 +186,14 @@ class PDFExport:
         if not path.lower().endswith(".pdf"):
             path += ".pdf"
 
-        # 1. Use get_all_students() to match the GUI columns exactly
-        data = self.controller.get_all_students()
-
-        if not data:
-            self._show_styled_message("No Data", "No student data available to export.", QMessageBox.Icon.Warning)
-            return
+        # 1. Stream the get_all_students() rows so the table never sits in memory twice
+        data = self.controller.iter_all_students()
 
         # 2. Hardcode the headers to match your View Reports tab
         headers = ["Student ID", "Full Name", "Program", "Year Level", "Enrollment Date", "Status"]
 
         # 3. Build Rows
-        rows_html = ""
+        rows_html = []
         for row in data:
             cells = ""
             # If row is a dictionary, we fetch specific keys
@@ -213,8 +209,13 @@ class PDFExport:
                 for item in row:
                     cells += f"<td>{item}</td>"
 
-            rows_html += f"<tr>{cells}</tr>"
+            rows_html.append(f"<tr>{cells}</tr>")
+
+        if not rows_html:
+            self._show_styled_message("No Data", "No student data available to export.", QMessageBox.Icon.Warning)
+            return
 
+        rows_html = "".join(rows_html)
         title = "Full Student Report"
 
         html = f"""
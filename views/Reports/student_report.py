@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from controllers.reportsController import ReportController
 from views.Reports.pdf_export import PDFExport  # Import the PDFExport class
+from views.Dashboard.task_runner import TaskRunner
 
 
 class StudentReportView(QWidget):
@@ -12,6 +13,7 @@ class StudentReportView(QWidget):
         self.parent = parent
         self.controller = report_controller
         self.pdf_exporter = PDFExport(self, controller=self.controller)
+        self.tasks = TaskRunner(self.controller.db, self, max_threads=1)
         self.init_ui()
 
     def init_ui(self):
@@ -50,6 +52,12 @@ class StudentReportView(QWidget):
         title = QLabel("View Reports")
         title.setStyleSheet("font-size:16pt; font-weight:bold; color: black;")
         header.addWidget(title)
+
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet("color:#6b7280; font-style:italic;")
+        self.loading_label.hide()
+        self.tasks.busy_changed.connect(self.loading_label.setVisible)
+        header.addWidget(self.loading_label)
         header.addStretch()
 
         self.back_btn = QPushButton("Back to Dashboard")
@@ -148,26 +156,29 @@ class StudentReportView(QWidget):
         self.load_pending_applications()
 
     def load_all_students(self):
-        data = self.controller.get_all_students()
         headers = ["Student ID", "Full Name", "Program", "Year Level", "Enrollment Date", "Status"]
-        self._fill_table(self.all_students_tab, headers, data)
+        self._load_tab(self.all_students_tab, headers, self.controller.get_all_students)
 
     def load_enrollment_summary(self):
-        data = self.controller.get_enrollment_summary()
         headers = ["Program", "Number of Students"]
-        self._fill_table(self.enrollment_tab, headers, data)
+        self._load_tab(self.enrollment_tab, headers, self.controller.get_enrollment_summary)
 
     def load_new_registrations(self):
-        data = self.controller.get_new_registrations()
         headers = ["Student ID", "Full Name", "Program", "Registration Date"]
-        self._fill_table(self.new_reg_tab, headers, data)
+        self._load_tab(self.new_reg_tab, headers, self.controller.get_new_registrations)
 
     def load_pending_applications(self):
-        data = self.controller.get_pending_applications()
         headers = ["Student ID", "Full Name", "Program", "Application Date", "Status"]
-        self._fill_table(self.pending_tab, headers, data)
+        self._load_tab(self.pending_tab, headers, self.controller.get_pending_applications)
 
     # ------------------- HELPER -------------------
+    def _load_tab(self, table, headers, query):
+        """Run `query` on the worker pool; a newer load of the same tab wins."""
+        self.tasks.submit(
+            id(table), query,
+            on_result=lambda data: self._fill_table(table, headers, data)
+        )
+
     def _fill_table(self, table, headers, data):
         table.setColumnCount(len(headers))
         table.setHorizontalHeaderLabels(headers)
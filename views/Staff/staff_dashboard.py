@@ -4,20 +4,24 @@ from controllers.authController import AuthController
 from models.db import Database
 from controllers.userController import UserController
 from controllers.studentController import StudentController
+from controllers.dashboardController import DashboardController
 
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QFrame, QStatusBar
+    QLabel, QPushButton, QFrame, QStatusBar, QProgressBar
 )
-from PyQt6.QtCore import pyqtSignal, QTimer
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QFont
 
 from views.Dashboard.student_view import AdminStudentDashboard
+from views.Dashboard.task_runner import TaskRunner
+from views.Dashboard.stats_refresher import StatsRefresher
 from views.Dashboard.staff_view import AdminStaffDashboard
 from views.Staff.staff import CreateStaffForm
 from views.Student_Parent.create_student import StudentCreationForm
+from views.Student_Parent.import_students import ImportStudentsDialog
 
 
 class StaffDashboard(QMainWindow):
@@ -33,14 +37,23 @@ class StaffDashboard(QMainWindow):
         self.current_user_id = user_id
         self.username = username
 
+        # Controller calls for tables and stat cards run here, off the UI thread
+        self.tasks = TaskRunner(self.db, self)
+
+        # load_statistics() reads it, so it must exist before the UI is built
+        self.dashboard_controller = DashboardController(self.db)
+
         self.init_ui()
         self.show_student_dashboard()
         self.load_statistics()
 
-        # Refresh statistics periodically so stat cards reflect live changes
-        self._stats_timer = QTimer(self)
-        self._stats_timer.timeout.connect(self.load_statistics)
-        self._stats_timer.start(2000)  # refresh every 2 seconds
+        # Stat cards re-query only when a write bumps the students change marker
+        self._stats_refresher = StatsRefresher(
+            self, self.tasks,
+            read_marker=lambda: self.dashboard_controller.get_change_marker(("students",)),
+            reload=self.load_statistics
+        )
+        self._stats_refresher.start()
 
     def init_ui(self):
         self.setWindowTitle("Staff Dashboard")
@@ -61,6 +74,14 @@ class StaffDashboard(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
 
+        self.loading_indicator = QProgressBar()
+        self.loading_indicator.setRange(0, 0)  # indeterminate
+        self.loading_indicator.setMaximumWidth(140)
+        self.loading_indicator.setTextVisible(False)
+        self.loading_indicator.hide()
+        self.status_bar.addPermanentWidget(self.loading_indicator)
+        self.tasks.busy_changed.connect(self.loading_indicator.setVisible)
+
     def _create_header(self, parent):
         header = QFrame()
         header.setFixedHeight(70)
@@ -104,16 +125,16 @@ class StaffDashboard(QMainWindow):
         self.load_statistics()
 
     def load_statistics(self):
-        self.total_students_label.setText(
-            str(self.student_controller.get_student_count())
-        )
-        self.active_students_label.setText(
-            str(self.student_controller.get_enrolled_students())
-        )
-        self.pending_reviews_label.setText(
-            str(self.student_controller.get_pending_student_count())
+        self.tasks.submit(
+            "statistics", self.dashboard_controller.get_snapshot,
+            on_result=self._show_statistics, silent=True
         )
 
+    def _show_statistics(self, snapshot):
+        self.total_students_label.setText(str(snapshot.total_students))
+        self.active_students_label.setText(str(snapshot.enrolled_students))
+        self.pending_reviews_label.setText(str(snapshot.pending_students))
+
     # ================= ACTIONS =================
 
     def create_student_account(self):
@@ -122,6 +143,12 @@ class StaffDashboard(QMainWindow):
             self.student_dashboard.load_data()
             self.load_statistics()
 
+    def import_students(self):
+        dialog = ImportStudentsDialog(self.student_controller, self.current_user_id, self)
+        if dialog.exec():
+            self.student_dashboard.load_data()
+            self.load_statistics()
+
     def logout(self):
         self.logout_requested.emit()
         self.close()
@@ -130,11 +157,7 @@ class StaffDashboard(QMainWindow):
 
 if __name__ == "__main__":
     db = Database()
-    db.create_database_if_not_exists()
-    db.connect()
-    db.migrations()
-    db.create_default_admin()
-    db.create_default_staff()
+    db.initialize()
 
     auth_ctrl = AuthController(db)
     user_ctrl = UserController(db)
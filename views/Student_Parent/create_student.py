@@ -2,19 +2,24 @@ import os
 
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QLineEdit, QComboBox, QPushButton,
-    QLabel, QTextEdit, QScrollArea, QWidget, QGridLayout, QMessageBox
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QPushButton,
+    QLabel, QTextEdit, QScrollArea, QWidget, QGridLayout, QMessageBox, QFileDialog
 )
 from PyQt6.QtCore import Qt
+from controllers.studentController import StudentController
 from models.db import Database
+from views.Student_Parent.document_upload import DocumentUpload, UploadProgressDialog
 
 
 class StudentCreationForm(QDialog):
     def __init__(self, db, created_by):
         super().__init__()
         self.db = db
+        self.student_controller = StudentController(db)
         self.creator_user_id = created_by
         self.documents = {}
+        self.document_files = {}    # document name -> chosen file, uploaded after the student is created
+        self.upload = None
         self.setWindowTitle("Student Registration Form")
         self.resize(1000, 800)  # initial size
         self.setMinimumSize(700, 600)
@@ -105,14 +110,10 @@ class StudentCreationForm(QDialog):
         self.student_type_combo.currentTextChanged.connect(self.update_document_list)
 
         # Load strands and grade levels
-        cursor = self.db.connection.cursor()
-        cursor.execute("SELECT id, strand_name FROM strands")
-        self.strands = cursor.fetchall()
+        self.strands = self.db.reference.strands()
         self.strand_combo.addItems([s[1] for s in self.strands])
-        cursor.execute("SELECT id, level FROM grade_levels")
-        self.grade_levels = cursor.fetchall()
+        self.grade_levels = self.db.reference.grade_levels()
         self.grade_level_combo.addItems([g[1] for g in self.grade_levels])
-        cursor.close()
 
         grid_academic = QGridLayout()
         grid_academic.setHorizontalSpacing(20)
@@ -167,6 +168,7 @@ class StudentCreationForm(QDialog):
                 item.widget().deleteLater()
 
         self.documents.clear()
+        self.document_files.clear()
 
         docs_to_show = (
                 self.documents_master["Core"] +
@@ -187,8 +189,16 @@ class StudentCreationForm(QDialog):
                 lambda text, d=doc_name: self.update_document_status(d, text)
             )
 
+            browse = QPushButton("Attach File...")
+            browse.clicked.connect(
+                lambda _, d=doc_name, dd=dropdown, b=browse: self.choose_document_file(d, dd, b)
+            )
+            controls = QHBoxLayout()
+            controls.addWidget(dropdown)
+            controls.addWidget(browse)
+
             vbox.addWidget(label)
-            vbox.addWidget(dropdown)
+            vbox.addLayout(controls)
 
             self.docs_layout.addLayout(vbox, row, col)
             col += 1
@@ -199,6 +209,17 @@ class StudentCreationForm(QDialog):
     def update_document_status(self, doc_name, status):
         self.documents[doc_name] = status
 
+    def choose_document_file(self, doc_name, dropdown, button):
+        path, _ = QFileDialog.getOpenFileName(
+            self, f"Attach {doc_name}", "", "Documents (*.pdf *.jpg *.jpeg *.png);;All Files (*)"
+        )
+        if not path:
+            return
+        self.document_files[doc_name] = path
+        dropdown.setCurrentText("Provided")
+        button.setText(os.path.basename(path))
+        button.setToolTip(path)
+
     def submit_form(self):
         try:
             strand_idx = self.strand_combo.currentIndex()
@@ -224,8 +245,8 @@ class StudentCreationForm(QDialog):
                 "phone_number": self.phone_number.text(),
                 "date_of_birth": self.date_of_birth.text(),
                 "address": self.address.toPlainText(),
-                "strand_id": self.strands[strand_idx][0],
-                "grade_level_id": self.grade_levels[grade_idx][0],
+                "strand": self.strands[strand_idx][1],
+                "grade_level": self.grade_levels[grade_idx][1],
                 "student_type": self.student_type_combo.currentText(),
                 "documents_status": self.documents
             }
@@ -250,41 +271,44 @@ class StudentCreationForm(QDialog):
                 QMessageBox.warning(self, "Validation Error", "Invalid Phone Number: Please enter integers only.")
                 return
 
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                INSERT INTO personal_information (
-                    first_name, middle_name, last_name, suffix, sex, nationality,
-                    place_of_birth, email, phone_number, date_of_birth, address
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                student_data["first_name"], student_data["middle_name"], student_data["last_name"],
-                student_data["suffix"], student_data["sex"], student_data["nationality"],
-                student_data["place_of_birth"], student_data["email"], student_data["phone_number"],
-                student_data["date_of_birth"], student_data["address"]
-            ))
-            personal_info_id = cursor.lastrowid
-
-            cursor.execute("""
-                INSERT INTO students (personal_info_id, strand_id, grade_level_id, student_type, status, created_by)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                personal_info_id, student_data["strand_id"], student_data["grade_level_id"],
-                student_data["student_type"], "pending", self.creator_user_id
-            ))
-
-            self.db.connection.commit()
-            cursor.close()
+            # Through the controller so the student is indexed and audited like any other
+            student_id = self.student_controller.create_student(student_data, self.creator_user_id)
+            if student_id is None:
+                QMessageBox.critical(self, "Database Error", "Failed to create the student.")
+                return
+            if self.document_files:
+                self.upload_documents(student_id, student_data["first_name"])
+                return
             QMessageBox.information(self, "Success", f"Student {student_data['first_name']} created successfully!")
             self.accept()
 
         except IndexError:
             QMessageBox.critical(self, "Error", "Selection Error: The selected Strand or Grade Level is invalid.")
         except Exception as e:
-            if self.db.connection:
-                self.db.connection.rollback()
             print(f"Error: {e}")
             QMessageBox.critical(self, "Database Error", f"An error occurred: {e}")
 
+    def upload_documents(self, student_id, first_name):
+        # Copies run on the document store's threads; the dialog only follows their progress
+        self.upload = DocumentUpload(
+            self.student_controller, student_id, dict(self.document_files), self.creator_user_id, self
+        )
+        progress = UploadProgressDialog(self.upload, self)
+        self.upload.finished.connect(lambda paths: self.on_documents_uploaded(paths, progress, first_name))
+        progress.show()
+        self.upload.start()
+
+    def on_documents_uploaded(self, paths, progress, first_name):
+        progress.close()
+        if paths is None:
+            QMessageBox.warning(
+                self, "Documents Not Uploaded",
+                f"Student {first_name} was created, but the documents could not be uploaded."
+            )
+        else:
+            QMessageBox.information(self, "Success", f"Student {first_name} created successfully!")
+        self.accept()
+
     def clear_inputs(self):
         self.first_name.clear()
         self.middle_name.clear()
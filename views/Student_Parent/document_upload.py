@@ -0,0 +1,53 @@
+import threading
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtWidgets import QProgressDialog
+
+
+class DocumentUpload(QObject):
+    """
+    Runs StudentController.attach_documents_async() and reports back on the UI thread.
+
+    The copy runs on the document store's worker threads; its progress and result
+    are re-emitted as signals, which Qt queues to this object's (the UI) thread.
+    """
+    progress = pyqtSignal(object, object)   # copied bytes, total bytes (may exceed 32 bits)
+    finished = pyqtSignal(object)           # stored paths, or None on failure / cancel
+
+    def __init__(self, student_controller, student_id, document_files, uploaded_by, parent=None):
+        super().__init__(parent)
+        self.student_controller = student_controller
+        self.student_id = student_id
+        self.document_files = document_files
+        self.uploaded_by = uploaded_by
+        self.cancel_event = threading.Event()
+
+    def start(self):
+        future = self.student_controller.attach_documents_async(
+            self.student_id, self.document_files, self.uploaded_by,
+            progress=self.progress.emit, cancel=self.cancel_event
+        )
+        future.add_done_callback(
+            lambda done: self.finished.emit(None if done.cancelled() or done.exception() else done.result())
+        )
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class UploadProgressDialog(QProgressDialog):
+    """Modal progress for a DocumentUpload; Cancel stops the copy."""
+    STEPS = 1000
+
+    def __init__(self, upload, parent=None):
+        super().__init__("Uploading documents...", "Cancel", 0, self.STEPS, parent)
+        self.setWindowTitle("Uploading Documents")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        upload.progress.connect(self.on_progress)
+        self.canceled.connect(upload.cancel)
+
+    def on_progress(self, copied, total):
+        self.setValue(int(copied * self.STEPS / total) if total else self.STEPS)
@@ -1,5 +1,10 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QLineEdit, QPushButton, QMessageBox, QComboBox
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPushButton, QMessageBox, QComboBox, QLabel
+)
+from PyQt6.QtGui import QIcon, QPixmap
+
+from views.Dashboard.task_runner import TaskRunner
 
 class EditStudentForm(QDialog):
     def __init__(self, student_controller, student_id):
@@ -7,6 +12,7 @@ class EditStudentForm(QDialog):
         self.student_controller = student_controller
         self.student_id = student_id
         self.personal_info_id = None
+        self.tasks = TaskRunner(student_controller.db, self, max_threads=1)
 
         self.setWindowTitle("Edit Student")
         self.resize(600, 500)
@@ -26,6 +32,10 @@ class EditStudentForm(QDialog):
             QPushButton { background-color: #0EA5E9; color: white; padding: 8px; border-radius: 6px; }
             QPushButton#parentsBtn { background: transparent; color: #0EA5E9; border: none; padding: 4px; }
         """)
+        # Document previews, filled in by load_previews() once the thumbnails are ready
+        self.previews = QHBoxLayout()
+        layout.addLayout(self.previews)
+
         self.form = QFormLayout()
 
         self.first_name = QLineEdit()
@@ -84,6 +94,23 @@ class EditStudentForm(QDialog):
         if index != -1:
             self.status.setCurrentIndex(index)
 
+        self.tasks.submit(
+            "previews", self.student_controller.get_document_thumbnails, self.student_id,
+            on_result=self.load_previews, silent=True
+        )
+
+    def load_previews(self, thumbnails):
+        for name, path in thumbnails:
+            preview = QVBoxLayout()
+            image = QLabel()
+            image.setPixmap(QPixmap(path))
+            image.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            caption = QLabel(name)
+            caption.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            preview.addWidget(image)
+            preview.addWidget(caption)
+            self.previews.addLayout(preview)
+
     def save_changes(self):
         if self.personal_info_id is None:
             QMessageBox.critical(self, "Error", "Cannot save. Invalid student data.")
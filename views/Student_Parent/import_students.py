@@ -0,0 +1,175 @@
+import os
+
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel,
+    QProgressBar, QFileDialog, QMessageBox
+)
+
+from controllers.importController import StudentImporter
+
+
+class ImportWorker(QThread):
+    progress = pyqtSignal(int, int, int)   # processed, imported, failed
+    done = pyqtSignal(object)              # ImportReport
+    failed = pyqtSignal(str)
+
+    def __init__(self, importer, path, created_by):
+        super().__init__()
+        self.importer = importer
+        self.path = path
+        self.created_by = created_by
+
+    def run(self):
+        try:
+            report = self.importer.run(self.path, self.created_by, progress=self.progress.emit)
+        except Exception as e:  # unreadable file, missing openpyxl, broken pool
+            self.failed.emit(str(e))
+            return
+        self.done.emit(report)
+
+
+class ImportStudentsDialog(QDialog):
+    """Pick a CSV/XLSX roster and import it in the background with a progress bar."""
+
+    def __init__(self, student_controller, created_by, parent=None):
+        super().__init__(parent)
+        self.student_controller = student_controller
+        self.created_by = created_by
+        self.importer = None
+        self.worker = None
+        self.report = None
+        self.setWindowTitle("Import Students")
+        self.setMinimumWidth(520)
+        self.init_ui()
+
+    def init_ui(self):
+        self.setStyleSheet("""
+            QDialog { background-color: #F3F6F8; }
+            QLabel { color: #111827; }
+            QLineEdit { background: white; border: 1px solid #0EA5E9; padding: 6px; border-radius: 4px; color: #111827; }
+            QPushButton { color: white; background-color: #0EA5E9; border-radius: 6px; padding: 8px; }
+            QPushButton:disabled { background-color: #9CA3AF; }
+            QProgressBar { border: 1px solid #0EA5E9; border-radius: 4px; text-align: center; color: #111827; }
+            QProgressBar::chunk { background-color: #0EA5E9; }
+        """)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        layout.addWidget(QLabel(
+            "<b>Import students from a CSV or Excel (.xlsx) file</b><br>"
+            "Columns: first_name, middle_name, last_name, suffix, sex, nationality, place_of_birth, "
+            "email, phone_number, date_of_birth, address, strand, grade_level, student_type"
+        ))
+
+        file_row = QHBoxLayout()
+        self.path_input = QLineEdit()
+        self.path_input.setPlaceholderText("Choose a file...")
+        self.path_input.setReadOnly(True)
+        browse_btn = QPushButton("Browse")
+        browse_btn.clicked.connect(self.choose_file)
+        file_row.addWidget(self.path_input)
+        file_row.addWidget(browse_btn)
+        layout.addLayout(file_row)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        self.import_btn = QPushButton("Import")
+        self.import_btn.setEnabled(False)
+        self.import_btn.clicked.connect(self.start_import)
+        self.cancel_btn = QPushButton("Close")
+        self.cancel_btn.clicked.connect(self.cancel_or_close)
+        buttons.addStretch()
+        buttons.addWidget(self.import_btn)
+        buttons.addWidget(self.cancel_btn)
+        layout.addLayout(buttons)
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Student Roster", "", "Rosters (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if path:
+            self.path_input.setText(path)
+            self.import_btn.setEnabled(True)
+
+    # ------------------- IMPORT -------------------
+    def start_import(self):
+        path = self.path_input.text()
+        if not os.path.isfile(path):
+            QMessageBox.warning(self, "Import Students", "Please choose an existing file.")
+            return
+
+        self.importer = StudentImporter(self.student_controller)
+        self.worker = ImportWorker(self.importer, path, self.created_by)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.done.connect(self.on_done)
+        self.worker.failed.connect(self.on_failed)
+
+        self.import_btn.setEnabled(False)
+        self.cancel_btn.setText("Cancel")
+        self.progress_bar.show()
+        self.status_label.setText("Reading file...")
+        self.worker.start()
+
+    def on_progress(self, processed, imported, failed):
+        self.status_label.setText(f"Processed {processed} rows: {imported} imported, {failed} with errors")
+
+    def on_done(self, report):
+        self.report = report
+        self._finish()
+        summary = f"{report.imported} of {report.total} students imported."
+        if report.cancelled:
+            summary = "Import cancelled. " + summary
+        self.status_label.setText(summary)
+
+        if report.errors:
+            answer = QMessageBox.question(
+                self, "Import Students",
+                f"{summary}\n{report.failed} rows were rejected. Save the error report?"
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                self.save_error_report()
+        else:
+            QMessageBox.information(self, "Import Students", summary)
+
+    def on_failed(self, message):
+        self._finish()
+        self.status_label.setText("Import failed.")
+        QMessageBox.critical(self, "Import Students", f"Import failed: {message}")
+
+    def _finish(self):
+        self.progress_bar.hide()
+        self.cancel_btn.setText("Close")
+        self.import_btn.setEnabled(True)
+
+    def save_error_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Error Report", "import_errors.csv", "CSV (*.csv)")
+        if path:
+            try:
+                self.report.write_errors(path)
+            except OSError as e:
+                QMessageBox.warning(self, "Import Students", f"Could not save the report: {e}")
+
+    def cancel_or_close(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.importer.cancel()
+            self.status_label.setText("Cancelling after the current batch...")
+            return
+        if self.report is not None and self.report.imported:
+            self.accept()
+        else:
+            self.reject()
+
+    def closeEvent(self, event):
+        if self.worker is not None and self.worker.isRunning():
+            self.importer.cancel()
+            self.worker.wait()
+        super().closeEvent(event)